@@ -0,0 +1,248 @@
+#include "common/neuron-typedefs.h"
+#include "common/in_spikes.h"
+
+#include <data_specification.h>
+#include <debug.h>
+#include <simulation.h>
+#include <string.h>
+
+// The most blocks whose spikes can be counted, and the most cores whose
+// spikes can be received; these must match the LiveRateAggregator vertex
+#define MAX_BLOCKS         4096
+#define MAX_SOURCES        1024
+
+// The size of the buffer of spikes received but not yet counted
+#define SPIKE_BUFFER_SIZE  4096
+
+// The most counts that fit in the 272 bytes of an SDP packet after the
+// header of the counts
+#define MAX_COUNTS_PER_PACKET 65
+
+// The parameters, in the order they are written by the vertex
+typedef struct parameters_t {
+    uint32_t ip_tag;
+    uint32_t timesteps_per_window;
+    uint32_t block_size;
+    uint32_t n_blocks;
+    uint32_t n_sources;
+} parameters_t;
+
+// The key and mask of the spikes of a core, and its first neuron
+typedef struct source_t {
+    uint32_t key;
+    uint32_t mask;
+    uint32_t lo_atom;
+} source_t;
+
+// The header of each packet of counts sent to the host, which is followed
+// by the count of each block from first_block
+typedef struct counts_header_t {
+    uint32_t window_start;
+    uint16_t first_block;
+    uint16_t n_counts;
+    uint16_t block_size;
+    uint16_t timesteps_per_window;
+} counts_header_t;
+
+// Globals
+static uint32_t time;
+static uint32_t simulation_ticks;
+static uint32_t infinite_run;
+static parameters_t parameters;
+static source_t *sources;
+static uint32_t *counts;
+static sdp_msg_t message;
+
+//! values for the priority for each callback
+typedef enum callback_priorities{
+    MC = -1, SDP = 0, TIMER = 2
+} callback_priorities;
+
+// Find the neuron id of a spike, from the core whose key it matches
+static inline bool get_neuron_id(spike_t spike, uint32_t *neuron_id) {
+    uint32_t lo = 0;
+    uint32_t hi = parameters.n_sources;
+    while (lo < hi) {
+        uint32_t mid = (lo + hi) >> 1;
+        source_t *source = &sources[mid];
+        uint32_t key = spike & source->mask;
+        if (key == source->key) {
+            *neuron_id = source->lo_atom + (spike & ~source->mask);
+            return true;
+        } else if (key < source->key) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return false;
+}
+
+// Send the counts of the blocks to the host, in as many packets as needed
+static void send_counts(uint32_t window_start) {
+    counts_header_t *header = (counts_header_t *) &message.cmd_rc;
+    uint32_t *packet_counts = (uint32_t *) &header[1];
+    for (uint32_t first = 0; first < parameters.n_blocks;
+            first += MAX_COUNTS_PER_PACKET) {
+        uint32_t n_counts = parameters.n_blocks - first;
+        if (n_counts > MAX_COUNTS_PER_PACKET) {
+            n_counts = MAX_COUNTS_PER_PACKET;
+        }
+        header->window_start = window_start;
+        header->first_block = first;
+        header->n_counts = n_counts;
+        header->block_size = parameters.block_size;
+        header->timesteps_per_window = parameters.timesteps_per_window;
+        spin1_memcpy(packet_counts, &counts[first],
+                     n_counts * sizeof(uint32_t));
+        message.length = sizeof(sdp_hdr_t) + sizeof(counts_header_t) +
+            (n_counts * sizeof(uint32_t));
+        while (!spin1_send_sdp_msg(&message, 1)) {
+            spin1_delay_us(1);
+        }
+    }
+}
+
+// Callbacks
+void timer_callback(uint unused0, uint unused1) {
+    use(unused0);
+    use(unused1);
+    time++;
+
+    log_debug("Timer tick %d", time);
+
+    // The counts of a window that is not complete when the simulation
+    // pauses are kept, and the window is completed when it resumes
+    if ((infinite_run != TRUE) && (time == simulation_ticks)) {
+        log_info("Simulation complete.\n");
+        simulation_handle_pause_resume(NULL);
+    }
+
+    // Count the incoming spikes
+    spike_t spike;
+    uint32_t neuron_id;
+    while (in_spikes_get_next_spike(&spike)) {
+        if (!get_neuron_id(spike, &neuron_id)) {
+            log_debug("Received spike %x from an unknown core", spike);
+            continue;
+        }
+        uint32_t block = neuron_id / parameters.block_size;
+        if (block < parameters.n_blocks) {
+            counts[block] += 1;
+        }
+    }
+
+    // At the end of each window, send the counts and start counting again
+    if (((time + 1) % parameters.timesteps_per_window) == 0) {
+        send_counts(time + 1 - parameters.timesteps_per_window);
+        for (uint32_t i = 0; i < parameters.n_blocks; i++) {
+            counts[i] = 0;
+        }
+    }
+}
+
+bool read_parameters(address_t region_address) {
+    log_info("Reading parameters from 0x%.8x", region_address);
+    spin1_memcpy(&parameters, region_address, sizeof(parameters_t));
+    if ((parameters.n_blocks > MAX_BLOCKS) ||
+            (parameters.n_sources > MAX_SOURCES)) {
+        log_error("Too many blocks (%u) or sources (%u)", parameters.n_blocks,
+                  parameters.n_sources);
+        return false;
+    }
+
+    // Copy the sources, which are sorted by key, and allocate the counts
+    sources = (source_t*) spin1_malloc(
+        parameters.n_sources * sizeof(source_t));
+    counts = (uint32_t*) spin1_malloc(parameters.n_blocks * sizeof(uint32_t));
+    if ((sources == NULL && parameters.n_sources > 0) ||
+            (counts == NULL && parameters.n_blocks > 0)) {
+        log_error("Could not allocate the sources and counts");
+        return false;
+    }
+    spin1_memcpy(sources, &region_address[sizeof(parameters_t) >> 2],
+                 parameters.n_sources * sizeof(source_t));
+    for (uint32_t i = 0; i < parameters.n_blocks; i++) {
+        counts[i] = 0;
+    }
+
+    log_info("IP tag = %d, timesteps per window = %d, block size = %d,"
+             " blocks = %d, sources = %d",
+             parameters.ip_tag, parameters.timesteps_per_window,
+             parameters.block_size, parameters.n_blocks,
+             parameters.n_sources);
+    return true;
+}
+
+void incoming_spike_callback(uint key, uint payload) {
+    use(payload);
+
+    log_debug("Received spike %x at time %d\n", key, time);
+
+    // If there was space to add spike to incoming spike queue
+    in_spikes_add_spike(key);
+}
+
+static bool initialize(uint32_t *timer_period) {
+    log_info("initialise: started");
+
+    // Get the address this core's DTCM data starts at from SRAM
+    address_t address = data_specification_get_data_address();
+
+    // Read the header
+    if (!data_specification_read_header(address)) {
+        return false;
+    }
+
+    // Get the timing details and set up the simulation interface
+    if (!simulation_initialise(
+            data_specification_get_region(0, address),
+            APPLICATION_NAME_HASH, timer_period, &simulation_ticks,
+            &infinite_run, SDP, NULL, NULL)) {
+        return false;
+    }
+
+    // Get the parameters
+    if (!read_parameters(data_specification_get_region(1, address))) {
+        return false;
+    }
+
+    // Set up the packets of counts sent to the host through the IP tag
+    message.tag = parameters.ip_tag;
+    message.flags = 0x07;
+    message.dest_port = PORT_ETH;
+    message.dest_addr = 0;
+    message.srce_port = (1 << PORT_SHIFT) | spin1_get_core_id();
+    message.srce_addr = spin1_get_chip_id();
+
+    log_info("initialise: completed successfully");
+
+    return true;
+}
+
+// Entry point
+void c_main(void) {
+
+    // Initialise
+    uint32_t timer_period = 0;
+    if (!initialize(&timer_period)) {
+        log_error("Error in initialisation - exiting!");
+        rt_error(RTE_SWERR);
+    }
+
+    // Initialise the incoming spike buffer
+    if (!in_spikes_initialize_spike_buffer(SPIKE_BUFFER_SIZE)) {
+        return;
+    }
+
+    // Set timer_callback
+    spin1_set_timer_tick(timer_period);
+
+    // Register callbacks
+    spin1_callback_on(MC_PACKET_RECEIVED, incoming_spike_callback, MC);
+    spin1_callback_on(TIMER_TICK, timer_callback, TIMER);
+
+    // Start the time at "-1" so that the first tick will be 0
+    time = UINT32_MAX;
+    simulation_run(timer_callback, TIMER);
+}
@@ -2,49 +2,147 @@
 The :py:mod:`spynnaker.pynn` package contains the front end specifications
 and implementation for the PyNN High-level API
 (http://neuralensemble.org/trac/PyNN)
+
+The device models, connections and plugin manager are only imported when
+they are first used, so that scripts which only use a connection do not pay
+for importing the rest of the tool chain.
 """
 
+import importlib
 import os
+import sys
+import types
+
+import numpy
 
 from spinnman.messages.eieio.eieio_type import EIEIOType
-from spynnaker.pyNN.utilities import constants
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    external_spinnaker_link_cochlea_device import ExternalCochleaDevice
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    external_spinnaker_link_fpga_retina_device import ExternalFPGARetinaDevice
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    munich_spinnaker_link_retina_device import MunichRetinaDevice
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    pushbot_spinnaker_link_retina_device import PushBotRetinaDevice
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    pushbot_spinnaker_link_retina_device import PushBotRetinaResolution
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    pushbot_spinnaker_link_retina_device import PushBotRetinaPolarity
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    munich_spinnaker_link_motor_device import MunichMotorDevice
-from spynnaker_external_devices_plugin.pyNN.external_devices_models.\
-    arbitrary_fpga_device import ArbitraryFPGADevice
-
-from spynnaker_external_devices_plugin.pyNN import model_binaries
-
-from spynnaker_external_devices_plugin.pyNN.\
-    spynnaker_external_device_plugin_manager import \
-    SpynnakerExternalDevicePluginManager
-from spynnaker_external_devices_plugin.pyNN.utility_models.spike_injector \
-    import SpikeInjector as SpynnakerExternalDeviceSpikeInjector
-from spynnaker_external_devices_plugin.pyNN.connections\
-    .spynnaker_live_spikes_connection import SpynnakerLiveSpikesConnection
-
-
-from spynnaker.pyNN.utilities import conf
-from spynnaker.pyNN.spinnaker import executable_finder
-
-
-from spinn_front_end_common.utilities.notification_protocol.socket_address \
-    import SocketAddress
-
-executable_finder.add_path(os.path.dirname(model_binaries.__file__))
-spynnaker_external_devices = SpynnakerExternalDevicePluginManager()
+
+_PACKAGE = "spynnaker_external_devices_plugin.pyNN"
+
+# The module and attribute of each name which is imported on first use
+_LAZY_ATTRIBUTES = {
+    "ExternalCochleaDevice": (
+        "external_devices_models.external_spinnaker_link_cochlea_device",
+        "ExternalCochleaDevice"),
+    "ExternalFPGARetinaDevice": (
+        "external_devices_models.external_spinnaker_link_fpga_retina_device",
+        "ExternalFPGARetinaDevice"),
+    "MunichRetinaDevice": (
+        "external_devices_models.munich_spinnaker_link_retina_device",
+        "MunichRetinaDevice"),
+    "PushBotRetinaDevice": (
+        "external_devices_models.pushbot_spinnaker_link_retina_device",
+        "PushBotRetinaDevice"),
+    "PushBotRetinaResolution": (
+        "external_devices_models.pushbot_spinnaker_link_retina_device",
+        "PushBotRetinaResolution"),
+    "PushBotRetinaPolarity": (
+        "external_devices_models.pushbot_spinnaker_link_retina_device",
+        "PushBotRetinaPolarity"),
+    "MunichMotorDevice": (
+        "external_devices_models.munich_spinnaker_link_motor_device",
+        "MunichMotorDevice"),
+    "ArbitraryFPGADevice": (
+        "external_devices_models.arbitrary_fpga_device",
+        "ArbitraryFPGADevice"),
+    "model_binaries": ("model_binaries", None),
+    "SpynnakerExternalDevicePluginManager": (
+        "spynnaker_external_device_plugin_manager",
+        "SpynnakerExternalDevicePluginManager"),
+    "SpynnakerExternalDeviceSpikeInjector": (
+        "utility_models.spike_injector", "SpikeInjector"),
+    "SpynnakerExternalDevicePartitionedSpikeInjector": (
+        "utility_models.partitioned_spike_injector",
+        "PartitionedSpikeInjector"),
+    "SpynnakerLiveSpikesConnection": (
+        "connections.spynnaker_live_spikes_connection",
+        "SpynnakerLiveSpikesConnection"),
+    "LiveSpikeRecorder": (
+        "connections.live_spike_recorder", "LiveSpikeRecorder"),
+    "LiveSpikeReplay": ("connections.live_spike_replay", "LiveSpikeReplay"),
+    "LiveRateConnection": (
+        "connections.live_rate_connection", "LiveRateConnection")
+}
+
+# The module and attribute of each name from the rest of the tool chain which
+# is imported on first use
+_LAZY_TOOL_CHAIN_ATTRIBUTES = {
+    "conf": ("spynnaker.pyNN.utilities.conf", None),
+    "constants": ("spynnaker.pyNN.utilities.constants", None),
+    "executable_finder": ("spynnaker.pyNN.spinnaker", "executable_finder"),
+    "SocketAddress": (
+        "spinn_front_end_common.utilities.notification_protocol"
+        ".socket_address", "SocketAddress")
+}
+
+__all__ = sorted(list(_LAZY_ATTRIBUTES) + list(_LAZY_TOOL_CHAIN_ATTRIBUTES) + [
+    "EIEIOType", "spynnaker_external_devices", "activate_live_output_for",
+    "activate_live_output_for_populations", "deactivate_live_output_for",
+    "record_live_output_for", "activate_live_output_to", "SpikeInjector",
+    "PartitionedSpikeInjector"])
+
+# The plugin manager, created on first use
+_plugin_manager = None
+_binaries_registered = False
+
+
+def _register_binaries():
+    """ Add the path of the model binaries to the executable finder, once
+    """
+    global _binaries_registered
+    if not _binaries_registered:
+        from spynnaker.pyNN.spinnaker import executable_finder
+        from spynnaker_external_devices_plugin.pyNN import model_binaries
+        executable_finder.add_path(os.path.dirname(model_binaries.__file__))
+        _binaries_registered = True
+
+
+def _get_plugin_manager():
+    """ Get the plugin manager, creating it and registering the model\
+        binaries on first use
+
+    :rtype: SpynnakerExternalDevicePluginManager
+    """
+    global _plugin_manager
+    if _plugin_manager is None:
+        from spynnaker_external_devices_plugin.pyNN.\
+            spynnaker_external_device_plugin_manager import \
+            SpynnakerExternalDevicePluginManager
+        _register_binaries()
+        _plugin_manager = SpynnakerExternalDevicePluginManager()
+    return _plugin_manager
+
+
+class _LazyModule(types.ModuleType):
+    """ The type of this module, which imports the lazy attributes when\
+        they are first used and then keeps them
+    """
+
+    def __getattr__(self, name):
+        if name == "spynnaker_external_devices":
+            value = _get_plugin_manager()
+        elif name in _LAZY_ATTRIBUTES:
+            module_name, attribute = _LAZY_ATTRIBUTES[name]
+            if module_name.startswith("external_devices_models"):
+                _register_binaries()
+            value = importlib.import_module(
+                "{}.{}".format(_PACKAGE, module_name))
+            if attribute is not None:
+                value = getattr(value, attribute)
+        elif name in _LAZY_TOOL_CHAIN_ATTRIBUTES:
+            module_name, attribute = _LAZY_TOOL_CHAIN_ATTRIBUTES[name]
+            value = importlib.import_module(module_name)
+            if attribute is not None:
+                value = getattr(value, attribute)
+        else:
+            raise AttributeError("module {} has no attribute {}".format(
+                self.__name__, name))
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(
+            set(self.__dict__) | set(__all__))
 
 
 def activate_live_output_for(
@@ -54,12 +152,16 @@ def activate_live_output_for(
         prefix_type=None, message_type=EIEIOType.KEY_32_BIT,
         right_shift=0, payload_as_time_stamps=True,
         use_payload_prefix=True, payload_prefix=None,
-        payload_right_shift=0, number_of_packets_sent_per_time_step=0):
+        payload_right_shift=0, number_of_packets_sent_per_time_step=0,
+        per_board=False, expected_rate=None, neuron_ids=None,
+        constrain_to_board=False, timesteps_per_rate_window=None,
+        rate_block_size=1):
     """ Output the spikes from a given population from SpiNNaker as they
         occur in the simulation
 
-    :param population: The population to activate the live output for
-    :type population: Population
+    :param population: The population to activate the live output for;\
+            a PopulationView only outputs the spikes of its neurons
+    :type population: Population or PopulationView
     :param database_notify_host: the hostname for the device which is\
             listening to the database notification.
     :type database_notify_host: str
@@ -83,7 +185,10 @@ def activate_live_output_for(
     :param use_payload_prefix:
     :param payload_prefix:
     :param payload_right_shift:
-    :param number_of_packets_sent_per_time_step:
+    :param number_of_packets_sent_per_time_step: the most packets that the\
+            LivePacketGather sends each timestep, or 0 for no limit.  If the\
+            population is expected to make the LivePacketGather exceed this,\
+            another LivePacketGather is used, sending on the next port.
 
     :param port: The UDP port to which the live spikes will be sent.  If not\
                 specified, the port will be taken from the "live_spike_port"\
@@ -103,14 +208,220 @@ def activate_live_output_for(
     :param use_prefix: Determines if the spike packet will contain a common\
                 prefix for the spikes
     :type use_prefix: bool
+    :param per_board: Determines if the spikes are gathered on each board\
+                of the machine rather than all on one board, by the board\
+                given by board_address or else the board that the population\
+                is constrained to.  The spikes of all the boards are sent to\
+                the same host and port.
+    :type per_board: bool
+    :param expected_rate: The expected mean firing rate of the population in\
+                Hz, used to estimate the packets it will send; if not\
+                specified, each neuron is assumed to fire every timestep
+    :type expected_rate: float
+    :param neuron_ids: The indices of the neurons of the population whose\
+                spikes are output, or None for all of them.  Only the cores\
+                that simulate these neurons send their spikes, so the spikes\
+                of the other neurons on those cores also reach the host,\
+                unless the neurons are also given as the receive_neuron_ids\
+                of the SpynnakerLiveSpikesConnection.  The packets sent are\
+                still estimated from all the neurons of the population, as\
+                its cores are not known yet.  For a PopulationView, these\
+                are indices into the view, while the receive_neuron_ids are\
+                ids of the whole parent population.
+    :type neuron_ids: array-like of int
+    :param constrain_to_board: With per_board, if the population is not\
+                constrained to a board and no board_address is given,\
+                constrain the population to the board that records the\
+                fewest populations.  The machine must be known, and the\
+                whole population must then fit on the board.
+    :type constrain_to_board: bool
+    :param timesteps_per_rate_window: If not None, the spikes are not sent\
+                one by one: instead they are counted on the machine over\
+                windows of this many timesteps, and the count of each block\
+                of neurons is sent at the end of each window, to be\
+                received as rates by a LiveRateConnection.  The counts of\
+                a population are sent to a port of their own, the next\
+                free port from the port given.  This cannot be used with\
+                neuron_ids, per_board or a PopulationView, and cannot be\
+                deactivated.
+    :type timesteps_per_rate_window: int
+    :param rate_block_size: With timesteps_per_rate_window, the number of\
+                consecutive neurons whose spikes are counted together
+    :type rate_block_size: int
     """
 
+    activate_live_output_for_populations(
+        [population], database_notify_host, database_notify_port_num,
+        database_ack_port_num, board_address, port, host, tag, strip_sdp,
+        use_prefix, key_prefix, prefix_type, message_type, right_shift,
+        payload_as_time_stamps, use_payload_prefix, payload_prefix,
+        payload_right_shift, number_of_packets_sent_per_time_step,
+        per_board, expected_rate,
+        None if neuron_ids is None else [neuron_ids], constrain_to_board,
+        timesteps_per_rate_window, rate_block_size)
+
+
+def activate_live_output_for_populations(
+        populations, database_notify_host=None,
+        database_notify_port_num=None, database_ack_port_num=None,
+        board_address=None, port=None, host=None, tag=None, strip_sdp=True,
+        use_prefix=False, key_prefix=None, prefix_type=None,
+        message_type=EIEIOType.KEY_32_BIT, right_shift=0,
+        payload_as_time_stamps=True, use_payload_prefix=True,
+        payload_prefix=None, payload_right_shift=0,
+        number_of_packets_sent_per_time_step=0, per_board=False,
+        expected_rate=None, neuron_ids=None, constrain_to_board=False,
+        timesteps_per_rate_window=None, rate_block_size=1):
+    """ Output the spikes from many populations from SpiNNaker as they\
+        occur in the simulation, reading the configuration and registering\
+        the database socket address once for them all.  The parameters are\
+        as for activate_live_output_for.
+
+    :param populations: The populations to activate the live output for
+    :type populations: iterable of Population or PopulationView, or Assembly
+    :param neuron_ids: For each population, the indices of its neurons\
+            whose spikes are output, or None for all of them; or None to\
+            output all the neurons of every population
+    :type neuron_ids: list of (array-like of int or None)
+    :param timesteps_per_rate_window: If not None, the spikes of each\
+            population are counted on the machine over windows of this many\
+            timesteps, as for activate_live_output_for
+    :type timesteps_per_rate_window: int
+    :param rate_block_size: the number of consecutive neurons whose spikes\
+            are counted together
+    :type rate_block_size: int
+    """
+
+    from spynnaker.pyNN import exceptions
+    from spynnaker.pyNN.utilities import conf
+
     # get default params if none set
     if port is None:
         port = conf.config.getint("Recording", "live_spike_port")
     if host is None:
         host = conf.config.get("Recording", "live_spike_host")
-    # get default params for the database socket if required
+
+    # add new edges and vertices if required to spinnaker graph
+    populations = list(getattr(populations, "populations", populations))
+    if neuron_ids is None:
+        neuron_ids = [None] * len(populations)
+    elif len(neuron_ids) != len(populations):
+        raise exceptions.SpynnakerException(
+            "{} arrays of neuron ids were given for {} populations".format(
+                len(neuron_ids), len(populations)))
+    if timesteps_per_rate_window is not None:
+        _activate_live_rates_for_populations(
+            populations, neuron_ids, board_address, port, host, tag,
+            per_board, timesteps_per_rate_window, rate_block_size)
+    else:
+        for population, population_neuron_ids in zip(
+                populations, neuron_ids):
+            vertex, vertex_neuron_ids = _recorded_vertex_and_neuron_ids(
+                population, population_neuron_ids)
+            _get_plugin_manager().add_edge_to_recorder_vertex(
+                vertex, port, host, tag, board_address, strip_sdp,
+                use_prefix, key_prefix, prefix_type, message_type,
+                right_shift, payload_as_time_stamps, use_payload_prefix,
+                payload_prefix, payload_right_shift,
+                number_of_packets_sent_per_time_step, per_board,
+                expected_rate, vertex_neuron_ids, constrain_to_board)
+
+    # update socket interface with new demands.
+    _get_plugin_manager().add_socket_address(_database_socket_address(
+        database_notify_host, database_notify_port_num,
+        database_ack_port_num))
+
+
+def _activate_live_rates_for_populations(
+        populations, neuron_ids, board_address, port, host, tag, per_board,
+        timesteps_per_rate_window, rate_block_size):
+    """ Count the spikes of whole populations on the machine, checking them\
+        all before any is counted
+
+    :raise SpynnakerException: if some neurons, a PopulationView or each\
+            board are asked for, as only whole populations can be counted
+    """
+    from spynnaker.pyNN import exceptions
+
+    if per_board or any(
+            population_neuron_ids is not None
+            for population_neuron_ids in neuron_ids):
+        raise exceptions.SpynnakerException(
+            "The spikes of some neurons, or of each board, cannot be counted"
+            " over rate windows")
+    for population in populations:
+        if getattr(population, "parent", None) is not None:
+            raise exceptions.SpynnakerException(
+                "The spikes of a PopulationView cannot be counted over rate"
+                " windows; count those of its parent population")
+    for population in populations:
+        _get_plugin_manager().add_edge_to_rate_aggregator(
+            population._vertex, port, host, timesteps_per_rate_window,
+            rate_block_size, tag, board_address)
+
+
+def deactivate_live_output_for(population, port=None, host=None):
+    """ Stop the output of the spikes from a given population, from the\
+        next run, which maps the simulation again.  The population can be\
+        activated again later.
+
+    :param population: The population to deactivate the live output for;\
+            for a PopulationView, the output of its whole parent population\
+            is deactivated
+    :type population: Population or PopulationView
+    :param port: The UDP port to which the live spikes were sent.  If not\
+                specified, the port will be taken from the "live_spike_port"\
+                parameter in the "Recording" section of the spynnaker cfg file.
+    :type port: int
+    :param host: The host name or IP address to which the live spikes were\
+                sent.  If not specified, the host will be taken from the\
+                "live_spike_host" parameter in the "Recording" section of the\
+                spynnaker cfg file.
+    :type host: str
+    :return: True if the live output of the population was active
+    :rtype: bool
+    """
+
+    from spynnaker.pyNN.utilities import conf
+
+    if port is None:
+        port = conf.config.getint("Recording", "live_spike_port")
+    if host is None:
+        host = conf.config.get("Recording", "live_spike_host")
+    vertex, _ = _recorded_vertex_and_neuron_ids(population, None)
+    return _get_plugin_manager().remove_edge_to_recorder_vertex(
+        vertex, port, host)
+
+
+def _recorded_vertex_and_neuron_ids(population, neuron_ids):
+    """ Get the vertex of a population or PopulationView, and the ids of\
+        the neurons of the vertex to record
+
+    :param population: the population or PopulationView to record
+    :param neuron_ids: the indices of the neurons of the population to\
+            record, or None for all
+    :return: the vertex and the ids of its neurons, or None for all
+    """
+    parent = getattr(population, "parent", None)
+    if parent is None:
+        return population._vertex, neuron_ids
+    view_neuron_ids = numpy.arange(parent.size)[population.mask]
+    if neuron_ids is not None:
+        view_neuron_ids = view_neuron_ids[numpy.asarray(neuron_ids)]
+    return _recorded_vertex_and_neuron_ids(parent, view_neuron_ids)
+
+
+def _database_socket_address(
+        database_notify_host, database_notify_port_num,
+        database_ack_port_num):
+    """ Build the database socket address used by the notification\
+        interface, taking any parameters not given from the configuration
+
+    :rtype: SocketAddress
+    """
+    from spinn_front_end_common.utilities.notification_protocol\
+        .socket_address import SocketAddress
+    from spynnaker.pyNN.utilities import conf
 
     if database_notify_port_num is None:
         database_notify_port_num = conf.config.getint("Database",
@@ -121,20 +432,68 @@ def activate_live_output_for(
         database_ack_port_num = conf.config.get("Database", "listen_port")
         if database_ack_port_num == "None":
             database_ack_port_num = None
-
-    # add new edge and vertex if required to spinnaker graph
-    spynnaker_external_devices.add_edge_to_recorder_vertex(
-        population._vertex, port, host, tag, board_address, strip_sdp,
-        use_prefix, key_prefix, prefix_type, message_type, right_shift,
-        payload_as_time_stamps, use_payload_prefix, payload_prefix,
-        payload_right_shift, number_of_packets_sent_per_time_step)
-    # build the database socket address used by the notification interface
-    database_socket = SocketAddress(
+    return SocketAddress(
         listen_port=database_ack_port_num,
         notify_host_name=database_notify_host,
         notify_port_no=database_notify_port_num)
-    # update socket interface with new demands.
-    spynnaker_external_devices.add_socket_address(database_socket)
+
+
+def record_live_output_for(
+        populations, directory, database_notify_host=None,
+        database_notify_port_num=None, database_ack_port_num=None,
+        port=None, host=None, message_type=EIEIOType.KEY_32_BIT,
+        right_shift=0, payload_right_shift=0):
+    """ Record the spikes from the given populations as they occur in the\
+        simulation, to one file per population in a directory.  The files\
+        can be replayed into a SpikeInjector with LiveSpikeReplay.
+
+    :param populations: The populations to record
+    :type populations: iterable of Population or Assembly
+    :param directory: The directory to write the files to
+    :type directory: str
+    :param database_notify_host: the hostname for the device which is\
+            listening to the database notification.
+    :type database_notify_host: str
+    :param database_notify_port_num: The port number to which a external\
+            device will receive the database is ready command
+    :type database_notify_port_num: int
+    :param database_ack_port_num: the port number to which a external device\
+            will acknowledge that they have finished reading the database and\
+            are ready for it to start execution
+    :type database_ack_port_num: int
+    :param port: The UDP port to which the live spikes will be sent
+    :type port: int
+    :param host: The host name or IP address to which the live spikes will be\
+            sent
+    :type host: str
+    :param message_type: eieio data message with 16 bit or 32 bit keys and\
+            payloads
+    :param right_shift: the right shift applied to the keys
+    :type right_shift: int
+    :param payload_right_shift: the right shift applied to the time stamps
+    :type payload_right_shift: int
+    :return: the recorder, which must be closed once the simulation ends
+    :rtype: LiveSpikeRecorder
+    """
+    from spynnaker.pyNN.utilities import conf
+    from spynnaker_external_devices_plugin.pyNN.connections\
+        .live_spike_recorder import LiveSpikeRecorder
+
+    if database_notify_port_num is None:
+        database_notify_port_num = conf.config.getint("Database",
+                                                      "notify_port")
+    populations = list(getattr(populations, "populations", populations))
+    activate_live_output_for_populations(
+        populations, database_notify_host=database_notify_host,
+        database_notify_port_num=database_notify_port_num,
+        database_ack_port_num=database_ack_port_num, port=port,
+        host=host, message_type=message_type, right_shift=right_shift,
+        payload_as_time_stamps=True,
+        payload_right_shift=payload_right_shift)
+    labels = [population.label for population in populations]
+    return LiveSpikeRecorder(
+        directory, labels, local_port=database_notify_port_num,
+        right_shift=right_shift, payload_right_shift=payload_right_shift)
 
 
 def activate_live_output_to(population, device):
@@ -146,7 +505,8 @@ def activate_live_output_to(population, device):
     :param device: The pyNN population external device to which the spikes\
                 will be sent.
     """
-    spynnaker_external_devices.add_edge(
+    from spynnaker.pyNN.utilities import constants
+    _get_plugin_manager().add_edge(
         population._get_vertex, device._get_vertex,
         constants.SPIKE_PARTITION_ID)
 
@@ -178,23 +538,86 @@ def SpikeInjector(
 
     :return:
     """
-    if database_notify_port_num is None:
-        database_notify_port_num = conf.config.getint("Database",
-                                                      "notify_port")
-    if database_notify_host is None:
-        database_notify_host = conf.config.get("Database", "notify_hostname")
-    if database_ack_port_num is None:
-        database_ack_port_num = conf.config.get("Database", "listen_port")
-        if database_ack_port_num == "None":
-            database_ack_port_num = None
-
-    # build the database socket address used by the notification interface
-    database_socket = SocketAddress(
-        listen_port=database_ack_port_num,
-        notify_host_name=database_notify_host,
-        notify_port_no=database_notify_port_num)
-
     # update socket interface with new demands.
-    spynnaker_external_devices.add_socket_address(database_socket)
+    _get_plugin_manager().add_socket_address(_database_socket_address(
+        database_notify_host, database_notify_port_num,
+        database_ack_port_num))
+    from spynnaker_external_devices_plugin.pyNN.utility_models\
+        .spike_injector import SpikeInjector as \
+        SpynnakerExternalDeviceSpikeInjector
     return SpynnakerExternalDeviceSpikeInjector(
         n_neurons=n_neurons, label=label, port=port, virtual_key=virtual_key)
+
+
+def PartitionedSpikeInjector(
+        n_neurons, label, n_parts, port, per_board=False,
+        board_addresses=None, database_notify_host=None,
+        database_notify_port_num=None, database_ack_port_num=None):
+    """ Supports adding a spike injector split over several cores to the\
+        application graph, for injecting spikes faster than one core can.\
+        A SpynnakerLiveSpikesConnection sending to the injector sends each\
+        spike to the core of its neuron.
+
+    :param n_neurons: the number of neurons the spike injector will emulate
+    :type n_neurons: int
+    :param label: the label given to the population
+    :type label: str
+    :param n_parts: the number of cores to split the neurons over
+    :type n_parts: int
+    :param port: the port number used by the first core to listen for\
+            injections of spikes; each other core uses the next port
+    :type port: int
+    :param per_board: Determines if the cores are placed on each board of\
+            the machine in turn, rather than anywhere; the machine must be\
+            known when the population is created, so otherwise give the\
+            board addresses
+    :type per_board: bool
+    :param board_addresses: The ip addresses of the boards to place the\
+            cores on in turn, or None to place them anywhere (or on each\
+            board if per_board is True)
+    :type board_addresses: list of str
+    :param database_notify_host: the hostname for the device which is\
+            listening to the database notification.
+    :type database_notify_host: str
+    :param database_ack_port_num: the port number to which a external device\
+            will acknowledge that they have finished reading the database and\
+            are ready for it to start execution
+    :type database_ack_port_num: int
+    :param database_notify_port_num: The port number to which a external\
+            device will receive the database is ready command
+    :type database_notify_port_num: int
+
+    :return:
+    """
+    # update socket interface with new demands.
+    _get_plugin_manager().add_socket_address(_database_socket_address(
+        database_notify_host, database_notify_port_num,
+        database_ack_port_num))
+    if per_board and board_addresses is None:
+        from spynnaker.pyNN import exceptions, get_spynnaker
+        machine = get_spynnaker().machine
+        if machine is None:
+            raise exceptions.SpynnakerException(
+                "The boards of the machine are not known when {} is created;"
+                " give the board addresses to place it on instead".format(
+                    label))
+        board_addresses = [
+            chip.ip_address for chip in machine.ethernet_connected_chips]
+    from spynnaker_external_devices_plugin.pyNN.utility_models\
+        .partitioned_spike_injector import PartitionedSpikeInjector as \
+        SpynnakerExternalDevicePartitionedSpikeInjector
+    return SpynnakerExternalDevicePartitionedSpikeInjector(
+        n_neurons=n_neurons, label=label, n_parts=n_parts, port=port,
+        board_addresses=board_addresses)
+
+
+# Python 2 cannot change the type of a module, so there this module is
+# replaced by a lazy module which keeps a reference to it, so that the globals
+# of its functions are kept
+try:
+    sys.modules[__name__].__class__ = _LazyModule
+except TypeError:
+    _lazy_module = _LazyModule(__name__, __doc__)
+    _lazy_module.__dict__.update(globals())
+    _lazy_module._module = sys.modules[__name__]
+    sys.modules[__name__] = _lazy_module
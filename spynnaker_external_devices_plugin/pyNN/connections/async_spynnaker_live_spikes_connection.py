@@ -0,0 +1,217 @@
+import asyncio
+import collections
+import logging
+import socket
+
+from spynnaker_external_devices_plugin.pyNN.connections.eieio_spike_packets \
+    import decode_spike_packet
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spynnaker_live_spikes_connection import SpynnakerLiveSpikesConnection
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSpynnakerLiveSpikesConnection(SpynnakerLiveSpikesConnection):
+    """ A connection for receiving and sending live spikes from and to\
+        SpiNNaker, using datagram endpoints on an asyncio event loop rather\
+        than a listener thread per port.
+
+    Only the database notification handshake runs on its own thread; the\
+    event loop must be running when the handshake happens, as the endpoints\
+    are created on it.  Received spikes can be consumed with::
+
+        async for times, neuron_ids in connection.spikes(label):
+            ...
+
+    and spikes are sent with ``await connection.send_spikes(label, ids)``.
+    """
+
+    def __init__(self, receive_labels=None, send_labels=None, local_host=None,
+                 local_port=19999, loop=None, max_queued_batches=None,
+                 right_shift=0, payload_right_shift=0):
+        """
+
+        :param receive_labels: Labels of population from which live spikes\
+                    will be received.
+        :type receive_labels: iterable of str
+        :param send_labels: Labels of population to which live spikes will be\
+                    sent
+        :type send_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+                    ip address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+                    on.  Must match the port that the toolchain will send the\
+                    notification on (19999 by default)
+        :type local_port: int
+        :param loop: The event loop to run on; the default event loop is\
+                    used if not specified
+        :type loop: asyncio.AbstractEventLoop
+        :param max_queued_batches: The maximum number of batches kept for\
+                    each iterator returned by spikes(); the oldest batches\
+                    are dropped when a consumer falls further behind.  None\
+                    means no limit.
+        :type max_queued_batches: int
+        :param right_shift: The right shift given to activate_live_output_for\
+                    for the received populations
+        :type right_shift: int
+        :param payload_right_shift: The payload right shift given to\
+                    activate_live_output_for for the received populations
+        :type payload_right_shift: int
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._max_queued_batches = max_queued_batches
+        self._send_transport = None
+        self._spike_iterators = list()
+        SpynnakerLiveSpikesConnection.__init__(
+            self, receive_labels, send_labels, local_host, local_port,
+            right_shift=right_shift, payload_right_shift=payload_right_shift)
+
+    def _run_on_loop(self, coroutine):
+        """ Run a coroutine on the event loop from the database thread and\
+            wait for its result
+        """
+        return asyncio.run_coroutine_threadsafe(
+            coroutine, self._loop).result()
+
+    def _read_spike_database_callback(self, database_reader):
+        if self._spike_send_labels and self._send_transport is None:
+            self._send_transport, _ = self._run_on_loop(
+                self._loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, family=socket.AF_INET))
+        SpynnakerLiveSpikesConnection._read_spike_database_callback(
+            self, database_reader)
+
+    def _create_spike_receiver(self, port):
+        _, protocol = self._run_on_loop(
+            self._loop.create_datagram_endpoint(
+                lambda: _LiveSpikeProtocol(
+                    self._loop, self._receive_spikes, self._right_shift,
+                    self._payload_right_shift),
+                local_addr=("0.0.0.0", port)))
+        return protocol
+
+    def spikes(self, label):
+        """ Get an asynchronous iterator over the batches of spikes received\
+            from a population.  Each batch is a tuple of an array of spike\
+            times and an array of neuron ids, and iteration ends when the\
+            connection is closed.
+
+        :param label: the label of the population from which the spikes are\
+                    received
+        :type label: str
+        """
+        iterator = _SpikeBatchIterator(self._loop, self._max_queued_batches)
+        self._spike_iterators.append(iterator)
+        self.add_receive_array_callback(label, iterator.add_batch)
+        return iterator
+
+    def send_spikes(self, label, neuron_ids, send_full_keys=False):
+        """ Send a number of spikes; the result is awaitable.  Must be\
+            called from the event loop.
+
+        :param label: The label of the population from which the spikes will\
+                    originate
+        :type label: str
+        :param neuron_ids: array-like of neuron ids sending spikes
+        :type: [int] or numpy.ndarray
+        :param send_full_keys: Determines whether to send full 32-bit keys,\
+                    getting the key for each neuron from the database, or\
+                    whether to send 16-bit neuron ids directly
+        :type send_full_keys: bool
+        :return: a future of the number of packets sent
+        :rtype: asyncio.Future
+        """
+        packets = self._build_spike_packets(label, neuron_ids, send_full_keys)
+        for part, data in packets:
+            self._send_transport.sendto(
+                data, self._send_address(label, part))
+        future = self._loop.create_future()
+        future.set_result(len(packets))
+        return future
+
+    def close(self):
+        SpynnakerLiveSpikesConnection.close(self)
+        if self._send_transport is not None:
+            self._loop.call_soon_threadsafe(self._send_transport.close)
+        for iterator in self._spike_iterators:
+            self._loop.call_soon_threadsafe(iterator.finish)
+
+
+class _LiveSpikeProtocol(asyncio.DatagramProtocol):
+    """ Decodes each received datagram and passes on the keys and times
+    """
+
+    def __init__(self, loop, spikes_callback, right_shift,
+                 payload_right_shift):
+        self._loop = loop
+        self._spikes_callback = spikes_callback
+        self._right_shift = right_shift
+        self._payload_right_shift = payload_right_shift
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            keys, times = decode_spike_packet(
+                data, self._right_shift, self._payload_right_shift)
+        except Exception:
+            logger.exception("Error decoding live spike packet")
+            return
+        try:
+            self._spikes_callback(keys, times)
+        except Exception:
+            logger.exception("Error in live spike callback")
+
+    def close(self):
+        """ Close the endpoint; may be called from any thread
+        """
+        self._loop.call_soon_threadsafe(self._transport.close)
+
+
+class _SpikeBatchIterator(object):
+    """ An asynchronous iterator over the batches of spikes of a population
+    """
+
+    def __init__(self, loop, max_queued_batches):
+        self._loop = loop
+        self._batches = collections.deque(maxlen=max_queued_batches)
+        self._waiters = collections.deque()
+        self._finished = False
+
+    def add_batch(self, label, times, neuron_ids):
+        """ Receive callback which queues a batch or passes it straight on\
+            to a waiting consumer
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result((times, neuron_ids))
+                return
+        self._batches.append((times, neuron_ids))
+
+    def finish(self):
+        """ End the iteration once the queued batches are consumed
+        """
+        self._finished = True
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(StopAsyncIteration())
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._loop.create_future()
+        if self._batches:
+            future.set_result(self._batches.popleft())
+        elif self._finished:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self._waiters.append(future)
+        return future
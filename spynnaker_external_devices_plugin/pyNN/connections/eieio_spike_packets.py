@@ -0,0 +1,153 @@
+""" Helpers for building and decoding EIEIO data packets of spike keys\
+    directly with numpy arrays
+"""
+import struct
+
+import numpy
+
+from spinnman.messages.eieio.eieio_type import EIEIOType
+
+# The maximum number of 32-bit keys that will fit in a packet
+MAX_FULL_KEYS_PER_PACKET = 63
+
+# The maximum number of 16-bit keys that will fit in a packet
+MAX_HALF_KEYS_PER_PACKET = 127
+
+# The flags in the second byte of an EIEIO data header
+_PREFIX_FLAG = 0x80
+_PREFIX_TYPE_FLAG = 0x40
+_PAYLOAD_PREFIX_FLAG = 0x20
+_TIME_FLAG = 0x10
+
+# The numpy type of the keys of each EIEIO key type
+_KEY_DTYPES = {
+    EIEIOType.KEY_16_BIT: numpy.dtype("<u2"),
+    EIEIOType.KEY_32_BIT: numpy.dtype("<u4")
+}
+
+# The numpy type of the keys and payloads of each EIEIO type
+_ELEMENT_DTYPES = {
+    EIEIOType.KEY_16_BIT: numpy.dtype("<u2"),
+    EIEIOType.KEY_PAYLOAD_16_BIT: numpy.dtype("<u2"),
+    EIEIOType.KEY_32_BIT: numpy.dtype("<u4"),
+    EIEIOType.KEY_PAYLOAD_32_BIT: numpy.dtype("<u4")
+}
+
+# The EIEIO types in which each key has a payload
+_PAYLOAD_TYPES = (EIEIOType.KEY_PAYLOAD_16_BIT, EIEIOType.KEY_PAYLOAD_32_BIT)
+
+
+def spike_packet_format(send_full_keys):
+    """ Get the EIEIO type and the maximum number of keys per packet used\
+        to send spikes
+
+    :param send_full_keys: True if 32-bit keys are sent, False if 16-bit\
+                neuron ids are sent
+    :type send_full_keys: bool
+    :return: the EIEIO type and the number of keys that fit in a packet
+    :rtype: (EIEIOType, int)
+    """
+    if send_full_keys:
+        return EIEIOType.KEY_32_BIT, MAX_FULL_KEYS_PER_PACKET
+    return EIEIOType.KEY_16_BIT, MAX_HALF_KEYS_PER_PACKET
+
+
+def build_spike_packets(keys, send_full_keys):
+    """ Serialise keys into as few EIEIO data packets as possible
+
+    :param keys: the keys (or 16-bit neuron ids) to send
+    :type keys: array-like of int
+    :param send_full_keys: True if 32-bit keys are sent, False if 16-bit\
+                neuron ids are sent
+    :type send_full_keys: bool
+    :return: the bytes of each packet
+    :rtype: list of str
+    :raise ValueError: if a key does not fit in the packets
+    """
+    eieio_type, max_keys = spike_packet_format(send_full_keys)
+    key_dtype = _KEY_DTYPES[eieio_type]
+    keys = numpy.asarray(keys)
+    if len(keys) and int(keys.max()) > numpy.iinfo(key_dtype).max:
+        raise ValueError(
+            "Key {} does not fit in a {}-bit key".format(
+                int(keys.max()), key_dtype.itemsize * 8))
+    keys = keys.astype(key_dtype, copy=False)
+
+    # The EIEIO data header is the key count followed by the flags; only the
+    # type field is set as there is no prefix or payload
+    flags = eieio_type.value << 2
+    packets = list()
+    for start in range(0, len(keys), max_keys):
+        packet_keys = keys[start:start + max_keys]
+        packets.append(
+            struct.pack("<BB", len(packet_keys), flags) +
+            packet_keys.tobytes())
+    return packets
+
+
+def decode_spike_packet(data, right_shift=0, payload_right_shift=0):
+    """ Decode an EIEIO data packet of spikes sent by a LivePacketGather\
+        with time stamps, either in the payload prefix or in the payload of\
+        each key, into arrays in one step
+
+    :param data: the bytes of the packet
+    :type data: str or bytearray or memoryview
+    :param right_shift: The right shift applied to the keys by the\
+                LivePacketGather, which is undone by shifting them left
+    :type right_shift: int
+    :param payload_right_shift: The right shift applied to the payloads by\
+                the LivePacketGather, which is undone by shifting the times\
+                left
+    :type payload_right_shift: int
+    :return: the key and the time of each spike in the packet
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    count, flags = struct.unpack_from("<BB", data)
+    eieio_type = EIEIOType((flags >> 2) & 0x3)
+    has_payload = eieio_type in _PAYLOAD_TYPES
+    if not flags & _TIME_FLAG or not (
+            has_payload or flags & _PAYLOAD_PREFIX_FLAG):
+        raise ValueError(
+            "Only packets with a timestamp are currently considered")
+    element_dtype = _ELEMENT_DTYPES[eieio_type]
+    offset = 2
+
+    key_prefix = 0
+    if flags & _PREFIX_FLAG:
+        (key_prefix, ) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        if flags & _PREFIX_TYPE_FLAG:
+            key_prefix <<= 16
+
+    payload_prefix = None
+    if flags & _PAYLOAD_PREFIX_FLAG:
+        (payload_prefix, ) = struct.unpack_from(
+            "<H" if element_dtype.itemsize == 2 else "<I", data, offset)
+        offset += element_dtype.itemsize
+
+    if has_payload:
+        # The keys and payloads are interleaved, so each is a strided view
+        # of the packet
+        elements = numpy.frombuffer(
+            data, dtype=[("key", element_dtype), ("payload", element_dtype)],
+            count=count, offset=offset)
+        keys = elements["key"]
+        times = elements["payload"].astype("uint32")
+        if payload_prefix is not None:
+            times |= numpy.uint32(payload_prefix)
+    else:
+        keys = numpy.frombuffer(
+            data, dtype=element_dtype, count=count, offset=offset)
+        times = numpy.full(count, payload_prefix, dtype="uint32")
+    if payload_right_shift:
+        times <<= numpy.uint32(payload_right_shift)
+
+    # The keys are a view of the packet unless they have to be widened or
+    # have a prefix or shift applied
+    if eieio_type != EIEIOType.KEY_32_BIT or key_prefix or right_shift:
+        keys = keys.astype("uint32")
+        if key_prefix:
+            keys |= numpy.uint32(key_prefix)
+        if right_shift:
+            keys <<= numpy.uint32(right_shift)
+    return keys, times
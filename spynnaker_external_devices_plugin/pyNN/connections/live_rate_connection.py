@@ -0,0 +1,239 @@
+import logging
+from threading import Lock
+
+import numpy
+
+from spinn_front_end_common.utilities.connections.live_event_connection \
+    import LiveEventConnection
+from spynnaker_external_devices_plugin.pyNN.connections.live_rate_receiver \
+    import LiveRateReceiver
+from spynnaker_external_devices_plugin.pyNN.utility_models.live_labels \
+    import LIVE_RATE_AGGREGATOR_LABEL
+
+logger = logging.getLogger(__name__)
+
+
+class _Window(object):
+    """ The counts of the blocks of one window received so far
+    """
+
+    def __init__(self, n_blocks, block_size, timesteps_per_window):
+        self.block_size = block_size
+        self.timesteps_per_window = timesteps_per_window
+        self.counts = numpy.full(n_blocks, numpy.nan)
+        self.received = numpy.zeros(n_blocks, dtype="bool")
+
+    def add_counts(self, first_block, counts):
+        end_block = min(first_block + len(counts), len(self.counts))
+        self.counts[first_block:end_block] = counts[:end_block - first_block]
+        self.received[first_block:end_block] = True
+
+    @property
+    def complete(self):
+        return bool(self.received.all())
+
+
+class _LabelRates(object):
+    """ The open windows of one label, and the rates of the windows that\
+        have been closed
+    """
+
+    def __init__(self, n_neurons):
+        self.n_neurons = n_neurons
+        self.open_windows = dict()
+        self.window_starts = list()
+        self.rates = list()
+        self.last_closed_window_start = None
+
+
+class LiveRateConnection(LiveEventConnection):
+    """ A connection for receiving the spike counts of populations whose\
+        live output was activated with timesteps_per_rate_window, as rates.\
+        The counts of each window are sent by the machine in as many\
+        packets as they need; a window is closed, and its rates passed to\
+        the rate callbacks, once all of its packets have been received.  If\
+        a packet is lost, its window is closed when a later window is, with\
+        NaN as the rate of each block whose count was lost.
+    """
+
+    def __init__(self, receive_labels, local_host=None, local_port=19999):
+        """
+
+        :param receive_labels: Labels of the populations whose rates will\
+                    be received
+        :type receive_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+                    ip address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+                    on.  Must match the port that the toolchain will send the\
+                    notification on (19999 by default)
+        :type local_port: int
+        """
+        LiveEventConnection.__init__(
+            self, LIVE_RATE_AGGREGATOR_LABEL, None, None, local_host,
+            local_port)
+        self._rate_receive_labels = list(receive_labels)
+        self._local_host = local_host
+        self._rate_callbacks = dict(
+            (label, list()) for label in self._rate_receive_labels)
+
+        # The label whose counts are received on each port, the rates of
+        # each label and the receiver of each port
+        self._labels_by_port = dict()
+        self._label_rates = dict()
+        self._rate_receivers = dict()
+        self._machine_timestep_ms = None
+        self._n_incomplete_windows = 0
+        self._lock = Lock()
+        self.add_database_callback(self._read_rate_database_callback)
+
+    def add_rate_callback(self, label, rate_callback):
+        """ Add a callback for the rates of each window of a population
+
+        :param label: the label of the population
+        :type label: str
+        :param rate_callback: Function called with the label, the first\
+                    timestep of a window and the rate of each block of\
+                    neurons in Hz when each window is closed
+        :type rate_callback: (str, int, numpy.ndarray) -> None
+        """
+        self._rate_callbacks[label].append(rate_callback)
+
+    @property
+    def n_incomplete_windows(self):
+        """ The number of windows closed without all of their counts
+        """
+        return self._n_incomplete_windows
+
+    def _read_rate_database_callback(self, database_reader):
+        """ Read the port that the counts of each population are sent to,\
+            and the number of neurons of each, and start receiving
+
+        :param database_reader: the reader of the notification database
+        """
+        machine_time_step = database_reader.get_configuration_parameter_value(
+            "machine_time_step")
+        ports = list()
+        with self._lock:
+            self._machine_timestep_ms = machine_time_step / 1000.0
+            for label in self._rate_receive_labels:
+                host, port, strip_sdp = \
+                    database_reader.get_live_output_details(
+                        label, LIVE_RATE_AGGREGATOR_LABEL)
+                if not strip_sdp:
+                    raise ValueError(
+                        "Currently, only ip tags which strip the SDP headers"
+                        " are supported")
+                n_neurons = len(
+                    database_reader.get_key_to_neuron_id_mapping(label))
+                if label in self._label_rates:
+                    self._label_rates[label].n_neurons = n_neurons
+                else:
+                    self._label_rates[label] = _LabelRates(n_neurons)
+                self._labels_by_port[port] = label
+                ports.append(port)
+                logger.info(
+                    "Listening for spike counts from {} on {}:{}".format(
+                        label, host, port))
+        for port in ports:
+            if port not in self._rate_receivers:
+                receiver = LiveRateReceiver(
+                    port, self._receive_counts, self._local_host)
+                self._rate_receivers[port] = receiver
+                receiver.start()
+
+    def _receive_counts(
+            self, port, window_start, first_block, block_size,
+            timesteps_per_window, counts):
+        """ Add the counts of a packet to their window, and close the window\
+            and any earlier windows if it is complete
+        """
+        closed = list()
+        with self._lock:
+            label = self._labels_by_port.get(port)
+            if label is None:
+                return
+            label_rates = self._label_rates[label]
+            if (label_rates.last_closed_window_start is not None and
+                    window_start <= label_rates.last_closed_window_start):
+                return
+            window = label_rates.open_windows.get(window_start)
+            if window is None:
+                window = _Window(
+                    -(-label_rates.n_neurons // block_size), block_size,
+                    timesteps_per_window)
+                label_rates.open_windows[window_start] = window
+            window.add_counts(first_block, counts)
+            if window.complete:
+                closed = self._close_windows(
+                    label, label_rates, window_start)
+        self._call_rate_callbacks(closed)
+
+    def _close_windows(self, label, label_rates, last_window_start):
+        """ Turn the counts of the open windows up to a window into rates
+
+        :return: the label, first timestep and rates of each window closed
+        """
+        closed = list()
+        for window_start in sorted(label_rates.open_windows):
+            if window_start > last_window_start:
+                break
+            window = label_rates.open_windows.pop(window_start)
+            if not window.complete:
+                self._n_incomplete_windows += 1
+            n_blocks = len(window.counts)
+            block_sizes = numpy.full(
+                n_blocks, window.block_size, dtype="float64")
+            if n_blocks and label_rates.n_neurons % window.block_size:
+                block_sizes[-1] = label_rates.n_neurons % window.block_size
+            window_seconds = (
+                window.timesteps_per_window * self._machine_timestep_ms /
+                1000.0)
+            rates = window.counts / (block_sizes * window_seconds)
+            label_rates.window_starts.append(window_start)
+            label_rates.rates.append(rates)
+            label_rates.last_closed_window_start = window_start
+            closed.append((label, window_start, rates))
+        return closed
+
+    def _call_rate_callbacks(self, closed):
+        for label, window_start, rates in closed:
+            for rate_callback in self._rate_callbacks[label]:
+                try:
+                    rate_callback(label, window_start, rates)
+                except Exception:
+                    logger.exception("Error in rate callback")
+
+    def flush(self):
+        """ Close all the open windows, for example at the end of a run
+        """
+        closed = list()
+        with self._lock:
+            for label, label_rates in self._label_rates.items():
+                if label_rates.open_windows:
+                    closed.extend(self._close_windows(
+                        label, label_rates, max(label_rates.open_windows)))
+        self._call_rate_callbacks(closed)
+
+    def rate_matrix(self, label):
+        """ Get the rates of the closed windows of a population
+
+        :param label: the label of the population
+        :type label: str
+        :return: the first timestep of each window, and a matrix of the rate\
+                    of each block in Hz in each window, with a row per window
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        with self._lock:
+            label_rates = self._label_rates.get(label)
+            if label_rates is None or not label_rates.rates:
+                return (numpy.zeros(0, dtype="uint32"),
+                        numpy.zeros((0, 0), dtype="float64"))
+            return (numpy.array(label_rates.window_starts, dtype="uint32"),
+                    numpy.vstack(label_rates.rates))
+
+    def close(self):
+        for receiver in self._rate_receivers.values():
+            receiver.close()
+        LiveEventConnection.close(self)
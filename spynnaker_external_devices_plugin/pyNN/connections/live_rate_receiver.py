@@ -0,0 +1,104 @@
+import logging
+import socket
+import struct
+from threading import Thread
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+# The header of a packet of counts sent by a LiveRateAggregator: the first
+# timestep of the window, the first block counted, the number of counts, the
+# block size and the timesteps per window
+_HEADER = struct.Struct("<IHHHH")
+
+# The largest packet that a LiveRateAggregator will send
+_MAX_PACKET_SIZE = 300
+
+# How long to wait for a packet before checking whether the receiver has
+# been closed, in seconds
+_RECEIVE_TIMEOUT = 0.1
+
+
+def decode_rate_packet(data):
+    """ Decode a packet of spike counts sent by a LiveRateAggregator
+
+    :param data: the packet, without its SDP header
+    :type data: bytes
+    :return: the first timestep of the window, the first block counted, the\
+                number of neurons in each block, the timesteps per window\
+                and the count of each block from the first
+    :rtype: (int, int, int, int, numpy.ndarray)
+    :raise ValueError: if the packet is too short for its counts
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("A packet of {} bytes has no counts header".format(
+            len(data)))
+    window_start, first_block, n_counts, block_size, timesteps_per_window = \
+        _HEADER.unpack_from(data)
+    if len(data) < _HEADER.size + (n_counts * 4):
+        raise ValueError(
+            "A packet of {} bytes cannot hold {} counts".format(
+                len(data), n_counts))
+    counts = numpy.frombuffer(
+        data, dtype="<u4", count=n_counts, offset=_HEADER.size)
+    return (window_start, first_block, block_size, timesteps_per_window,
+            counts)
+
+
+class LiveRateReceiver(Thread):
+    """ Receives the packets of spike counts of a LiveRateAggregator on a\
+        UDP port, decodes them and passes them to a callback
+    """
+
+    def __init__(self, port, counts_callback, local_host=None):
+        """
+
+        :param port: The UDP port to listen on
+        :type port: int
+        :param counts_callback: Function called with the port and the\
+                    decoded packet for each packet received
+        :type counts_callback: \
+            (int, int, int, int, int, numpy.ndarray) -> None
+        :param local_host: The local hostname or ip address to listen on,\
+                    or None to listen on all interfaces
+        :type local_host: str
+        """
+        Thread.__init__(
+            self, name="LiveRateReceiver on port {}".format(port))
+        self.daemon = True
+        self._port = port
+        self._counts_callback = counts_callback
+        self._running = True
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if local_host is None:
+            local_host = ""
+        self._socket.bind((local_host, port))
+        self._socket.settimeout(_RECEIVE_TIMEOUT)
+
+    def run(self):
+        while self._running:
+            try:
+                data = self._socket.recv(_MAX_PACKET_SIZE)
+            except socket.timeout:
+                continue
+            except socket.error:
+                if self._running:
+                    logger.exception("Error receiving live spike counts")
+                break
+            try:
+                packet = decode_rate_packet(data)
+            except ValueError:
+                logger.exception("Error decoding live spike count packet")
+                continue
+            try:
+                self._counts_callback(self._port, *packet)
+            except Exception:
+                logger.exception("Error in live spike count callback")
+
+    def close(self):
+        """ Stop receiving and close the socket
+        """
+        self._running = False
+        self._socket.close()
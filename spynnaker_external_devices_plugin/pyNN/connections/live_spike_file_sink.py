@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+import time
+from threading import Lock
+
+import numpy
+
+
+# The header of a spike file: a magic number, the format version and the
+# number of records in the file
+_HEADER = struct.Struct("<4sIQ")
+_MAGIC = b"SPKS"
+_VERSION = 1
+
+# Each record is the timestep and neuron id of a spike
+SPIKE_RECORD_DTYPE = numpy.dtype([("timestep", "<u4"), ("neuron_id", "<u4")])
+
+# The number of records that a new file has space for
+_INITIAL_RECORDS = 65536
+
+
+class _SpikeFile(object):
+    """ A memory-mapped spike file of one label, which grows by doubling
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "w+b")
+        self._n_records = 0
+        self._capacity = 0
+        self._map = None
+        self._records = None
+        self._grow(_INITIAL_RECORDS)
+
+    def _grow(self, capacity):
+        if self._map is not None:
+            self._records = None
+            self._map.flush()
+            self._map.close()
+        self._file.truncate(
+            _HEADER.size + capacity * SPIKE_RECORD_DTYPE.itemsize)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._records = numpy.frombuffer(
+            self._map, dtype=SPIKE_RECORD_DTYPE, count=capacity,
+            offset=_HEADER.size)
+        self._capacity = capacity
+
+    def append(self, times, neuron_ids):
+        end = self._n_records + len(times)
+        if end > self._capacity:
+            capacity = self._capacity
+            while capacity < end:
+                capacity *= 2
+            self._grow(capacity)
+        self._records["timestep"][self._n_records:end] = times
+        self._records["neuron_id"][self._n_records:end] = neuron_ids
+        self._n_records = end
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, self._n_records)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._records = None
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(
+            _HEADER.size + self._n_records * SPIKE_RECORD_DTYPE.itemsize)
+        self._file.close()
+
+
+class LiveSpikeFileSink(object):
+    """ A receive array callback which appends the spikes of each label to\
+        a memory-mapped file of little-endian (timestep, neuron_id) uint32\
+        pairs, so that long runs do not keep their spikes in memory.  Use\
+        with::
+
+            sink = LiveSpikeFileSink(directory)
+            connection.add_receive_array_callback(label, sink)
+
+    The files are called ``<label>.spikes`` and can be read back with\
+    :py:func:`read_live_spike_file`.
+    """
+
+    def __init__(self, directory, flush_interval=1.0):
+        """
+
+        :param directory: The directory to write the files to
+        :type directory: str
+        :param flush_interval: The most time in seconds between flushes of\
+                    the files to disk
+        :type flush_interval: float
+        """
+        self._directory = directory
+        self._flush_interval = flush_interval
+        self._files = dict()
+        self._lock = Lock()
+        self._last_flush = time.time()
+
+    def path(self, label):
+        """ Get the path of the file of a label
+
+        :param label: the label of the population
+        :type label: str
+        :rtype: str
+        """
+        return os.path.join(self._directory, "{}.spikes".format(label))
+
+    def __call__(self, label, times, neuron_ids):
+        with self._lock:
+            if label not in self._files:
+                self._files[label] = _SpikeFile(self.path(label))
+            self._files[label].append(times, neuron_ids)
+            if time.time() - self._last_flush >= self._flush_interval:
+                for spike_file in self._files.values():
+                    spike_file.flush()
+                self._last_flush = time.time()
+
+    def close(self):
+        """ Flush and close the files, trimming them to their records
+        """
+        with self._lock:
+            for spike_file in self._files.values():
+                spike_file.close()
+            self._files = dict()
+
+
+def read_live_spike_file(path):
+    """ Memory-map a file written by a LiveSpikeFileSink
+
+    :param path: the path of the file
+    :type path: str
+    :return: the records of the file, with fields "timestep" and "neuron_id"
+    :rtype: numpy.memmap
+    """
+    with open(path, "rb") as spike_file:
+        magic, version, n_records = _HEADER.unpack(
+            spike_file.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(
+            "{} is not a live spike file".format(path))
+    if n_records == 0:
+        return numpy.zeros(0, dtype=SPIKE_RECORD_DTYPE)
+    return numpy.memmap(
+        path, dtype=SPIKE_RECORD_DTYPE, mode="r", offset=_HEADER.size,
+        shape=(n_records, ))
@@ -0,0 +1,151 @@
+import logging
+import socket
+from threading import Thread
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections.eieio_spike_packets \
+    import decode_spike_packet
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_statistics import clock
+from spynnaker_external_devices_plugin.pyNN.connections.packet_ring_buffer \
+    import PacketRingBuffer
+
+logger = logging.getLogger(__name__)
+
+# The largest UDP packet that a LivePacketGather will send
+_MAX_PACKET_SIZE = 300
+
+# How long to wait for a packet before delivering a partial batch, and
+# checking whether the receiver has been closed, in seconds
+_RECEIVE_TIMEOUT = 0.1
+
+
+class LiveSpikeReceiver(Thread):
+    """ Receives EIEIO spike packets from a LivePacketGather on a UDP port,\
+        decodes each batch of packets into arrays of keys and times, and\
+        passes them to a callback
+    """
+
+    def __init__(self, port, spikes_callback, local_host=None,
+                 packets_per_batch=1, n_buffer_slots=None, statistics=None,
+                 right_shift=0, payload_right_shift=0):
+        """
+
+        :param port: The UDP port to listen on
+        :type port: int
+        :param spikes_callback: Function called with the keys and times of\
+                    the spikes of each batch of packets, and the clock()\
+                    time when the first packet of the batch was received
+        :type spikes_callback: (numpy.ndarray, numpy.ndarray, float) -> None
+        :param local_host: The local hostname or ip address to listen on,\
+                    or None to listen on all interfaces
+        :type local_host: str
+        :param packets_per_batch: The number of packets to decode before\
+                    calling the callback; a partial batch is delivered if no\
+                    packet arrives for a short time
+        :type packets_per_batch: int
+        :param n_buffer_slots: If not None, packets are received into a\
+                    ring of this many preallocated buffers and decoded in\
+                    place; the arrays passed to the callback are then only\
+                    valid until the callback returns, at which point the\
+                    buffers are recycled.  Must be at least packets_per_batch.
+        :type n_buffer_slots: int
+        :param statistics: If not None, the time taken to decode each\
+                    packet is recorded here
+        :type statistics: LiveSpikeStatistics
+        :param right_shift: The right shift applied to the keys by the\
+                    LivePacketGather, which is undone when decoding
+        :type right_shift: int
+        :param payload_right_shift: The right shift applied to the payload\
+                    time stamps by the LivePacketGather, which is undone\
+                    when decoding
+        :type payload_right_shift: int
+        """
+        Thread.__init__(
+            self, name="LiveSpikeReceiver on port {}".format(port))
+        self.daemon = True
+        self._spikes_callback = spikes_callback
+        self._packets_per_batch = packets_per_batch
+        self._statistics = statistics
+        self._right_shift = right_shift
+        self._payload_right_shift = payload_right_shift
+        self._batch_receive_time = None
+        self._running = True
+        self._ring_buffer = None
+        if n_buffer_slots is not None:
+            self._ring_buffer = PacketRingBuffer(
+                max(n_buffer_slots, packets_per_batch), _MAX_PACKET_SIZE)
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if local_host is None:
+            local_host = ""
+        self._socket.bind((local_host, port))
+        self._socket.settimeout(_RECEIVE_TIMEOUT)
+
+    def run(self):
+        batch_keys = list()
+        batch_times = list()
+        batch_slots = list()
+        while self._running:
+            slot = None
+            try:
+                if self._ring_buffer is None:
+                    data = self._socket.recv(_MAX_PACKET_SIZE)
+                else:
+                    slot, data = self._ring_buffer.receive_into(self._socket)
+            except socket.timeout:
+                self._deliver(batch_keys, batch_times, batch_slots)
+                continue
+            except socket.error:
+                if self._running:
+                    logger.exception("Error receiving live spikes")
+                break
+            receive_time = clock()
+
+            try:
+                keys, times = decode_spike_packet(
+                    data, self._right_shift, self._payload_right_shift)
+            except Exception:
+                logger.exception("Error decoding live spike packet")
+                if slot is not None:
+                    self._ring_buffer.release(slot)
+                continue
+            if self._statistics is not None:
+                self._statistics.record_latency("decode", receive_time)
+            if not batch_keys:
+                self._batch_receive_time = receive_time
+            batch_keys.append(keys)
+            batch_times.append(times)
+            if slot is not None:
+                batch_slots.append(slot)
+            if len(batch_keys) >= self._packets_per_batch:
+                self._deliver(batch_keys, batch_times, batch_slots)
+
+    def _deliver(self, batch_keys, batch_times, batch_slots):
+        """ Pass the spikes of the batch on to the callback, then empty the\
+            batch and release its buffer slots
+        """
+        if not batch_keys:
+            return
+        if len(batch_keys) == 1:
+            keys = batch_keys[0]
+            times = batch_times[0]
+        else:
+            keys = numpy.concatenate(batch_keys)
+            times = numpy.concatenate(batch_times)
+        del batch_keys[:]
+        del batch_times[:]
+        try:
+            self._spikes_callback(keys, times, self._batch_receive_time)
+        except Exception:
+            logger.exception("Error in live spike callback")
+        for slot in batch_slots:
+            self._ring_buffer.release(slot)
+        del batch_slots[:]
+
+    def close(self):
+        """ Stop receiving and close the socket
+        """
+        self._running = False
+        self._socket.close()
@@ -0,0 +1,66 @@
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_file_sink import LiveSpikeFileSink
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spynnaker_live_spikes_connection import SpynnakerLiveSpikesConnection
+
+
+class LiveSpikeRecorder(object):
+    """ Records the live spikes of populations to files of (timestep,\
+        neuron_id) records, one file per population, that can be replayed\
+        with LiveSpikeReplay.  The populations must have their live output\
+        activated with time stamps in the payload.
+    """
+
+    def __init__(self, directory, receive_labels, local_host=None,
+                 local_port=19999, right_shift=0, payload_right_shift=0,
+                 flush_interval=1.0):
+        """
+
+        :param directory: The directory to write the files to
+        :type directory: str
+        :param receive_labels: Labels of the populations to record
+        :type receive_labels: iterable of str
+        :param local_host: Optional specification of the local hostname or\
+                    ip address of the interface to listen on
+        :type local_host: str
+        :param local_port: Optional specification of the local port to listen\
+                    on for the database notification
+        :type local_port: int
+        :param right_shift: The right shift given to activate_live_output_for
+        :type right_shift: int
+        :param payload_right_shift: The payload right shift given to\
+                    activate_live_output_for
+        :type payload_right_shift: int
+        :param flush_interval: The most time in seconds between flushes of\
+                    the files to disk
+        :type flush_interval: float
+        """
+        receive_labels = list(receive_labels)
+        self._sink = LiveSpikeFileSink(directory, flush_interval)
+        self._connection = SpynnakerLiveSpikesConnection(
+            receive_labels=receive_labels, local_host=local_host,
+            local_port=local_port, right_shift=right_shift,
+            payload_right_shift=payload_right_shift)
+        for label in receive_labels:
+            self._connection.add_receive_array_callback(label, self._sink)
+
+    @property
+    def connection(self):
+        """ The connection receiving the spikes
+        """
+        return self._connection
+
+    def path(self, label):
+        """ Get the path of the file of a population
+
+        :param label: the label of the population
+        :type label: str
+        :rtype: str
+        """
+        return self._sink.path(label)
+
+    def close(self):
+        """ Stop receiving and close the files
+        """
+        self._connection.close()
+        self._sink.close()
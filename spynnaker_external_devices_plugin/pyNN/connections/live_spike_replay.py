@@ -0,0 +1,110 @@
+from threading import Event
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_file_sink import read_live_spike_file
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_statistics import clock
+
+
+class LiveSpikeReplay(object):
+    """ Replays recorded spikes into a SpikeInjector population through a\
+        live spikes connection, sending the spikes of each timestep\
+        together.  The replay starts when the simulation starts, and is\
+        driven by a schedule computed in advance.  Use with::
+
+            connection = SpynnakerLiveSpikesConnection(send_labels=[label])
+            replay = LiveSpikeReplay(path, connection, label, speed=2.0)
+    """
+
+    def __init__(self, spikes, connection, label, speed=1.0,
+                 send_full_keys=False):
+        """
+
+        :param spikes: The path of a file written by a LiveSpikeFileSink or\
+                    LiveSpikeRecorder, or an array of records with\
+                    "timestep" and "neuron_id" fields
+        :type spikes: str or numpy.ndarray
+        :param connection: The connection to send the spikes with, which\
+                    must have the label as a send label
+        :type connection: SpynnakerLiveSpikesConnection
+        :param label: The label of the SpikeInjector population to send to
+        :type label: str
+        :param speed: The factor by which the replay is faster than the\
+                    simulation runs in real time, or None to send the spikes\
+                    as fast as possible
+        :type speed: float
+        :param send_full_keys: Determines whether to send full 32-bit keys\
+                    or 16-bit neuron ids
+        :type send_full_keys: bool
+        """
+        if not isinstance(spikes, numpy.ndarray):
+            spikes = read_live_spike_file(spikes)
+        self._timesteps, self._batches = self._build_schedule(spikes)
+        self._speed = speed
+        self._send_full_keys = send_full_keys
+        self._n_spikes_sent = 0
+        self._stopped = Event()
+        self._finished = Event()
+        connection.add_start_callback(label, self._replay)
+
+    @staticmethod
+    def _build_schedule(spikes):
+        """ Group the spikes by timestep
+
+        :return: the timesteps in order, and an array of the neuron ids that\
+                    spike in each
+        :rtype: (numpy.ndarray, list of numpy.ndarray)
+        """
+        timesteps = numpy.asarray(spikes["timestep"], dtype="uint32")
+        neuron_ids = numpy.asarray(spikes["neuron_id"], dtype="uint32")
+        order = numpy.argsort(timesteps, kind="mergesort")
+        timesteps = timesteps[order]
+        neuron_ids = neuron_ids[order]
+        unique_timesteps, starts = numpy.unique(timesteps, return_index=True)
+        return unique_timesteps, numpy.split(neuron_ids, starts[1:])
+
+    @property
+    def n_timesteps(self):
+        """ The number of timesteps in which spikes are sent
+        """
+        return len(self._timesteps)
+
+    @property
+    def n_spikes_sent(self):
+        """ The number of spikes sent so far
+        """
+        return self._n_spikes_sent
+
+    def _replay(self, label, connection):
+        period = None
+        if self._speed is not None:
+            period = connection.real_time_per_timestep / self._speed
+        start_time = clock()
+        for timestep, neuron_ids in zip(self._timesteps, self._batches):
+            if period is not None:
+                delay = start_time + timestep * period - clock()
+                if delay > 0 and self._stopped.wait(delay):
+                    break
+            if self._stopped.is_set():
+                break
+            connection.send_spikes(label, neuron_ids, self._send_full_keys)
+            self._n_spikes_sent += len(neuron_ids)
+        self._finished.set()
+
+    def stop(self):
+        """ Stop the replay before the next timestep is sent
+        """
+        self._stopped.set()
+
+    def wait(self, timeout=None):
+        """ Wait for the replay to finish
+
+        :param timeout: The most time to wait in seconds, or None to wait\
+                    for ever
+        :type timeout: float
+        :return: True if the replay has finished
+        :rtype: bool
+        """
+        return self._finished.wait(timeout)
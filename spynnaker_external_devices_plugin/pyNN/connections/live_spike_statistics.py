@@ -0,0 +1,204 @@
+import logging
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# A clock which never goes backwards where available
+clock = getattr(time, "monotonic", time.time)
+
+# Values are recorded in microseconds in buckets which are exact up to
+# 2 * _SUB_BUCKETS, and above that split each power of two into _SUB_BUCKETS,
+# giving a relative error of at most 1 / _SUB_BUCKETS
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+class LatencyHistogram(object):
+    """ A streaming histogram of latencies with logarithmic buckets, in the\
+        style of an HDR histogram, which uses constant memory however many\
+        values are recorded
+    """
+
+    def __init__(self):
+        self._counts = dict()
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    @staticmethod
+    def _bucket(value):
+        if value < 2 * _SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+        return (shift + 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS
+
+    @staticmethod
+    def _bucket_top(bucket):
+        if bucket < 2 * _SUB_BUCKETS:
+            return bucket
+        shift = bucket // _SUB_BUCKETS - 1
+        sub_bucket = bucket % _SUB_BUCKETS + _SUB_BUCKETS
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds):
+        """ Record a latency
+
+        :param seconds: the latency in seconds
+        :type seconds: float
+        """
+        value = max(0, int(round(seconds * 1000000)))
+        bucket = self._bucket(value)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self._count += 1
+        self._total += value
+        self._max = max(self._max, value)
+
+    @property
+    def count(self):
+        """ The number of latencies recorded
+        """
+        return self._count
+
+    @property
+    def max_us(self):
+        """ The largest latency recorded in microseconds
+        """
+        return self._max
+
+    @property
+    def mean_us(self):
+        """ The mean latency in microseconds
+        """
+        if not self._count:
+            return 0.0
+        return self._total / float(self._count)
+
+    def percentile_us(self, percentile):
+        """ Get the latency in microseconds below which the given percentage\
+            of the recorded latencies fall, to the precision of the buckets
+
+        :param percentile: the percentage, from 0 to 100
+        :type percentile: float
+        :rtype: int
+        """
+        if not self._count:
+            return 0
+        threshold = self._count * percentile / 100.0
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= threshold:
+                return min(self._bucket_top(bucket), self._max)
+        return self._max
+
+    def summary(self):
+        """ Get the count, mean, median, 99th percentile and maximum
+
+        :rtype: dict(str, float)
+        """
+        return {
+            "count": self._count, "mean_us": self.mean_us,
+            "p50_us": self.percentile_us(50),
+            "p99_us": self.percentile_us(99), "max_us": self._max}
+
+
+class LiveSpikeStatistics(object):
+    """ Latency histograms of the stages of receiving and sending live\
+        spikes, and counts of the packets and spikes of each label.
+
+    The receive stages are from the receipt of a packet to its decoding\
+    ("decode"), from the receipt to the entry of a callback ("dispatch"),\
+    and the time spent in the callbacks ("callback").  The send stage\
+    ("send") is from a call to send spikes to the sending of each of its\
+    packets, including any time spent in coalescing or pacing.
+    """
+
+    STAGES = ("decode", "dispatch", "callback", "send")
+
+    def __init__(self, log_interval=None):
+        """
+
+        :param log_interval: If not None, the statistics are logged at\
+                    most this often in seconds, as they are recorded
+        :type log_interval: float
+        """
+        self._lock = Lock()
+        self._histograms = dict(
+            (stage, LatencyHistogram()) for stage in self.STAGES)
+        self._received_batches = dict()
+        self._received_spikes = dict()
+        self._sent_packets = dict()
+        self._sent_spikes = dict()
+        self._log_interval = log_interval
+        self._last_log = clock()
+
+    def record_latency(self, stage, start_time, end_time=None):
+        """ Record the latency of a stage
+
+        :param stage: one of STAGES
+        :type stage: str
+        :param start_time: the clock() time when the stage started
+        :type start_time: float
+        :param end_time: the clock() time when the stage ended, or None for\
+                    now
+        :type end_time: float
+        """
+        if end_time is None:
+            end_time = clock()
+        with self._lock:
+            self._histograms[stage].record(end_time - start_time)
+        self._maybe_log(end_time)
+
+    def count_received(self, label, n_spikes):
+        """ Count a batch of spikes received from a label
+        """
+        with self._lock:
+            self._received_batches[label] = \
+                self._received_batches.get(label, 0) + 1
+            self._received_spikes[label] = \
+                self._received_spikes.get(label, 0) + n_spikes
+
+    def count_sent(self, label, n_packets, n_spikes):
+        """ Count packets of spikes sent to a label
+        """
+        with self._lock:
+            self._sent_packets[label] = \
+                self._sent_packets.get(label, 0) + n_packets
+            self._sent_spikes[label] = \
+                self._sent_spikes.get(label, 0) + n_spikes
+
+    def stats(self):
+        """ Get a snapshot of the statistics
+
+        :return: a dictionary with a summary of the histogram of each stage\
+                    under "latency", and the counts of each label under\
+                    "received_batches", "received_spikes", "sent_packets"\
+                    and "sent_spikes"
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "latency": dict(
+                    (stage, histogram.summary())
+                    for stage, histogram in self._histograms.items()),
+                "received_batches": dict(self._received_batches),
+                "received_spikes": dict(self._received_spikes),
+                "sent_packets": dict(self._sent_packets),
+                "sent_spikes": dict(self._sent_spikes)}
+
+    def _maybe_log(self, now):
+        if self._log_interval is None:
+            return
+        if now - self._last_log < self._log_interval:
+            return
+        self._last_log = now
+        with self._lock:
+            latencies = " ".join(
+                "{}: n={count} p50={p50_us}us p99={p99_us}us max={max_us}us"
+                .format(stage, **self._histograms[stage].summary())
+                for stage in self.STAGES)
+            received = sum(self._received_spikes.values())
+            sent = sum(self._sent_spikes.values())
+        logger.info("Live spikes received={} sent={} {}".format(
+            received, sent, latencies))
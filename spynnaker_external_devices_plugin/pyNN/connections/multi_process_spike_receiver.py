@@ -0,0 +1,220 @@
+import logging
+import multiprocessing
+import select
+import socket
+import time
+from threading import Thread
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections.eieio_spike_packets \
+    import decode_spike_packet
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+logger = logging.getLogger(__name__)
+
+# The largest UDP packet that a LivePacketGather will send
+_MAX_PACKET_SIZE = 300
+
+# How long to wait for a packet or a batch before checking for closure, and
+# before delivering a partial batch, in seconds
+_RECEIVE_TIMEOUT = 0.1
+
+# The number of spikes that a shared memory slot can hold
+_SLOT_SPIKES = 4096
+
+# The number of shared memory slots of each process
+_N_SLOTS = 8
+
+# The most spikes in a packet (127 16-bit keys)
+_MAX_SPIKES_PER_PACKET = 127
+
+# The receiving processes are forked when the receiver is created rather than
+# spawned, so that the main module of the script is not run again in each of
+# them; the receiver must therefore be created before the process starts any
+# threads, any of which might hold a lock (such as that of logging) when the
+# process is forked
+if hasattr(multiprocessing, "get_context"):
+    _multiprocessing = multiprocessing.get_context("fork")
+else:
+    _multiprocessing = multiprocessing
+
+
+def _bind(port):
+    """ Open a socket bound to a port shared with the other processes
+    """
+    udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    udp_socket.bind(("", port))
+    udp_socket.setblocking(False)
+    return udp_socket
+
+
+def _receive_process(
+        process_id, ports, keys, times, free_slots, full_slots, running,
+        right_shift, payload_right_shift):
+    """ The body of each receiving process, which listens on the ports it\
+        is sent, and decodes the packets it receives into the shared\
+        memory slots it is given
+    """
+    udp_sockets = list()
+    keys = numpy.frombuffer(keys, dtype="uint32").reshape(_N_SLOTS, -1)
+    times = numpy.frombuffer(times, dtype="uint32").reshape(_N_SLOTS, -1)
+
+    slot = None
+    n_spikes = 0
+    while running.value:
+        while True:
+            try:
+                udp_sockets.append(_bind(ports.get_nowait()))
+            except Empty:
+                break
+        if slot is None:
+            try:
+                slot = free_slots.get(timeout=_RECEIVE_TIMEOUT)
+            except Empty:
+                continue
+            n_spikes = 0
+        if udp_sockets:
+            readable, _, _ = select.select(
+                udp_sockets, [], [], _RECEIVE_TIMEOUT)
+        else:
+            time.sleep(_RECEIVE_TIMEOUT)
+            readable = []
+        if not readable:
+            if n_spikes:
+                full_slots.put((process_id, slot, n_spikes))
+                slot = None
+            continue
+        for udp_socket in readable:
+            try:
+                data = udp_socket.recv(_MAX_PACKET_SIZE)
+            except socket.error:
+                continue
+            try:
+                packet_keys, packet_times = decode_spike_packet(
+                    data, right_shift, payload_right_shift)
+            except Exception:
+                logger.exception("Error decoding live spike packet")
+                continue
+            end = n_spikes + len(packet_keys)
+            keys[slot, n_spikes:end] = packet_keys
+            times[slot, n_spikes:end] = packet_times
+            n_spikes = end
+            if n_spikes + _MAX_SPIKES_PER_PACKET > _SLOT_SPIKES:
+                full_slots.put((process_id, slot, n_spikes))
+                slot = None
+                break
+    for udp_socket in udp_sockets:
+        udp_socket.close()
+
+
+class MultiProcessSpikeReceiver(object):
+    """ Receives EIEIO spike packets on UDP ports with several processes,\
+        each bound to each port with SO_REUSEPORT so that the kernel shares\
+        the packets between them.  The processes decode their packets into\
+        slots of shared memory, and a thread of the parent process passes\
+        the decoded slots to a callback as one merged stream.
+
+    Note that the kernel shares packets out by their source address and\
+    port, so this only spreads the load when spikes arrive from several\
+    LivePacketGathers or boards.
+
+    The processes are forked when the receiver is created, before the\
+    ports are known, so that the main module of the script is not run\
+    again in them; the receiver must be created before the script starts\
+    any threads, such as those of other connections.
+    """
+
+    def __init__(self, spikes_callback, n_processes, right_shift=0,
+                 payload_right_shift=0):
+        """
+
+        :param spikes_callback: Function called with the keys and times of\
+                    the spikes of each slot decoded by a process; the arrays\
+                    are only valid until the callback returns
+        :type spikes_callback: (numpy.ndarray, numpy.ndarray) -> None
+        :param n_processes: The number of receiving processes
+        :type n_processes: int
+        :param right_shift: The right shift applied to the keys by the\
+                    LivePacketGather, which is undone when decoding
+        :type right_shift: int
+        :param payload_right_shift: The right shift applied to the payload\
+                    time stamps by the LivePacketGather, which is undone\
+                    when decoding
+        :type payload_right_shift: int
+        """
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise NotImplementedError(
+                "Receiving with several processes needs SO_REUSEPORT, which"
+                " is not available on this platform")
+        self._spikes_callback = spikes_callback
+        self._running = _multiprocessing.Value("b", 1, lock=False)
+        self._full_slots = _multiprocessing.Queue()
+        self._free_slots = list()
+        self._ports = list()
+        self._keys = list()
+        self._times = list()
+        self._processes = list()
+        for process_id in range(n_processes):
+            keys = _multiprocessing.RawArray("I", _N_SLOTS * _SLOT_SPIKES)
+            times = _multiprocessing.RawArray("I", _N_SLOTS * _SLOT_SPIKES)
+            free_slots = _multiprocessing.Queue()
+            for slot in range(_N_SLOTS):
+                free_slots.put(slot)
+            ports = _multiprocessing.Queue()
+            self._keys.append(numpy.frombuffer(
+                keys, dtype="uint32").reshape(_N_SLOTS, -1))
+            self._times.append(numpy.frombuffer(
+                times, dtype="uint32").reshape(_N_SLOTS, -1))
+            self._free_slots.append(free_slots)
+            self._ports.append(ports)
+            process = _multiprocessing.Process(
+                target=_receive_process,
+                args=(process_id, ports, keys, times, free_slots,
+                      self._full_slots, self._running, right_shift,
+                      payload_right_shift),
+                name="LiveSpikeReceiver {}".format(process_id))
+            process.daemon = True
+            process.start()
+            self._processes.append(process)
+
+        self._merge_thread = Thread(
+            target=self._merge, name="LiveSpikeReceiver merge")
+        self._merge_thread.daemon = True
+        self._merge_thread.start()
+
+    def add_port(self, port):
+        """ Start receiving on a UDP port in each of the processes
+
+        :param port: The UDP port to listen on
+        :type port: int
+        """
+        for ports in self._ports:
+            ports.put(port)
+
+    def _merge(self):
+        while self._running.value:
+            try:
+                process_id, slot, n_spikes = self._full_slots.get(
+                    timeout=_RECEIVE_TIMEOUT)
+            except Empty:
+                continue
+            try:
+                self._spikes_callback(
+                    self._keys[process_id][slot, :n_spikes],
+                    self._times[process_id][slot, :n_spikes])
+            except Exception:
+                logger.exception("Error in live spike callback")
+            self._free_slots[process_id].put(slot)
+
+    def close(self):
+        """ Stop the receiving processes
+        """
+        self._running.value = 0
+        for process in self._processes:
+            process.join()
@@ -0,0 +1,57 @@
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+class PacketRingBuffer(object):
+    """ A fixed ring of preallocated packet buffers that datagrams are\
+        received straight into, so that receiving does not allocate.  A slot\
+        is only reused once the consumer of its packet has released it.
+    """
+
+    def __init__(self, n_slots, slot_size):
+        """
+
+        :param n_slots: The number of packets that can be held at once
+        :type n_slots: int
+        :param slot_size: The size of the largest packet, in bytes
+        :type slot_size: int
+        """
+        self._slots = [bytearray(slot_size) for _ in range(n_slots)]
+        self._views = [memoryview(slot) for slot in self._slots]
+        self._free_slots = Queue()
+        for slot in range(n_slots):
+            self._free_slots.put(slot)
+
+    @property
+    def n_slots(self):
+        """ The number of slots in the ring
+        """
+        return len(self._slots)
+
+    def receive_into(self, udp_socket):
+        """ Receive a datagram into the next free slot, waiting for a slot to\
+            be released if there are none
+
+        :param udp_socket: the socket to receive from
+        :type udp_socket: socket.socket
+        :return: the slot and a view of the received bytes in the slot
+        :rtype: (int, memoryview)
+        """
+        slot = self._free_slots.get()
+        try:
+            n_bytes = udp_socket.recv_into(self._views[slot])
+        except Exception:
+            self._free_slots.put(slot)
+            raise
+        return slot, self._views[slot][:n_bytes]
+
+    def release(self, slot):
+        """ Acknowledge that the packet in a slot has been consumed, so that\
+            the slot can be reused
+
+        :param slot: the slot returned by receive_into
+        :type slot: int
+        """
+        self._free_slots.put(slot)
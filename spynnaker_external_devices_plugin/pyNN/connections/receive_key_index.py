@@ -0,0 +1,87 @@
+import numpy
+
+
+class ReceiveKeyIndex(object):
+    """ Resolves received keys to the population and neuron id that sent\
+        them, with a binary search of a sorted array of base keys.
+
+    The keys of the populations are split into runs of consecutive keys\
+    with consecutive neuron ids (usually one run per core), and each run\
+    is stored as its base key, its number of keys, its population and the\
+    neuron id of its base key.  A key then resolves with one\
+    ``numpy.searchsorted`` and a subtraction, for all keys of a packet at\
+    once.
+    """
+
+    def __init__(self, key_to_neuron_id_maps):
+        """
+
+        :param key_to_neuron_id_maps: The key to neuron id mapping of each\
+                    population, indexed by the population index to report
+        :type key_to_neuron_id_maps: list of dict(int, int)
+        """
+        base_keys = list()
+        n_keys = list()
+        population_ids = list()
+        first_neuron_ids = list()
+        for population_id, key_to_neuron_id in enumerate(
+                key_to_neuron_id_maps):
+            run_key = None
+            run_length = 0
+            run_neuron_id = None
+            for key in sorted(key_to_neuron_id):
+                neuron_id = key_to_neuron_id[key]
+                if (run_key is not None and key == run_key + run_length and
+                        neuron_id == run_neuron_id + run_length):
+                    run_length += 1
+                    continue
+                if run_key is not None:
+                    base_keys.append(run_key)
+                    n_keys.append(run_length)
+                    population_ids.append(population_id)
+                    first_neuron_ids.append(run_neuron_id)
+                run_key = key
+                run_length = 1
+                run_neuron_id = neuron_id
+            if run_key is not None:
+                base_keys.append(run_key)
+                n_keys.append(run_length)
+                population_ids.append(population_id)
+                first_neuron_ids.append(run_neuron_id)
+
+        order = numpy.argsort(
+            numpy.array(base_keys, dtype="uint32"), kind="mergesort")
+        self._base_keys = numpy.array(base_keys, dtype="uint32")[order]
+        self._n_keys = numpy.array(n_keys, dtype="uint32")[order]
+        self._population_ids = numpy.array(
+            population_ids, dtype="uint32")[order]
+        self._first_neuron_ids = numpy.array(
+            first_neuron_ids, dtype="uint32")[order]
+
+    @property
+    def n_runs(self):
+        """ The number of runs of keys in the index
+        """
+        return len(self._base_keys)
+
+    def lookup(self, keys):
+        """ Resolve an array of keys
+
+        :param keys: the keys to resolve
+        :type keys: numpy.ndarray
+        :return: a mask of the keys that were found, and the population\
+                    index and neuron id of each of the found keys
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        if not len(self._base_keys):
+            return (numpy.zeros(len(keys), dtype="bool"),
+                    numpy.zeros(0, dtype="uint32"),
+                    numpy.zeros(0, dtype="uint32"))
+        run = numpy.searchsorted(self._base_keys, keys, side="right") - 1
+        found = run >= 0
+        run[~found] = 0
+        offsets = keys - self._base_keys[run]
+        found &= offsets < self._n_keys[run]
+        run = run[found]
+        return (found, self._population_ids[run],
+                self._first_neuron_ids[run] + offsets[found])
@@ -0,0 +1,167 @@
+import collections
+import logging
+from threading import Condition, Thread
+
+import numpy
+
+
+logger = logging.getLogger(__name__)
+
+
+class SpikeDispatchQueue(object):
+    """ A bounded queue between the thread receiving live spikes and a pool\
+        of worker threads running the receive callbacks, so that slow\
+        callbacks do not hold up the receipt of packets.
+
+    What happens when a batch arrives with the queue full is set by the\
+    overflow policy:
+
+    * BLOCK: the receiving thread waits for space
+    * DROP_OLDEST: the oldest queued batch is dropped
+    * DROP_NEWEST: the new batch is dropped
+    * COALESCE: the new batch is merged into the queued batch of the same\
+      label which ends in the timestep that the new batch starts in, so that\
+      the callbacks see the spikes of each timestep together; if there is\
+      none, the oldest batch is dropped as for DROP_OLDEST
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+    _POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+    def __init__(self, deliver_callback, max_size, n_workers=1,
+                 overflow_policy=BLOCK):
+        """
+
+        :param deliver_callback: Function called by the workers with the\
+                    label, times, neuron ids and receive time of each batch
+        :type deliver_callback: (str, ndarray, ndarray, float) -> None
+        :param max_size: The most batches that can be queued, or None for\
+                    no limit
+        :type max_size: int
+        :param n_workers: The number of worker threads; with more than one,\
+                    batches may be delivered out of order
+        :type n_workers: int
+        :param overflow_policy: What to do when the queue is full; one of\
+                    BLOCK, DROP_OLDEST, DROP_NEWEST or COALESCE
+        :type overflow_policy: str
+        """
+        if overflow_policy not in self._POLICIES:
+            raise ValueError(
+                "Unknown overflow policy {}; use one of {}".format(
+                    overflow_policy, ", ".join(self._POLICIES)))
+        self._deliver_callback = deliver_callback
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+        self._queue = collections.deque()
+        self._condition = Condition()
+        self._running = True
+
+        self._n_queued = 0
+        self._n_blocked = 0
+        self._n_dropped_oldest = 0
+        self._n_dropped_newest = 0
+        self._n_coalesced = 0
+
+        self._workers = list()
+        for worker_id in range(n_workers):
+            worker = Thread(
+                target=self._run_worker,
+                name="SpikeDispatchQueue worker {}".format(worker_id))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def counters(self):
+        """ Get the number of batches queued, and the number of times that\
+            the queue was full and a batch blocked, was dropped (oldest or\
+            newest) or was coalesced
+
+        :rtype: dict(str, int)
+        """
+        with self._condition:
+            return {
+                "queued": self._n_queued, "blocked": self._n_blocked,
+                "dropped_oldest": self._n_dropped_oldest,
+                "dropped_newest": self._n_dropped_newest,
+                "coalesced": self._n_coalesced}
+
+    def put(self, label, times, neuron_ids, receive_time=None):
+        """ Queue a batch of spikes to be delivered
+
+        :param label: the label of the population that spiked
+        :type label: str
+        :param times: the time of each spike
+        :type times: numpy.ndarray
+        :param neuron_ids: the neuron id of each spike
+        :type neuron_ids: numpy.ndarray
+        :param receive_time: the time when the spikes were received
+        :type receive_time: float
+        """
+        with self._condition:
+            if (self._max_size is not None and
+                    len(self._queue) >= self._max_size):
+                if self._overflow_policy == self.BLOCK:
+                    self._n_blocked += 1
+                    while (self._running and
+                            len(self._queue) >= self._max_size):
+                        self._condition.wait()
+                elif self._overflow_policy == self.DROP_NEWEST:
+                    self._n_dropped_newest += 1
+                    return
+                elif (self._overflow_policy == self.COALESCE and
+                        self._coalesce(label, times, neuron_ids)):
+                    self._n_coalesced += 1
+                    return
+                else:
+                    self._queue.popleft()
+                    self._n_dropped_oldest += 1
+            self._queue.append((label, times, neuron_ids, receive_time))
+            self._n_queued += 1
+            self._condition.notify_all()
+
+    def _coalesce(self, label, times, neuron_ids):
+        """ Merge a batch into the newest queued batch of the same label\
+            which ends in the timestep that the batch starts in
+
+        :return: True if there was a batch to merge into
+        :rtype: bool
+        """
+        if not len(times):
+            return False
+        first_time = times[0]
+        for index in range(len(self._queue) - 1, -1, -1):
+            queued_label, queued_times, queued_neuron_ids, receive_time = \
+                self._queue[index]
+            if (queued_label == label and len(queued_times) and
+                    queued_times[-1] == first_time):
+                self._queue[index] = (
+                    label, numpy.concatenate((queued_times, times)),
+                    numpy.concatenate((queued_neuron_ids, neuron_ids)),
+                    receive_time)
+                return True
+        return False
+
+    def _run_worker(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                label, times, neuron_ids, receive_time = \
+                    self._queue.popleft()
+                self._condition.notify_all()
+            try:
+                self._deliver_callback(label, times, neuron_ids, receive_time)
+            except Exception:
+                logger.exception("Error in live spike callback")
+
+    def close(self):
+        """ Stop the workers once the queued batches have been delivered
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
@@ -0,0 +1,72 @@
+import collections
+from threading import Lock
+
+
+class SpikePacketCache(object):
+    """ A least-recently-used cache of the serialised EIEIO packets of sets\
+        of spikes that are sent repeatedly, so that sending them again does\
+        not need their keys to be looked up or the packets to be built
+    """
+
+    def __init__(self, max_entries):
+        """
+
+        :param max_entries: The most sets of spikes whose packets are kept
+        :type max_entries: int
+        """
+        self._max_entries = max_entries
+        self._packets = collections.OrderedDict()
+        self._lock = Lock()
+        self._n_hits = 0
+        self._n_misses = 0
+
+    @property
+    def n_hits(self):
+        """ The number of times that packets were found in the cache
+        """
+        return self._n_hits
+
+    @property
+    def n_misses(self):
+        """ The number of times that packets were not found in the cache
+        """
+        return self._n_misses
+
+    def __len__(self):
+        return len(self._packets)
+
+    def get(self, key):
+        """ Get the packets of a set of spikes, marking them as recently used
+
+        :param key: the hashable identity of the spikes
+        :return: the bytes of each packet, or None if they are not cached
+        :rtype: list of str
+        """
+        with self._lock:
+            packets = self._packets.pop(key, None)
+            if packets is None:
+                self._n_misses += 1
+                return None
+            self._packets[key] = packets
+            self._n_hits += 1
+            return packets
+
+    def put(self, key, packets):
+        """ Add the packets of a set of spikes, evicting the least recently\
+            used packets if the cache is full
+
+        :param key: the hashable identity of the spikes
+        :param packets: the bytes of each packet
+        :type packets: list of str
+        """
+        with self._lock:
+            self._packets.pop(key, None)
+            self._packets[key] = packets
+            while len(self._packets) > self._max_entries:
+                self._packets.popitem(last=False)
+
+    def clear(self):
+        """ Remove all the packets, for example when the keys have changed
+        """
+        with self._lock:
+            self._packets.clear()
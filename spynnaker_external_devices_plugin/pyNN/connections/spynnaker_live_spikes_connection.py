@@ -1,21 +1,211 @@
+import hashlib
+import logging
+import sqlite3
+from threading import Thread
+
+import numpy
+
 from spinn_front_end_common.utilities.connections.live_event_connection \
     import LiveEventConnection
+from spynnaker_external_devices_plugin.pyNN.connections.eieio_spike_packets \
+    import build_spike_packets
+from spynnaker_external_devices_plugin.pyNN.connections.live_spike_receiver \
+    import LiveSpikeReceiver
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_statistics import LiveSpikeStatistics, clock
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .multi_process_spike_receiver import MultiProcessSpikeReceiver
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spike_dispatch_queue import SpikeDispatchQueue
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spike_packet_cache import SpikePacketCache
+from spynnaker_external_devices_plugin.pyNN.connections.receive_key_index \
+    import ReceiveKeyIndex
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .timestep_spike_buffer import TimestepSpikeBuffer
+from spynnaker_external_devices_plugin.pyNN.connections.token_bucket_pacer \
+    import TokenBucketPacer
+from spynnaker_external_devices_plugin.pyNN.utility_models.live_labels \
+    import LIVE_PACKET_GATHER_LABEL, PARTITIONED_SPIKE_INJECTOR_PART_LABEL
+
+logger = logging.getLogger(__name__)
+
+# The number of rows of the result of a query read from the database at once
+_QUERY_CHUNK_ROWS = 4096
+
+
+def _query_database(database_reader, query, chunk_callback, parameters=()):
+    """ Run a query that the database reader has no method for on its\
+        database, passing the rows of the result on in chunks as they are\
+        read.  This is the only place where the cursor of the reader is\
+        used directly.
+
+    :param database_reader: the reader of the notification database
+    :param query: the SQL query
+    :type query: str
+    :param chunk_callback: Function called with each chunk of the rows of\
+                the result
+    :type chunk_callback: (list of tuple) -> None
+    :param parameters: the values of the parameters of the query
+    :return: True if the query was run, or False if the reader has no\
+                cursor or the query failed
+    :rtype: bool
+    """
+    cursor = getattr(database_reader, "_cursor", None)
+    if cursor is None:
+        return False
+    try:
+        cursor.execute(query, parameters)
+        rows = cursor.fetchmany(_QUERY_CHUNK_ROWS)
+        while rows:
+            chunk_callback([tuple(row) for row in rows])
+            rows = cursor.fetchmany(_QUERY_CHUNK_ROWS)
+    except sqlite3.Error:
+        return False
+    return True
 
 
-# The maximum number of 32-bit keys that will fit in a packet
-_MAX_FULL_KEYS_PER_PACKET = 63
+def _key_mapping_signature(database_reader):
+    """ Get a signature of the key to neuron mapping table of the database,\
+        which changes if the graph has changed: a hash of every vertex,\
+        neuron id and key in the table.  The database sorts the rows, and\
+        they are hashed in chunks as they are read rather than being\
+        collected in Python first.
+
+    :return: the signature, or None if the table cannot be read, in which\
+                case the keys must be read again
+    :rtype: str
+    """
+    signature = hashlib.sha1()
+
+    def hash_rows(rows):
+        signature.update(numpy.array(rows, dtype="int64").tobytes())
+
+    if not _query_database(
+            database_reader,
+            "SELECT vertex_id, neuron_id, key FROM key_to_neuron_mapping"
+            " ORDER BY vertex_id, neuron_id, key", hash_rows):
+        return None
+    return signature.hexdigest()
+
+
+def _get_live_input_part_labels(database_reader, label):
+    """ Get the labels of the machine vertices in the database that may be\
+        cores of a population split by a PartitionedSpikeInjector
+
+    :return: the labels, or None if the reader has no cursor or the query\
+                failed
+    :rtype: set of str
+    """
+    part_labels = set()
 
-# The maximum number of 16-bit keys that will fit in a packet
-_MAX_HALF_KEYS_PER_PACKET = 127
+    def add_part_labels(rows):
+        part_labels.update(row[0] for row in rows)
+
+    if not _query_database(
+            database_reader,
+            "SELECT label FROM Machine_vertices WHERE label LIKE ?",
+            add_part_labels,
+            (PARTITIONED_SPIKE_INJECTOR_PART_LABEL.format(label, "%"),)):
+        return None
+    return part_labels
+
+
+def _read_live_input_parts(database_reader, label, n_neurons):
+    """ Get the address of the reverse IP tag of each core of a population\
+        to which spikes will be sent, if it is split over cores by a\
+        PartitionedSpikeInjector.  The injector labels the machine vertex of\
+        each core with the index of the core, and gives each core but the\
+        last the same number of neurons.
+
+    :param database_reader: the reader of the notification database
+    :param label: the label of the population
+    :type label: str
+    :param n_neurons: the number of neurons of the population
+    :type n_neurons: int
+    :return: the first neuron id of each core in order, and the ip address\
+                and port of each core, or None if the population is on one\
+                core or the machine vertices cannot be read
+    :rtype: (numpy.ndarray, list of (str, int))
+    """
+    if not hasattr(database_reader, "get_machine_live_input_details"):
+        return None
+    part_labels = _get_live_input_part_labels(database_reader, label)
+    if part_labels is None:
+        return None
+
+    # The reader fails rather than returning None for a machine vertex that
+    # is not in the database, so only the cores found are asked for
+    addresses = list()
+    while True:
+        part_label = PARTITIONED_SPIKE_INJECTOR_PART_LABEL.format(
+            label, len(addresses))
+        if part_label not in part_labels:
+            break
+        details = database_reader.get_machine_live_input_details(part_label)
+        if details is None or None in details:
+            break
+        addresses.append(tuple(details))
+    if len(addresses) < 2:
+        return None
+    neurons_per_part = -(-n_neurons // len(addresses))
+    lo_atoms = numpy.arange(
+        len(addresses), dtype="uint32") * neurons_per_part
+    return lo_atoms, addresses
+
+
+def _as_neuron_id_array(neuron_ids):
+    """ Convert neuron ids given as a list, array or set to an array
+    """
+    if isinstance(neuron_ids, (set, frozenset)):
+        return numpy.fromiter(
+            sorted(neuron_ids), dtype="uint32", count=len(neuron_ids))
+    return numpy.asarray(neuron_ids, dtype="uint32")
+
+
+def _is_selected(neuron_ids, selected_neuron_ids):
+    """ Find which neuron ids are among some selected neuron ids
+
+    :param neuron_ids: the neuron ids
+    :type neuron_ids: numpy.ndarray
+    :param selected_neuron_ids: the selected neuron ids, sorted
+    :type selected_neuron_ids: numpy.ndarray
+    :return: True for each neuron id which is selected
+    :rtype: numpy.ndarray
+    """
+    if not len(selected_neuron_ids):
+        return numpy.zeros(len(neuron_ids), dtype="bool")
+    indices = numpy.searchsorted(selected_neuron_ids, neuron_ids)
+    indices[indices == len(selected_neuron_ids)] = 0
+    return selected_neuron_ids[indices] == neuron_ids
 
 
 class SpynnakerLiveSpikesConnection(LiveEventConnection):
     """ A connection for receiving and sending live spikes from and to\
         SpiNNaker
+
+    Between runs, the keys of the populations are only read again from\
+    the database if the graph has changed.  This only saves the reading of\
+    the keys of the populations whose spikes are received: the\
+    LiveEventConnection still reads the keys of the populations to which\
+    spikes are sent on every run.  A change is detected through the\
+    cursor of the database reader, which is not part of its interface; if\
+    the reader has no cursor, every key is read on every run.  The cores\
+    of a PartitionedSpikeInjector are also found through the cursor, so\
+    without it spikes are only sent to the first core.
     """
 
     def __init__(self, receive_labels=None, send_labels=None, local_host=None,
-                 local_port=19999):
+                 local_port=19999, packets_per_batch=1,
+                 n_receive_buffer_slots=None, coalesce_sends=False,
+                 injection_spikes_per_timestep=None, max_queued_spikes=None,
+                 n_receive_processes=None, collect_statistics=False,
+                 statistics_log_interval=None, dispatch_queue_size=None,
+                 n_dispatch_workers=1,
+                 dispatch_overflow_policy=SpikeDispatchQueue.BLOCK,
+                 dispatch_groups=None, packet_cache_size=None,
+                 right_shift=0, payload_right_shift=0,
+                 receive_neuron_ids=None):
         """
 
         :param receive_labels: Labels of population from which live spikes\
@@ -31,13 +221,571 @@ class SpynnakerLiveSpikesConnection(LiveEventConnection):
                     on.  Must match the port that the toolchain will send the\
                     notification on (19999 by default)
         :type local_port: int
+        :param packets_per_batch: The number of received packets that are\
+                    decoded together before the receive callbacks are called
+        :type packets_per_batch: int
+        :param n_receive_buffer_slots: If not None, received packets are\
+                    read into a ring of this many preallocated buffers and\
+                    decoded without copying, rather than allocating each\
+                    packet
+        :type n_receive_buffer_slots: int
+        :param coalesce_sends: If True, spikes sent are collected and sent\
+                    together at the end of each simulation timestep, in as\
+                    few packets as possible, rather than being sent\
+                    immediately
+        :type coalesce_sends: bool
+        :param injection_spikes_per_timestep: If not None, the sending of\
+                    spikes is paced with a token bucket to no more than this\
+                    many spikes per simulation timestep (in real time), which\
+                    should be what the injector can turn into multicast\
+                    packets in a timestep.  Bursts are queued rather than\
+                    dropped.
+        :type injection_spikes_per_timestep: int
+        :param max_queued_spikes: The largest number of spikes that can be\
+                    queued by the pacing before spikes are dropped, or None\
+                    for no limit
+        :type max_queued_spikes: int
+        :param n_receive_processes: If not None, live spikes are received\
+                    and decoded by this many processes sharing each port\
+                    with SO_REUSEPORT, rather than by a single thread;\
+                    packets_per_batch, n_receive_buffer_slots and the\
+                    statistics cannot then be used.  The processes are\
+                    forked when the connection is created, so it must be\
+                    created before the script starts any threads of its\
+                    own or creates any other connection.  The kernel\
+                    shares the packets out by their source, so this only\
+                    spreads the load when spikes come from several\
+                    LivePacketGathers or boards.
+        :type n_receive_processes: int
+        :param collect_statistics: If True, the latencies of decoding,\
+                    dispatching and running callbacks for received spikes,\
+                    and of sending spikes, are recorded in histograms along\
+                    with counts for each label; see stats()
+        :type collect_statistics: bool
+        :param statistics_log_interval: If not None, the statistics are\
+                    also logged this often in seconds
+        :type statistics_log_interval: float
+        :param dispatch_queue_size: If not None, received spikes are passed\
+                    to the receive callbacks through a queue of up to this\
+                    many batches run by a pool of worker threads, rather\
+                    than by the thread that receives them
+        :type dispatch_queue_size: int
+        :param n_dispatch_workers: The number of threads running the receive\
+                    callbacks when there is a dispatch queue; with more than\
+                    one, batches may be delivered out of order
+        :type n_dispatch_workers: int
+        :param dispatch_overflow_policy: What to do with received spikes\
+                    when the dispatch queue is full; see SpikeDispatchQueue
+        :type dispatch_overflow_policy: str
+        :param dispatch_groups: If not None, groups of receive labels whose\
+                    callbacks are run in order by a thread of their own\
+                    rather than by a shared pool, so that the groups are\
+                    processed in parallel.  Labels in no group get a thread\
+                    each, so an empty list gives a thread per label.  Each\
+                    group has a queue of dispatch_queue_size batches (no\
+                    limit if None).
+        :type dispatch_groups: iterable of iterable of str
+        :param packet_cache_size: If not None, the packets of up to this\
+                    many sets of spikes sent are kept, least recently used\
+                    first out, so that sending the same spikes again just\
+                    sends the packets.  Sets of spikes are best given as\
+                    frozensets, whose hashes Python keeps.
+        :type packet_cache_size: int
+        :param right_shift: The right shift given to activate_live_output_for\
+                    for the received populations, which is undone when the\
+                    keys are decoded
+        :type right_shift: int
+        :param payload_right_shift: The payload right shift given to\
+                    activate_live_output_for for the received populations,\
+                    which is undone when the time stamps are decoded
+        :type payload_right_shift: int
+        :param receive_neuron_ids: For each receive label, the ids of the\
+                    only neurons whose spikes are passed to the callbacks.\
+                    This filters out the spikes of the other neurons on the\
+                    cores of the neuron_ids given to activate_live_output_for.
+        :type receive_neuron_ids: dict(str, array-like of int)
 
         """
 
+        if n_receive_processes is not None and (
+                packets_per_batch != 1 or
+                n_receive_buffer_slots is not None or collect_statistics or
+                statistics_log_interval is not None):
+            raise ValueError(
+                "n_receive_processes cannot be used with packets_per_batch,"
+                " n_receive_buffer_slots or statistics, as the receiving"
+                " processes batch the packets in their own buffers")
+
+        # The receiving processes are forked before the LiveEventConnection
+        # starts any threads
+        self._multi_process_receiver = None
+        if n_receive_processes is not None:
+            self._multi_process_receiver = MultiProcessSpikeReceiver(
+                self._receive_spikes, n_receive_processes, right_shift,
+                payload_right_shift)
+
+        # The live spikes are received and decoded here rather than in the
+        # LiveEventConnection, so that they can be decoded into arrays
         LiveEventConnection.__init__(
-            self, "LiveSpikeReceiver", receive_labels, send_labels,
+            self, LIVE_PACKET_GATHER_LABEL, None, send_labels,
             local_host, local_port)
 
+        self._spike_send_labels = send_labels
+        self._spike_receive_labels = list()
+        if receive_labels is not None:
+            self._spike_receive_labels = list(receive_labels)
+
+        # The sorted ids of the neurons whose spikes are received, of the
+        # labels which only receive some of their neurons
+        self._receive_neuron_ids = dict()
+        if receive_neuron_ids is not None:
+            for label, neuron_ids in receive_neuron_ids.items():
+                self._receive_neuron_ids[label] = numpy.unique(
+                    _as_neuron_id_array(neuron_ids))
+        self._packets_per_batch = packets_per_batch
+        self._n_receive_buffer_slots = n_receive_buffer_slots
+        self._right_shift = right_shift
+        self._payload_right_shift = payload_right_shift
+        self._real_time_per_timestep = None
+        self._statistics = None
+        if collect_statistics or statistics_log_interval is not None:
+            self._statistics = LiveSpikeStatistics(statistics_log_interval)
+
+        # The queue through which the spikes of each label are dispatched,
+        # if they are not dispatched by the receiving thread
+        self._dispatch_queue = None
+        self._dispatch_queues = dict()
+        if dispatch_groups is not None:
+            groups = [list(group) for group in dispatch_groups]
+            grouped_labels = set(
+                label for group in groups for label in group)
+            groups.extend(
+                [label] for label in self._spike_receive_labels
+                if label not in grouped_labels)
+            for group in groups:
+                queue = SpikeDispatchQueue(
+                    self._deliver_spikes, dispatch_queue_size, 1,
+                    dispatch_overflow_policy)
+                for label in group:
+                    self._dispatch_queues[label] = queue
+        elif dispatch_queue_size is not None:
+            self._dispatch_queue = SpikeDispatchQueue(
+                self._deliver_spikes, dispatch_queue_size, n_dispatch_workers,
+                dispatch_overflow_policy)
+            for label in self._spike_receive_labels:
+                self._dispatch_queues[label] = self._dispatch_queue
+
+        # The callbacks of each receive label
+        self._receive_init_callbacks = dict()
+        self._receive_start_callbacks = dict()
+        self._receive_callbacks = dict()
+        self._receive_array_callbacks = dict()
+        for label in self._spike_receive_labels:
+            self._receive_init_callbacks[label] = list()
+            self._receive_start_callbacks[label] = list()
+            self._receive_callbacks[label] = list()
+            self._receive_array_callbacks[label] = list()
+
+        # The index of the keys of the receive labels and the number of
+        # neurons of each, built when the database is read, and the signature
+        # of the key mapping that they were built from
+        self._receive_key_index = None
+        self._n_receive_neurons = dict()
+        self._key_mapping_signature = None
+        self._spike_receivers = dict()
+
+        # The key of each neuron of each send label, indexed by neuron id,
+        # and the base key of labels whose keys are base_key | neuron_id
+        self._send_keys = dict()
+        self._send_base_keys = dict()
+
+        # The first neuron id and the address of each core of the send
+        # labels whose spikes are sent to more than one core
+        self._send_parts = dict()
+        self._spike_send_buffer = None
+        if coalesce_sends:
+            self._spike_send_buffer = TimestepSpikeBuffer(
+                self._send_spikes_now)
+        self._packet_cache = None
+        if packet_cache_size is not None:
+            self._packet_cache = SpikePacketCache(packet_cache_size)
+        self._send_pacer = None
+        if injection_spikes_per_timestep is not None:
+            self._send_pacer = TokenBucketPacer(
+                self._send_packet, injection_spikes_per_timestep,
+                max_queued_spikes)
+            self._send_pacer.start()
+        self.add_database_callback(self._read_spike_database_callback)
+
+    def add_init_callback(self, label, init_callback):
+        if label in self._receive_init_callbacks:
+            self._receive_init_callbacks[label].append(init_callback)
+        else:
+            LiveEventConnection.add_init_callback(self, label, init_callback)
+
+    def add_start_callback(self, label, start_callback):
+        if label in self._receive_start_callbacks:
+            self._receive_start_callbacks[label].append(start_callback)
+        else:
+            LiveEventConnection.add_start_callback(
+                self, label, start_callback)
+
+    def add_receive_callback(self, label, live_event_callback):
+        """ Add a callback for the reception of live spikes; this is called\
+            once for each timestep of each batch of received packets
+
+        :param label: the label of the population from which the spikes are\
+                    received
+        :type label: str
+        :param live_event_callback: Function called with the label, the\
+                    timestep and a list of the ids of the neurons that spiked
+        :type live_event_callback: (str, int, [int]) -> None
+        """
+        self._receive_callbacks[label].append(live_event_callback)
+
+    def add_receive_array_callback(self, label, live_spikes_callback):
+        """ Add a callback for the reception of live spikes as arrays; this\
+            is called once for each batch of received packets that contains\
+            spikes from the population
+
+        :param label: the label of the population from which the spikes are\
+                    received
+        :type label: str
+        :param live_spikes_callback: Function called with the label, an\
+                    array of spike times and an array of the ids of the\
+                    neurons that spiked at those times
+        :type live_spikes_callback: \
+            (str, numpy.ndarray, numpy.ndarray) -> None
+        """
+        self._receive_array_callbacks[label].append(live_spikes_callback)
+
+    def _read_spike_database_callback(self, database_reader):
+        """ Read the keys of the populations to which spikes will be sent,\
+            and set up the reception of spikes from the populations from\
+            which spikes will be received.  The keys are only read again\
+            if the key mapping has changed since the last run.
+
+        :param database_reader: the reader of the notification database
+        """
+        # If the graph has not changed since the last run, the keys read then
+        # are still valid, so the database is only read for the timing
+        key_mapping_signature = _key_mapping_signature(database_reader)
+        keys_changed = (
+            key_mapping_signature is None or
+            key_mapping_signature != self._key_mapping_signature)
+        self._key_mapping_signature = key_mapping_signature
+        if keys_changed:
+            self._read_send_keys(database_reader)
+        self._read_send_parts(database_reader)
+
+        run_time_ms = database_reader.get_configuration_parameter_value(
+            "runtime")
+        machine_time_step = database_reader.get_configuration_parameter_value(
+            "machine_time_step")
+        machine_timestep_ms = machine_time_step / 1000.0
+        time_scale_factor = database_reader.get_configuration_parameter_value(
+            "time_scale_factor")
+        self._real_time_per_timestep = (
+            machine_time_step * time_scale_factor) / 1000000.0
+        if self._spike_send_buffer is not None:
+            self._spike_send_buffer.set_timestep(
+                machine_time_step, time_scale_factor)
+        if self._send_pacer is not None:
+            self._send_pacer.set_timestep(machine_time_step, time_scale_factor)
+        for label in self._spike_receive_labels:
+            host, port, strip_sdp = database_reader.get_live_output_details(
+                label, LIVE_PACKET_GATHER_LABEL)
+            if not strip_sdp:
+                raise ValueError(
+                    "Currently, only ip tags which strip the SDP headers are"
+                    " supported")
+            if port not in self._spike_receivers:
+                self._spike_receivers[port] = self._create_spike_receiver(
+                    port)
+            logger.info("Listening for traffic from {} on {}:{}".format(
+                label, host, port))
+        if keys_changed:
+            self._read_receive_keys(database_reader)
+
+        for label in self._spike_receive_labels:
+            for init_callback in self._receive_init_callbacks[label]:
+                init_callback(
+                    label, self._n_receive_neurons[label], run_time_ms,
+                    machine_timestep_ms)
+
+    def _read_send_keys(self, database_reader):
+        """ Read the keys of the populations to which spikes will be sent
+
+        :param database_reader: the reader of the notification database
+        """
+        if self._packet_cache is not None:
+            self._packet_cache.clear()
+        if self._spike_send_labels is not None:
+            for label in self._spike_send_labels:
+                neuron_id_to_key = \
+                    database_reader.get_neuron_id_to_key_mapping(label)
+                keys = numpy.array(
+                    [neuron_id_to_key[neuron_id]
+                     for neuron_id in sorted(neuron_id_to_key)],
+                    dtype="uint32")
+                self._send_keys[label] = keys
+
+                # Most injectors have a contiguous key range, in which case
+                # the keys can be computed rather than looked up
+                base_key = None
+                if len(keys) > 0:
+                    base_key = int(keys[0])
+                    if not numpy.array_equal(
+                            keys, base_key | numpy.arange(
+                                len(keys), dtype="uint32")):
+                        base_key = None
+                self._send_base_keys[label] = base_key
+
+    def _read_send_parts(self, database_reader):
+        """ Read the address of each core of the populations to which spikes\
+            will be sent which are on more than one core, so that each spike\
+            is sent to the core of its neuron
+
+        :param database_reader: the reader of the notification database
+        """
+        self._send_parts.clear()
+        if self._spike_send_labels is not None:
+            for label in self._spike_send_labels:
+                parts = _read_live_input_parts(
+                    database_reader, label, len(self._send_keys[label]))
+                if parts is not None:
+                    self._send_parts[label] = parts
+                    logger.info("Sending spikes to {} on {} cores".format(
+                        label, len(parts[1])))
+
+    def _read_receive_keys(self, database_reader):
+        """ Build the index of the keys of the populations from which spikes\
+            will be received
+
+        :param database_reader: the reader of the notification database
+        """
+        key_to_neuron_id_maps = list()
+        for label in self._spike_receive_labels:
+            key_to_neuron_id = \
+                database_reader.get_key_to_neuron_id_mapping(label)
+            key_to_neuron_id_maps.append(key_to_neuron_id)
+            self._n_receive_neurons[label] = len(key_to_neuron_id)
+        self._receive_key_index = ReceiveKeyIndex(key_to_neuron_id_maps)
+
+    def _create_spike_receiver(self, port):
+        """ Start receiving live spikes on a port
+
+        :param port: the port to listen on
+        :type port: int
+        :return: the receiver, which must have a close() method, or None if\
+                    the port is added to the receiving processes
+        """
+        if self._multi_process_receiver is not None:
+            self._multi_process_receiver.add_port(port)
+            return None
+        receiver = LiveSpikeReceiver(
+            port, self._receive_spikes,
+            packets_per_batch=self._packets_per_batch,
+            n_buffer_slots=self._n_receive_buffer_slots,
+            statistics=self._statistics, right_shift=self._right_shift,
+            payload_right_shift=self._payload_right_shift)
+        receiver.start()
+        return receiver
+
+    def _receive_spikes(self, keys, times, receive_time=None):
+        """ Resolve received keys to the neuron ids of each label and pass\
+            them on to the receive callbacks
+
+        :param keys: the keys of the received spikes
+        :type keys: numpy.ndarray
+        :param times: the times of the received spikes
+        :type times: numpy.ndarray
+        :param receive_time: the clock() time when the spikes were\
+                    received, if known
+        :type receive_time: float
+        """
+        key_index = self._receive_key_index
+        if key_index is None:
+            return
+        found, label_ids, neuron_ids = key_index.lookup(keys)
+        times = times[found]
+
+        # Group the spikes by label, keeping their order within each label
+        order = numpy.argsort(label_ids, kind="mergesort")
+        label_ids = label_ids[order]
+        unique_label_ids, starts = numpy.unique(label_ids, return_index=True)
+        ends = numpy.append(starts[1:], len(label_ids))
+        for label_id, start, end in zip(unique_label_ids, starts, ends):
+            spikes = order[start:end]
+            label = self._spike_receive_labels[label_id]
+            if label in self._receive_neuron_ids:
+                spikes = spikes[_is_selected(
+                    neuron_ids[spikes], self._receive_neuron_ids[label])]
+                if not len(spikes):
+                    continue
+            dispatch_queue = self._dispatch_queues.get(label)
+            if dispatch_queue is not None:
+                dispatch_queue.put(
+                    label, times[spikes], neuron_ids[spikes], receive_time)
+            else:
+                self._deliver_spikes(
+                    label, times[spikes], neuron_ids[spikes], receive_time)
+
+    def _deliver_spikes(self, label, times, neuron_ids, receive_time=None):
+        """ Call the receive callbacks of a label
+
+        :param label: the label of the population that spiked
+        :param times: the time of each spike
+        :param neuron_ids: the neuron id of each spike
+        :param receive_time: the clock() time when the spikes were received
+        """
+        if self._statistics is not None:
+            self._statistics.count_received(label, len(neuron_ids))
+        for callback in self._receive_array_callbacks[label]:
+            self._call_receive_callback(
+                callback, receive_time, label, times, neuron_ids)
+
+        if self._receive_callbacks[label]:
+            order = numpy.argsort(times, kind="mergesort")
+            times = times[order]
+            neuron_ids = neuron_ids[order]
+            unique_times, starts = numpy.unique(times, return_index=True)
+            ends = numpy.append(starts[1:], len(times))
+            for time, start, end in zip(unique_times, starts, ends):
+                time_neuron_ids = neuron_ids[start:end].tolist()
+                for callback in self._receive_callbacks[label]:
+                    self._call_receive_callback(
+                        callback, receive_time, label, int(time),
+                        time_neuron_ids)
+
+    def _call_receive_callback(self, callback, receive_time, *args):
+        """ Call a receive callback, recording its latency if statistics\
+            are being collected
+        """
+        if self._statistics is None:
+            callback(*args)
+            return
+        start_time = clock()
+        if receive_time is not None:
+            self._statistics.record_latency(
+                "dispatch", receive_time, start_time)
+        callback(*args)
+        self._statistics.record_latency("callback", start_time)
+
+    def _start_callback(self):
+        if (self._spike_send_buffer is not None and
+                not self._spike_send_buffer.is_alive()):
+            self._spike_send_buffer.start()
+        LiveEventConnection._start_callback(self)
+        for label, callbacks in self._receive_start_callbacks.items():
+            for callback in callbacks:
+                callback_thread = Thread(
+                    target=callback, args=(label, self),
+                    name="start callback thread for {}".format(label))
+                callback_thread.start()
+
+    def flush_spikes(self):
+        """ Send any spikes collected for the current timestep now, when\
+            sends are coalesced
+
+        :return: the number of packets sent
+        :rtype: int
+        """
+        if self._spike_send_buffer is None:
+            return 0
+        return self._spike_send_buffer.flush()
+
+    def stats(self):
+        """ Get the latency histograms and label counts collected when\
+            collect_statistics is True
+
+        :return: a dictionary of the statistics, or None if they are not\
+                    being collected; see LiveSpikeStatistics.stats()
+        :rtype: dict
+        """
+        if self._statistics is None:
+            return None
+        return self._statistics.stats()
+
+    @property
+    def real_time_per_timestep(self):
+        """ The time in seconds that each simulation timestep takes in real\
+            time, or None if the database has not yet been read
+
+        :rtype: float
+        """
+        return self._real_time_per_timestep
+
+    @property
+    def packet_cache(self):
+        """ The cache of the packets of spikes sent, which counts its hits\
+            and misses, or None if packets are not cached
+
+        :rtype: SpikePacketCache
+        """
+        return self._packet_cache
+
+    @property
+    def send_pacer(self):
+        """ The pacer of sent spikes, which counts the spikes queued,\
+            delayed and dropped, or None if sending is not paced
+
+        :rtype: TokenBucketPacer
+        """
+        return self._send_pacer
+
+    @property
+    def dispatch_queue(self):
+        """ The queue of received spikes waiting for the receive callbacks,\
+            which counts the batches queued, blocked, dropped and coalesced,\
+            or None if the callbacks are run by the receiving thread
+
+        :rtype: SpikeDispatchQueue
+        """
+        return self._dispatch_queue
+
+    @property
+    def dispatch_queues(self):
+        """ The queue through which the spikes of each receive label are\
+            dispatched; labels in the same group share a queue
+
+        :rtype: dict(str, SpikeDispatchQueue)
+        """
+        return dict(self._dispatch_queues)
+
+    def close(self):
+        if self._spike_send_buffer is not None:
+            self._spike_send_buffer.close()
+        if self._send_pacer is not None:
+            self._send_pacer.close()
+        LiveEventConnection.close(self)
+        for receiver in self._spike_receivers.values():
+            if receiver is not None:
+                receiver.close()
+        if self._multi_process_receiver is not None:
+            self._multi_process_receiver.close()
+        for dispatch_queue in set(self._dispatch_queues.values()):
+            dispatch_queue.close()
+
+    def _get_spike_keys(self, label, neuron_ids):
+        """ Get the 32-bit keys of an array of neuron ids
+
+        :param label: The label of the population sending the spikes
+        :type label: str
+        :param neuron_ids: the neuron ids
+        :type neuron_ids: numpy.ndarray
+        :rtype: numpy.ndarray
+        """
+        n_neurons = len(self._send_keys[label])
+        if len(neuron_ids) and int(neuron_ids.max()) >= n_neurons:
+            raise ValueError(
+                "Neuron id {} is out of range for {}, which has {}"
+                " neurons".format(int(neuron_ids.max()), label, n_neurons))
+        base_key = self._send_base_keys[label]
+        if base_key is not None:
+            return neuron_ids | numpy.uint32(base_key)
+        return self._send_keys[label][neuron_ids]
+
     def send_spike(self, label, neuron_id, send_full_keys=False):
         """ Send a spike from a single neuron
 
@@ -50,20 +798,149 @@ class SpynnakerLiveSpikesConnection(LiveEventConnection):
                     getting the key for each neuron from the database, or\
                     whether to send 16-bit neuron ids directly
         :type send_full_keys: bool
+        :return: the number of packets sent
+        :rtype: int
         """
-        self.send_spikes(label, [neuron_id], send_full_keys)
+        return self.send_spikes(label, [neuron_id], send_full_keys)
 
     def send_spikes(self, label, neuron_ids, send_full_keys=False):
-        """ Send a number of spikes
+        """ Send a number of spikes, packing as many keys into each EIEIO\
+            packet as will fit (63 32-bit keys or 127 16-bit keys)
 
         :param label: The label of the population from which the spikes will\
                     originate
         :type label: str
-        :param neuron_ids: array-like of neuron ids sending spikes
-        :type: [int]
+        :param neuron_ids: array-like or set of neuron ids sending spikes
+        :type: [int] or numpy.ndarray or frozenset
         :param send_full_keys: Determines whether to send full 32-bit keys,\
                     getting the key for each neuron from the database, or\
                     whether to send 16-bit neuron ids directly
         :type send_full_keys: bool
+        :return: the number of packets sent, which is 0 if sends are\
+                    coalesced as the spikes are sent at the end of the\
+                    timestep
+        :rtype: int
+        """
+        enqueue_time = None
+        if self._statistics is not None:
+            enqueue_time = clock()
+        if self._spike_send_buffer is not None:
+            self._spike_send_buffer.add_spikes(
+                label, _as_neuron_id_array(neuron_ids), send_full_keys,
+                enqueue_time)
+            return 0
+        return self._send_spikes_now(
+            label, neuron_ids, send_full_keys, enqueue_time)
+
+    def _send_spikes_now(self, label, neuron_ids, send_full_keys,
+                         enqueue_time=None):
+        """ Send a number of spikes immediately
+
+        :param enqueue_time: the clock() time when the spikes were sent by\
+                    the caller, if statistics are being collected
+        :return: the number of packets sent
+        :rtype: int
+        """
+        if self._packet_cache is None:
+            packets = self._build_spike_packets(
+                label, neuron_ids, send_full_keys)
+        else:
+            packets = self._get_cached_spike_packets(
+                label, neuron_ids, send_full_keys)
+        if self._statistics is not None:
+            self._statistics.count_sent(label, len(packets), len(neuron_ids))
+        for part, data in packets:
+            address = self._send_address(label, part)
+            if self._send_pacer is not None:
+                self._send_pacer.send(data, address, enqueue_time)
+            else:
+                self._send_packet(data, address, enqueue_time)
+        return len(packets)
+
+    def _send_address(self, label, part):
+        """ Get the ip address and port to send the packets of a part of a\
+            population to
+
+        :param label: The label of the population sending the spikes
+        :type label: str
+        :param part: the index of the core of the population, or None if\
+                    the population is on one core
+        :type part: int
+        :rtype: (str, int)
+        """
+        if part is None:
+            return self._send_address_details[label]
+        return self._send_parts[label][1][part]
+
+    def _get_cached_spike_packets(self, label, neuron_ids, send_full_keys):
+        """ Get the packets of spikes from the cache, building and caching\
+            them if they are not there
+
+        :return: the index of the core and the bytes of each packet
+        :rtype: list of (int, str)
+        """
+        if isinstance(neuron_ids, frozenset):
+            cache_key = (label, send_full_keys, neuron_ids)
+        else:
+            neuron_ids = _as_neuron_id_array(neuron_ids)
+            cache_key = (label, send_full_keys, neuron_ids.tobytes())
+        packets = self._packet_cache.get(cache_key)
+        if packets is None:
+            packets = self._build_spike_packets(
+                label, neuron_ids, send_full_keys)
+            self._packet_cache.put(cache_key, packets)
+        return packets
+
+    def _send_packet(self, data, address, enqueue_time=None):
+        """ Send the bytes of a packet
+
+        :param data: the packet
+        :type data: str
+        :param address: the ip address and port to send to
+        :type address: (str, int)
+        :param enqueue_time: the clock() time when the spikes in the packet\
+                    were sent by the caller, if statistics are being collected
+        :type enqueue_time: float
+        """
+        self._sender_connection.send_to(data, address)
+        if enqueue_time is not None:
+            self._statistics.record_latency("send", enqueue_time)
+
+    def _build_spike_packets(self, label, neuron_ids, send_full_keys):
+        """ Serialise spikes into EIEIO packets.  If the population is on\
+            more than one core, the spikes of each core are put in separate\
+            packets, with the neuron ids of 16-bit packets relative to the\
+            first neuron of the core.
+
+        :param label: The label of the population sending the spikes
+        :type label: str
+        :param neuron_ids: array-like or set of neuron ids sending spikes
+        :param send_full_keys: True to send 32-bit keys, False to send\
+                    16-bit neuron ids
+        :type send_full_keys: bool
+        :return: the index of the core, or None if the population is on one\
+                    core, and the bytes of each packet
+        :rtype: list of (int, str)
         """
-        self.send_events(label, neuron_ids, send_full_keys)
+        neuron_ids = _as_neuron_id_array(neuron_ids)
+        if send_full_keys:
+            keys = self._get_spike_keys(label, neuron_ids)
+        else:
+            keys = neuron_ids
+        if label not in self._send_parts:
+            return [
+                (None, data)
+                for data in build_spike_packets(keys, send_full_keys)]
+
+        lo_atoms, _ = self._send_parts[label]
+        neuron_parts = numpy.searchsorted(
+            lo_atoms, neuron_ids, side="right") - 1
+        packets = list()
+        for part in numpy.unique(neuron_parts):
+            part_keys = keys[neuron_parts == part]
+            if not send_full_keys:
+                part_keys = part_keys - lo_atoms[part]
+            packets.extend(
+                (int(part), data)
+                for data in build_spike_packets(part_keys, send_full_keys))
+        return packets
@@ -0,0 +1,124 @@
+import logging
+import time
+from threading import Condition, Thread
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+# A clock which never goes backwards where available
+_clock = getattr(time, "monotonic", time.time)
+
+
+class TimestepSpikeBuffer(Thread):
+    """ Collects the spikes sent during each simulation timestep and sends\
+        them together at the end of the timestep, so that they go in as few\
+        packets as possible
+    """
+
+    def __init__(self, send_callback):
+        """
+
+        :param send_callback: Function called at the end of each timestep\
+                    with the label, the neuron ids, whether to send full\
+                    keys and the earliest time that any of the spikes was\
+                    added, for each group of spikes collected
+        :type send_callback: (str, numpy.ndarray, bool, float) -> int
+        """
+        Thread.__init__(self, name="TimestepSpikeBuffer")
+        self.daemon = True
+        self._send_callback = send_callback
+        self._condition = Condition()
+        self._pending = dict()
+        self._timestep = None
+        self._running = True
+        self._n_packets_sent = 0
+
+    def set_timestep(self, machine_time_step, time_scale_factor):
+        """ Set the real time between flushes from the simulation timing
+
+        :param machine_time_step: the simulation timestep in microseconds
+        :type machine_time_step: int
+        :param time_scale_factor: the factor by which the simulation is\
+                    slowed down from real time
+        :type time_scale_factor: int
+        """
+        with self._condition:
+            self._timestep = (
+                machine_time_step * time_scale_factor) / 1000000.0
+            self._condition.notify_all()
+
+    @property
+    def n_packets_sent(self):
+        """ The number of packets sent by all flushes so far
+        """
+        return self._n_packets_sent
+
+    def add_spikes(self, label, neuron_ids, send_full_keys,
+                   enqueue_time=None):
+        """ Add spikes to be sent at the end of the current timestep
+
+        :param label: The label of the population sending the spikes
+        :type label: str
+        :param neuron_ids: array-like of neuron ids sending spikes
+        :param send_full_keys: whether to send 32-bit keys
+        :type send_full_keys: bool
+        :param enqueue_time: the time that the spikes were sent by the\
+                    caller, passed on to the send callback
+        :type enqueue_time: float
+        """
+        neuron_ids = numpy.asarray(neuron_ids, dtype="uint32")
+        with self._condition:
+            key = (label, send_full_keys)
+            if key not in self._pending:
+                self._pending[key] = (list(), enqueue_time)
+            self._pending[key][0].append(neuron_ids)
+
+    def flush(self):
+        """ Send all the spikes collected so far
+
+        :return: the number of packets sent
+        :rtype: int
+        """
+        with self._condition:
+            pending = self._pending
+            self._pending = dict()
+        n_packets = 0
+        for (label, send_full_keys), (neuron_ids, enqueue_time) in \
+                pending.items():
+            try:
+                n_packets += self._send_callback(
+                    label, numpy.concatenate(neuron_ids), send_full_keys,
+                    enqueue_time)
+            except Exception:
+                logger.exception("Error sending spikes for {}".format(label))
+        self._n_packets_sent += n_packets
+        return n_packets
+
+    def run(self):
+        with self._condition:
+            while self._running and self._timestep is None:
+                self._condition.wait()
+
+        # Flush at each timestep boundary from when the simulation started
+        next_flush = _clock()
+        while self._running:
+            next_flush += self._timestep
+            delay = next_flush - _clock()
+            if delay > 0:
+                with self._condition:
+                    if self._running:
+                        self._condition.wait(delay)
+            elif delay < -self._timestep:
+                # Behind by more than a timestep, so catch up rather than
+                # flushing repeatedly
+                next_flush = _clock()
+            self.flush()
+
+    def close(self):
+        """ Send any remaining spikes and stop flushing
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self.flush()
@@ -0,0 +1,161 @@
+import collections
+import logging
+import struct
+import time
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+# A clock which never goes backwards where available
+_clock = getattr(time, "monotonic", time.time)
+
+
+class TokenBucketPacer(Thread):
+    """ Paces the sending of spike packets to no more spikes per timestep\
+        than an injector can turn into multicast packets.  Bursts beyond the\
+        bucket are queued and sent as tokens become available, and are only\
+        dropped if the queue is full.
+    """
+
+    def __init__(self, send_callback, spikes_per_timestep,
+                 max_queued_spikes=None):
+        """
+
+        :param send_callback: Function which sends the bytes of a packet to\
+                    an address, also given the enqueue time of the packet
+        :type send_callback: (str, (str, int), float) -> None
+        :param spikes_per_timestep: The number of spikes that can be\
+                    injected in each timestep; this is also the largest burst
+        :type spikes_per_timestep: int
+        :param max_queued_spikes: The largest number of spikes that can wait\
+                    to be sent before new packets are dropped, or None for\
+                    no limit
+        :type max_queued_spikes: int
+        """
+        Thread.__init__(self, name="TokenBucketPacer")
+        self.daemon = True
+        self._send_callback = send_callback
+        self._capacity = spikes_per_timestep
+        self._max_queued_spikes = max_queued_spikes
+        self._condition = Condition()
+        self._queue = collections.deque()
+        self._running = True
+
+        # Until the timestep is known, packets are not paced
+        self._rate = None
+        self._tokens = float(spikes_per_timestep)
+        self._last_refill = _clock()
+
+        self._n_spikes_queued = 0
+        self._n_spikes_delayed = 0
+        self._n_spikes_dropped = 0
+
+    def set_timestep(self, machine_time_step, time_scale_factor):
+        """ Set the rate at which tokens are added from the simulation timing
+
+        :param machine_time_step: the simulation timestep in microseconds
+        :type machine_time_step: int
+        :param time_scale_factor: the factor by which the simulation is\
+                    slowed down from real time
+        :type time_scale_factor: int
+        """
+        with self._condition:
+            self._refill()
+            self._rate = self._capacity / (
+                (machine_time_step * time_scale_factor) / 1000000.0)
+            self._condition.notify_all()
+
+    @property
+    def n_spikes_queued(self):
+        """ The number of spikes currently waiting to be sent
+        """
+        return self._n_spikes_queued
+
+    @property
+    def n_spikes_delayed(self):
+        """ The total number of spikes that had to wait to be sent
+        """
+        return self._n_spikes_delayed
+
+    @property
+    def n_spikes_dropped(self):
+        """ The total number of spikes dropped because the queue was full
+        """
+        return self._n_spikes_dropped
+
+    def _refill(self):
+        """ Add the tokens earned since the last refill
+        """
+        now = _clock()
+        if self._rate is not None:
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def send(self, data, address, enqueue_time=None):
+        """ Send a packet of spikes now if there are enough tokens and\
+            nothing is already waiting, otherwise queue it
+
+        :param data: the bytes of the EIEIO packet
+        :type data: str
+        :param address: the ip address and port to send to
+        :type address: (str, int)
+        :param enqueue_time: the time that the spikes were sent by the\
+                    caller, passed on to the send callback
+        :type enqueue_time: float
+        :return: False if the packet was dropped, True otherwise
+        :rtype: bool
+        """
+        (n_spikes, ) = struct.unpack_from("<B", data)
+        with self._condition:
+            self._refill()
+            if self._rate is None or (
+                    not self._queue and self._tokens >= n_spikes):
+                self._tokens -= n_spikes
+                send_now = True
+            elif (self._max_queued_spikes is not None and
+                    self._n_spikes_queued + n_spikes >
+                    self._max_queued_spikes):
+                self._n_spikes_dropped += n_spikes
+                return False
+            else:
+                self._queue.append((data, address, n_spikes, enqueue_time))
+                self._n_spikes_queued += n_spikes
+                self._n_spikes_delayed += n_spikes
+                self._condition.notify_all()
+                send_now = False
+        if send_now:
+            self._send_callback(data, address, enqueue_time)
+        return True
+
+    def run(self):
+        while self._running:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                self._refill()
+                data, address, n_spikes, enqueue_time = self._queue[0]
+
+                # A packet bigger than the bucket is sent once it is full
+                needed = min(n_spikes, self._capacity)
+                if self._tokens < needed:
+                    self._condition.wait(
+                        (needed - self._tokens) / self._rate)
+                    continue
+                self._queue.popleft()
+                self._tokens -= n_spikes
+                self._n_spikes_queued -= n_spikes
+            try:
+                self._send_callback(data, address, enqueue_time)
+            except Exception:
+                logger.exception("Error sending paced spikes")
+
+    def close(self):
+        """ Stop sending; any queued packets are discarded
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
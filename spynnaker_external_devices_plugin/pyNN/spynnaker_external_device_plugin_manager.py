@@ -1,10 +1,32 @@
+import collections
+import logging
+
+from pacman.model.constraints.placer_constraints.placer_board_constraint \
+    import PlacerBoardConstraint
 from pacman.model.graphs.application.impl.application_edge \
     import ApplicationEdge
 from spinnman.messages.eieio.eieio_type import EIEIOType
+from spynnaker.pyNN import exceptions
 from spynnaker.pyNN import get_spynnaker
 from spynnaker.pyNN.utilities import constants
 from spinn_front_end_common.utility_models.live_packet_gather \
     import LivePacketGather
+from spynnaker_external_devices_plugin.pyNN.utility_models.live_labels \
+    import LIVE_PACKET_GATHER_LABEL
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .live_output_application_edge import LiveOutputApplicationEdge
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .live_rate_aggregator import LiveRateAggregator
+
+logger = logging.getLogger(__name__)
+
+# The number of spikes that fit in a packet of each EIEIO message type
+_SPIKES_PER_PACKET = {
+    EIEIOType.KEY_16_BIT: 127,
+    EIEIOType.KEY_PAYLOAD_16_BIT: 63,
+    EIEIOType.KEY_32_BIT: 63,
+    EIEIOType.KEY_PAYLOAD_32_BIT: 31
+}
 
 
 class SpynnakerExternalDevicePluginManager(object):
@@ -12,19 +34,54 @@ class SpynnakerExternalDevicePluginManager(object):
     main entrance for the external device plugin manager
     """
 
+    # The simulator to which socket addresses have been added, and the
+    # socket addresses added to it, so that each is only added once to each
+    # simulator
+    _socket_address_simulator = None
+    _socket_addresses = set()
+
     def __init__(self):
         self._live_spike_recorders = dict()
 
+        # The number of vertices recorded by each live spike recorder, and
+        # the number of packets per timestep that they are expected to send
+        self._n_recorded_vertices = dict()
+        self._recorder_loads = dict()
+
+        # The recorder key, edge, expected packets per timestep and live
+        # output assignment of each vertex recorded, by the vertex and the
+        # port and host requested
+        self._recorder_edges = collections.OrderedDict()
+
+        # Every edge made from a vertex to a live spike recorder, active or
+        # not, as the graph cannot lose edges
+        self._edges_to_recorders = dict()
+
+        # The live rate aggregator of each vertex whose spikes are counted,
+        # with the port and host that it sends the counts to
+        self._rate_aggregators = dict()
+
     @staticmethod
     def add_socket_address(socket_address):
         """ Add a socket address to the list to be checked by the\
-            notification protocol
+            notification protocol, if it has not already been added to the\
+            current simulator
 
         :param socket_address: the socket address
         :type socket_address:
         :return:
         """
         _spinnaker = get_spynnaker()
+        manager = SpynnakerExternalDevicePluginManager
+        if manager._socket_address_simulator is not _spinnaker:
+            manager._socket_address_simulator = _spinnaker
+            manager._socket_addresses = set()
+        address_key = (
+            socket_address.notify_host_name, socket_address.notify_port_no,
+            socket_address.listen_port)
+        if address_key in manager._socket_addresses:
+            return
+        manager._socket_addresses.add(address_key)
         _spinnaker._add_socket_address(socket_address)
 
     def add_edge_to_recorder_vertex(
@@ -34,10 +91,36 @@ class SpynnakerExternalDevicePluginManager(object):
             prefix_type=None, message_type=EIEIOType.KEY_32_BIT,
             right_shift=0, payload_as_time_stamps=True,
             use_payload_prefix=True, payload_prefix=None,
-            payload_right_shift=0, number_of_packets_sent_per_time_step=0):
+            payload_right_shift=0, number_of_packets_sent_per_time_step=0,
+            per_board=False, expected_rate=None, neuron_ids=None,
+            constrain_to_board=False):
         """
         adds a edge from a vertex to the LPG object, builds as needed and has
-        all the parameters for the creation of the LPG if needed
+        all the parameters for the creation of the LPG if needed.  If\
+        per_board is True, there is an LPG on each board (i.e. each Ethernet\
+        connected chip) rather than one for the whole machine, and the vertex\
+        is recorded by the LPG of board_address, or else of the board that\
+        the vertex is constrained to.  If there is neither and\
+        constrain_to_board is True, the vertex is constrained to the board\
+        whose LPG records the fewest vertices, which needs the machine to be\
+        known and means that all of the vertex must fit on the board.  The\
+        LPGs all send to the same host and port, so the host receives one\
+        merged stream.
+
+        If number_of_packets_sent_per_time_step is not 0, the packets that\
+        the vertex will send each timestep are estimated from its size and\
+        expected_rate, and if the LPG would then send more than this, the\
+        vertex is recorded by another LPG on the next port, with any tag.
+
+        If neuron_ids is given, only the spikes of the cores that simulate\
+        those neurons are routed to the LPG.  Which cores these are is not\
+        known until the graph is partitioned, so the packets are still\
+        estimated from all the neurons of the vertex.
+
+        If the vertex is already recorded to the port and host, nothing is\
+        done.  If its recording was removed, it is recorded again by the\
+        same LPG over its old edge, even if this takes the LPG over\
+        number_of_packets_sent_per_time_step.
         :param vertex_to_record_from:
         :param port:
         :param hostname:
@@ -54,14 +137,61 @@ class SpynnakerExternalDevicePluginManager(object):
         :param payload_prefix:
         :param payload_right_shift:
         :param number_of_packets_sent_per_time_step:
+        :param per_board: True for an LPG on each board
+        :param expected_rate: The expected mean firing rate of the vertex\
+            in Hz, or None to assume that each neuron can fire every timestep
+        :param neuron_ids: The ids of the neurons to record, or None for all
+        :param constrain_to_board: True to constrain a vertex which is not\
+            constrained to a board to the board of the LPG recording it
         :return:
         """
 
+        # The cores are only known once the graph is partitioned, so the
+        # load is estimated from every neuron of the vertex, as every neuron
+        # of a core recording any neuron_ids is sent
         _spinnaker = get_spynnaker()
+        load = self._estimate_packets_per_timestep(
+            vertex_to_record_from.n_atoms, message_type, expected_rate)
+
+        # a vertex already recorded to the port and host is left as it is
+        edge_key = (vertex_to_record_from, port, hostname)
+        if (edge_key in self._recorder_edges and
+                self._recorder_edges[edge_key][1].active):
+            return
 
-        # locate the live spike recorder
-        if (port, hostname) in self._live_spike_recorders:
-            live_spike_recorder = self._live_spike_recorders[(port, hostname)]
+        # a vertex recorded before goes back to the same live spike recorder,
+        # as its deactivated edge to that recorder stays in the graph and the
+        # database, where the host would find the port of either recorder
+        if edge_key in self._recorder_edges:
+            recorder_key = self._recorder_edges[edge_key][0]
+            port = recorder_key[0]
+            if per_board:
+                board_address = recorder_key[2]
+        else:
+
+            # locate the live spike recorder, moving to the next port while
+            # the recorder on a port has no room for the packets of the
+            # vertex, or a live rate aggregator sends to the port
+            if per_board:
+                board_address = self._board_for_vertex(
+                    vertex_to_record_from, port, hostname, board_address,
+                    constrain_to_board)
+            rate_ports = set(
+                (rate_port, rate_hostname) for _, rate_port, rate_hostname
+                in self._rate_aggregators.values())
+            recorder_key = self._recorder_key(
+                port, hostname, board_address, per_board)
+            while ((port, hostname) in rate_ports or (
+                    number_of_packets_sent_per_time_step and
+                    self._recorder_loads.get(recorder_key, 0) > 0 and
+                    self._recorder_loads[recorder_key] + load >
+                    number_of_packets_sent_per_time_step)):
+                port += 1
+                tag = None
+                recorder_key = self._recorder_key(
+                    port, hostname, board_address, per_board)
+        if recorder_key in self._live_spike_recorders:
+            live_spike_recorder = self._live_spike_recorders[recorder_key]
         else:
 
             live_spike_recorder = LivePacketGather(
@@ -69,14 +199,222 @@ class SpynnakerExternalDevicePluginManager(object):
                 key_prefix, prefix_type, message_type, right_shift,
                 payload_as_time_stamps, use_payload_prefix, payload_prefix,
                 payload_right_shift, number_of_packets_sent_per_time_step,
-                label="LiveSpikeReceiver")
-            self._live_spike_recorders[(port, hostname)] = live_spike_recorder
+                label=LIVE_PACKET_GATHER_LABEL)
+            if per_board:
+                live_spike_recorder.add_constraint(
+                    PlacerBoardConstraint(board_address))
+            self._live_spike_recorders[recorder_key] = live_spike_recorder
             _spinnaker.add_application_vertex(live_spike_recorder)
+        self._n_recorded_vertices[recorder_key] = \
+            self._n_recorded_vertices.get(recorder_key, 0) + 1
+        self._recorder_loads[recorder_key] = \
+            self._recorder_loads.get(recorder_key, 0) + load
+        if (number_of_packets_sent_per_time_step and
+                self._recorder_loads[recorder_key] >
+                number_of_packets_sent_per_time_step):
+            logger.warning(
+                "{} is expected to send {:.1f} packets per timestep, more"
+                " than the {} that a LivePacketGather can send".format(
+                    vertex_to_record_from.label, load,
+                    number_of_packets_sent_per_time_step))
+        logger.info(
+            "Live output of {} goes to {}:{}{} ({:.1f} packets per"
+            " timestep expected)".format(
+                vertex_to_record_from.label, hostname, port,
+                "" if board_address is None else
+                " from board {}".format(board_address), load))
+
+        # create the edge and add, unless there is already an edge from a
+        # previous recording of the vertex by the recorder
+        edge = self._edges_to_recorders.get(
+            (vertex_to_record_from, recorder_key))
+        if edge is not None:
+            edge.activate(neuron_ids)
+        else:
+            edge = LiveOutputApplicationEdge(
+                vertex_to_record_from, live_spike_recorder, neuron_ids,
+                label="recorder_edge")
+            _spinnaker.add_application_edge(
+                edge, constants.SPIKE_PARTITION_ID)
+            self._edges_to_recorders[
+                vertex_to_record_from, recorder_key] = edge
+        self._recorder_edges[edge_key] = (
+            recorder_key, edge, load,
+            (vertex_to_record_from.label, hostname, port, board_address,
+             load))
+
+    def remove_edge_to_recorder_vertex(
+            self, vertex_to_record_from, port, hostname):
+        """ Stop recording a vertex to a port and host, from the next run,\
+            which maps the graph again.  The graph cannot lose edges or\
+            vertices, so the edge to the LPG is deactivated, which filters\
+            out its machine edges.  An LPG left recording no vertices is not\
+            retired: it keeps its core and IP tag, sends nothing, and is\
+            used again by the next vertex recorded to it.
+
+        :param vertex_to_record_from: the vertex recorded
+        :param port: the port that the vertex was recorded to
+        :param hostname: the host that the vertex was recorded to
+        :return: True if the vertex was recorded, False if not
+        :rtype: bool
+        """
+        edge_key = (vertex_to_record_from, port, hostname)
+        if edge_key not in self._recorder_edges:
+            return False
+        recorder_key, edge, load, _ = self._recorder_edges[edge_key]
+        if not edge.active:
+            return False
+        edge.deactivate()
+        self._n_recorded_vertices[recorder_key] -= 1
+        self._recorder_loads[recorder_key] -= load
+        if not self._n_recorded_vertices[recorder_key]:
+            self._recorder_loads[recorder_key] = 0
+            logger.info(
+                "The LivePacketGather sending to {}:{} no longer records any"
+                " vertex".format(recorder_key[1], recorder_key[0]))
+        return True
+
+    def add_edge_to_rate_aggregator(
+            self, vertex_to_record_from, port, hostname,
+            timesteps_per_window, block_size=1, tag=None,
+            board_address=None):
+        """ Count the spikes of blocks of neurons of a vertex on the machine\
+            and send the counts to a host at the end of each window of\
+            timesteps, rather than sending every spike.  Each vertex has a\
+            LiveRateAggregator of its own, which sends on the next port if\
+            another aggregator or an LPG already sends to the port and host.\
+            If the vertex already has an aggregator, nothing is done.
+
+        :param vertex_to_record_from: the vertex whose spikes are counted
+        :param port: the port to send the counts to
+        :param hostname: the host to send the counts to
+        :param timesteps_per_window: the number of timesteps over which the\
+            spikes are counted
+        :param block_size: the number of consecutive neurons whose spikes\
+            are counted together
+        :param tag: the IP tag to use, or None for any tag
+        :param board_address: the board to place the aggregator on, or None\
+            for any board
+        :return: the port that the counts are sent to
+        :rtype: int
+        :raise SpynnakerException: if the vertex already has an aggregator\
+            with another window or block size
+        """
+        if vertex_to_record_from in self._rate_aggregators:
+            aggregator, port, _ = self._rate_aggregators[
+                vertex_to_record_from]
+            if (aggregator.timesteps_per_window != timesteps_per_window or
+                    aggregator.block_size != block_size):
+                raise exceptions.SpynnakerException(
+                    "The spikes of {} are already counted over {} timesteps"
+                    " in blocks of {} neurons".format(
+                        vertex_to_record_from.label,
+                        aggregator.timesteps_per_window,
+                        aggregator.block_size))
+            return port
+
+        # Each aggregator has a port of its own, so that the host knows
+        # which population the counts of each packet are from
+        used_ports = set(
+            recorder_key[:2] for recorder_key in self._live_spike_recorders)
+        used_ports.update(
+            (used_port, used_hostname) for _, used_port, used_hostname in
+            self._rate_aggregators.values())
+        while (port, hostname) in used_ports:
+            port += 1
+            tag = None
+
+        _spinnaker = get_spynnaker()
+        aggregator = LiveRateAggregator(
+            hostname, port, vertex_to_record_from.n_atoms,
+            timesteps_per_window, block_size, board_address, tag)
+        _spinnaker.add_application_vertex(aggregator)
+        _spinnaker.add_application_edge(
+            ApplicationEdge(vertex_to_record_from, aggregator),
+            constants.SPIKE_PARTITION_ID)
+        self._rate_aggregators[vertex_to_record_from] = (
+            aggregator, port, hostname)
+        logger.info(
+            "Spike counts of {} over {} timesteps go to {}:{}".format(
+                vertex_to_record_from.label, timesteps_per_window, hostname,
+                port))
+        return port
+
+    @staticmethod
+    def _recorder_key(port, hostname, board_address, per_board):
+        if per_board:
+            return (port, hostname, board_address)
+        return (port, hostname)
+
+    def _estimate_packets_per_timestep(
+            self, n_neurons, message_type, expected_rate):
+        """ Estimate the packets that the spikes of some neurons will fill\
+            each timestep
+
+        :param n_neurons: the number of neurons recorded
+        :param message_type: the EIEIO type of the packets
+        :param expected_rate: the mean firing rate in Hz, or None if each\
+            neuron can fire every timestep
+        :rtype: float
+        """
+        spikes = float(n_neurons)
+        if expected_rate is not None:
+            spikes *= expected_rate * self.machine_time_step() / 1000000.0
+        return spikes / _SPIKES_PER_PACKET[message_type]
+
+    def get_live_output_assignments(self):
+        """ Get where the live output of each recorded vertex goes
+
+        :return: the label of each vertex, the host and port that its\
+            spikes are sent to, the board whose LPG sends them (None if any)\
+            and the packets per timestep that it is expected to send
+        :rtype: list of (str, str, int, str, float)
+        """
+        return [
+            assignment
+            for _, edge, _, assignment in self._recorder_edges.values()
+            if edge.active]
+
+    def _board_for_vertex(self, vertex, port, hostname, board_address,
+                          constrain_to_board):
+        """ Get the board whose LPG will record a vertex, constraining the\
+            vertex to the board if it is not already and this is allowed
+
+        :param vertex: the vertex to record from
+        :param port: the port that the LPGs send to
+        :param hostname: the host that the LPGs send to
+        :param board_address: the board requested, or None for any board
+        :param constrain_to_board: True to allow the vertex to be constrained
+        :return: the ip address of the board
+        :rtype: str
+        """
+        if board_address is not None:
+            return board_address
+        for constraint in vertex.constraints:
+            if isinstance(constraint, PlacerBoardConstraint):
+                return constraint.board_address
+
+        if not constrain_to_board:
+            raise exceptions.SpynnakerException(
+                "The board whose LivePacketGather records {} is not known, as"
+                " placement has not happened yet; give a board_address, or"
+                " set constrain_to_board to place {} on a board".format(
+                    vertex.label, vertex.label))
 
-        # create the edge and add
-        edge = ApplicationEdge(
-            vertex_to_record_from, live_spike_recorder, label="recorder_edge")
-        _spinnaker.add_application_edge(edge, constants.SPIKE_PARTITION_ID)
+        # Spread the vertices over the boards, placing each on its board so
+        # that it is near its LPG
+        machine = get_spynnaker().machine
+        if machine is None:
+            raise exceptions.SpynnakerException(
+                "The machine is not known yet, so {} cannot be constrained to"
+                " a board; give a board_address instead".format(vertex.label))
+        board_addresses = [
+            chip.ip_address for chip in machine.ethernet_connected_chips]
+        board_address = min(
+            board_addresses, key=lambda address: self._n_recorded_vertices.get(
+                (port, hostname, address), 0))
+        vertex.add_constraint(PlacerBoardConstraint(board_address))
+        return board_address
 
     def add_edge(self, vertex, device_vertex, partition_id):
         """
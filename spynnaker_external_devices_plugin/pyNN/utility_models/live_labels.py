@@ -0,0 +1,14 @@
+""" The labels by which the live connections find the vertices of the\
+    utility models in the notification database.  This module imports\
+    nothing, so that the connections can use it without the tool chain.
+"""
+
+# The label of the LivePacketGather that sends the live spikes
+LIVE_PACKET_GATHER_LABEL = "LiveSpikeReceiver"
+
+# The label of each LiveRateAggregator that sends spike counts
+LIVE_RATE_AGGREGATOR_LABEL = "LiveRateAggregator"
+
+# The label of the machine vertex of each core of a PartitionedSpikeInjector,
+# from the label of the population and the index of the core
+PARTITIONED_SPIKE_INJECTOR_PART_LABEL = "{} part {}"
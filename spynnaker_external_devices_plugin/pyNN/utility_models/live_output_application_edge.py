@@ -0,0 +1,80 @@
+from pacman.model.decorators.overrides import overrides
+from pacman.model.graphs.application.impl.application_edge \
+    import ApplicationEdge
+from spinn_front_end_common.abstract_models.abstract_changable_after_run \
+    import AbstractChangableAfterRun
+
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .live_output_machine_edge import LiveOutputMachineEdge
+
+
+class LiveOutputApplicationEdge(ApplicationEdge, AbstractChangableAfterRun):
+    """ An edge to a LivePacketGather which only carries the spikes of the\
+        cores that simulate some selected neurons of the pre vertex, or none\
+        at all once it has been deactivated.  Activating or deactivating the\
+        edge between runs makes the graph be mapped again.
+    """
+
+    def __init__(self, pre_vertex, post_vertex, neuron_ids=None, label=None):
+        """
+
+        :param pre_vertex: the vertex to record from
+        :param post_vertex: the LivePacketGather
+        :param neuron_ids: the ids of the neurons to record, or None for all
+        :type neuron_ids: iterable of int
+        :param label: the label of the edge
+        """
+        ApplicationEdge.__init__(
+            self, pre_vertex, post_vertex, label=label)
+        self._neuron_ids = None
+        self._active = True
+        self._change_requires_mapping = True
+        self.activate(neuron_ids)
+
+    @property
+    def neuron_ids(self):
+        """ The ids of the neurons recorded, in order, or None for all
+        """
+        return self._neuron_ids
+
+    @property
+    def active(self):
+        """ True if the spikes of the pre vertex are sent over the edge
+        """
+        return self._active
+
+    def activate(self, neuron_ids=None):
+        """ Send the spikes of some neurons over the edge, from the next time\
+            that the graph is mapped
+
+        :param neuron_ids: the ids of the neurons to record, or None for all
+        :type neuron_ids: iterable of int
+        """
+        if neuron_ids is not None:
+            neuron_ids = sorted(set(int(i) for i in neuron_ids))
+        if not self._active or neuron_ids != self._neuron_ids:
+            self._change_requires_mapping = True
+        self._active = True
+        self._neuron_ids = neuron_ids
+
+    def deactivate(self):
+        """ Stop sending spikes over the edge, from the next time that the\
+            graph is mapped
+        """
+        if self._active:
+            self._change_requires_mapping = True
+        self._active = False
+
+    @property
+    @overrides(AbstractChangableAfterRun.requires_mapping)
+    def requires_mapping(self):
+        return self._change_requires_mapping
+
+    @overrides(AbstractChangableAfterRun.mark_no_changes)
+    def mark_no_changes(self):
+        self._change_requires_mapping = False
+
+    @overrides(ApplicationEdge.create_machine_edge)
+    def create_machine_edge(self, pre_vertex, post_vertex, label):
+        return LiveOutputMachineEdge(
+            pre_vertex, post_vertex, self, label=label)
@@ -0,0 +1,41 @@
+import bisect
+
+from pacman.model.decorators.overrides import overrides
+from pacman.model.graphs.machine.impl.machine_edge import MachineEdge
+
+from spynnaker.pyNN.models.abstract_models.abstract_filterable_edge \
+    import AbstractFilterableEdge
+
+
+class LiveOutputMachineEdge(MachineEdge, AbstractFilterableEdge):
+    """ An edge to a LivePacketGather from one core of a vertex, which is\
+        filtered out of the graph if the application edge has been\
+        deactivated or the core simulates none of the neurons recorded, so\
+        that the spikes of the core are not routed to the LivePacketGather
+    """
+
+    def __init__(self, pre_vertex, post_vertex, application_edge,
+                 label=None):
+        """
+
+        :param pre_vertex: the machine vertex to record from
+        :param post_vertex: the LivePacketGather machine vertex
+        :param application_edge: the edge that this edge is part of, which\
+                    says which neurons are recorded
+        :type application_edge: LiveOutputApplicationEdge
+        :param label: the label of the edge
+        """
+        MachineEdge.__init__(self, pre_vertex, post_vertex, label=label)
+        self._application_edge = application_edge
+
+    @overrides(AbstractFilterableEdge.filter_edge)
+    def filter_edge(self, graph_mapper):
+        if not self._application_edge.active:
+            return True
+        neuron_ids = self._application_edge.neuron_ids
+        if neuron_ids is None:
+            return False
+        vertex_slice = graph_mapper.get_slice(self.pre_vertex)
+        index = bisect.bisect_left(neuron_ids, vertex_slice.lo_atom)
+        return (index == len(neuron_ids) or
+                neuron_ids[index] > vertex_slice.hi_atom)
@@ -0,0 +1,207 @@
+# spynnaker imports
+from spynnaker.pyNN import exceptions
+
+# pacman imports
+from pacman.model.constraints.placer_constraints.placer_board_constraint \
+    import PlacerBoardConstraint
+from pacman.model.constraints.tag_allocator_constraints\
+    .tag_allocator_require_iptag_constraint \
+    import TagAllocatorRequireIptagConstraint
+from pacman.model.graphs.machine.impl.simple_machine_vertex \
+    import SimpleMachineVertex
+from pacman.model.graphs.application.impl.application_vertex \
+    import ApplicationVertex
+from pacman.model.decorators.overrides import overrides
+from pacman.model.resources.resource_container import ResourceContainer
+from pacman.model.resources.sdram_resource import SDRAMResource
+from pacman.model.resources.dtcm_resource import DTCMResource
+from pacman.model.resources.cpu_cycles_per_tick_resource \
+    import CPUCyclesPerTickResource
+
+# front end common imports
+from spinn_front_end_common.utilities import constants
+from spinn_front_end_common.abstract_models.impl\
+    .application_data_specable_vertex import ApplicationDataSpecableVertex
+from spinn_front_end_common.abstract_models\
+    .abstract_has_associated_binary import AbstractHasAssociatedBinary
+from spinn_front_end_common.abstract_models\
+    .abstract_binary_uses_simulation_run import AbstractBinaryUsesSimulationRun
+from spinn_front_end_common.interface.simulation import simulation_utilities
+
+from spynnaker_external_devices_plugin.pyNN.utility_models.live_labels \
+    import LIVE_RATE_AGGREGATOR_LABEL
+
+
+class LiveRateAggregator(
+        ApplicationDataSpecableVertex, AbstractHasAssociatedBinary,
+        ApplicationVertex, AbstractBinaryUsesSimulationRun):
+    """ Counts the spikes of blocks of neurons of a population over windows\
+        of timesteps on the machine, and sends the count of each block to a\
+        host through an IP tag at the end of each window, rather than\
+        sending every spike.  A LiveRateConnection turns the counts into\
+        rates.
+    """
+
+    SYSTEM_REGION = 0
+    PARAMS_REGION = 1
+
+    # The most blocks and cores of the population that can be counted,
+    # which must match the C code
+    MAX_BLOCKS = 4096
+    MAX_SOURCES = 1024
+
+    # The parameters, then the key, mask and first neuron of each core
+    PARAMS_SIZE = (5 + (3 * MAX_SOURCES)) * 4
+
+    # The most that the 16-bit fields of the packets of counts can hold
+    _MAX_FIELD = 0xFFFF
+
+    def __init__(
+            self, hostname, port, n_neurons, timesteps_per_window,
+            block_size=1, board_address=None, tag=None,
+            label=LIVE_RATE_AGGREGATOR_LABEL):
+        """
+
+        :param hostname: the host that the counts are sent to
+        :type hostname: str
+        :param port: the port that the counts are sent to
+        :type port: int
+        :param n_neurons: the number of neurons of the population counted
+        :type n_neurons: int
+        :param timesteps_per_window: the number of timesteps over which the\
+                    spikes are counted
+        :type timesteps_per_window: int
+        :param block_size: the number of consecutive neurons whose spikes\
+                    are counted together
+        :type block_size: int
+        :param board_address: the board to place the aggregator on, or None\
+                    for any board
+        :type board_address: str
+        :param tag: the IP tag to use, or None for any tag
+        :type tag: int
+        :param label: the label of the aggregator
+        :type label: str
+        :raise SpynnakerException: if the window or block size is out of\
+                    range, or there would be too many blocks
+        """
+        if not 0 < timesteps_per_window <= self._MAX_FIELD:
+            raise exceptions.SpynnakerException(
+                "The timesteps per rate window must be between 1 and"
+                " {}".format(self._MAX_FIELD))
+        if not 0 < block_size <= self._MAX_FIELD:
+            raise exceptions.SpynnakerException(
+                "The rate block size must be between 1 and {}".format(
+                    self._MAX_FIELD))
+        self._n_blocks = -(-n_neurons // block_size)
+        if self._n_blocks > self.MAX_BLOCKS:
+            raise exceptions.SpynnakerException(
+                "The spikes of {} neurons in blocks of {} cannot be counted,"
+                " as there can be no more than {} blocks".format(
+                    n_neurons, block_size, self.MAX_BLOCKS))
+
+        ApplicationVertex.__init__(self, label)
+        self._timesteps_per_window = timesteps_per_window
+        self._block_size = block_size
+        self.add_constraint(TagAllocatorRequireIptagConstraint(
+            hostname, port, True, board_address, tag))
+        if board_address is not None:
+            self.add_constraint(PlacerBoardConstraint(board_address))
+
+    @property
+    def timesteps_per_window(self):
+        """ The number of timesteps over which the spikes are counted
+        """
+        return self._timesteps_per_window
+
+    @property
+    def block_size(self):
+        """ The number of consecutive neurons counted together
+        """
+        return self._block_size
+
+    @property
+    @overrides(ApplicationVertex.n_atoms)
+    def n_atoms(self):
+        return 1
+
+    @overrides(ApplicationVertex.create_machine_vertex)
+    def create_machine_vertex(self, vertex_slice, resources_required,
+                              label=None, constraints=None):
+        return SimpleMachineVertex(
+            resources_required, label, constraints)
+
+    @overrides(ApplicationVertex.get_resources_used_by_atoms)
+    def get_resources_used_by_atoms(self, vertex_slice):
+        return ResourceContainer(
+            sdram=SDRAMResource(
+                constants.SYSTEM_BYTES_REQUIREMENT + self.PARAMS_SIZE),
+            dtcm=DTCMResource(0), cpu_cycles=CPUCyclesPerTickResource(0))
+
+    @overrides(ApplicationDataSpecableVertex.
+               generate_application_data_specification)
+    def generate_application_data_specification(
+            self, spec, placement, graph_mapper, application_graph,
+            machine_graph, routing_info, iptags, reverse_iptags,
+            machine_time_step, time_scale_factor):
+
+        # reserve regions
+        self.reserve_memory_regions(spec)
+
+        # Write the setup region
+        spec.comment("\n*** Spec for live rate aggregator ***\n\n")
+
+        # handle simulation data
+        spec.switch_write_focus(self.SYSTEM_REGION)
+        spec.write_array(simulation_utilities.get_simulation_header_array(
+            self.get_binary_file_name(), machine_time_step,
+            time_scale_factor))
+
+        # Get the key, mask and first neuron of each core of the population,
+        # sorted by key so that the core of each spike can be searched for
+        sources = list()
+        for edge in machine_graph.get_edges_ending_at_vertex(
+                placement.vertex):
+            edge_routing_info = routing_info.get_routing_info_for_edge(edge)
+            vertex_slice = graph_mapper.get_slice(edge.pre_vertex)
+            sources.append((
+                edge_routing_info.first_key, edge_routing_info.first_mask,
+                vertex_slice.lo_atom))
+        sources.sort()
+        if len(sources) > self.MAX_SOURCES:
+            raise exceptions.SpynnakerException(
+                "{} counts the spikes of {} cores, but can only count those"
+                " of {}".format(self.label, len(sources), self.MAX_SOURCES))
+
+        # write params to memory
+        spec.switch_write_focus(region=self.PARAMS_REGION)
+        spec.write_value(data=iptags[0].tag)
+        spec.write_value(data=self._timesteps_per_window)
+        spec.write_value(data=self._block_size)
+        spec.write_value(data=self._n_blocks)
+        spec.write_value(data=len(sources))
+        for key, mask, lo_atom in sources:
+            spec.write_value(data=key)
+            spec.write_value(data=mask)
+            spec.write_value(data=lo_atom)
+
+        # End-of-Spec:
+        spec.end_specification()
+
+    @overrides(AbstractHasAssociatedBinary.get_binary_file_name)
+    def get_binary_file_name(self):
+        return "live_rate_aggregator.aplx"
+
+    def reserve_memory_regions(self, spec):
+        """ Reserve SDRAM space for the system region and the parameters
+        """
+        spec.comment("\nReserving memory space for data regions:\n\n")
+
+        # Reserve memory:
+        spec.reserve_memory_region(
+            region=self.SYSTEM_REGION,
+            size=constants.SYSTEM_BYTES_REQUIREMENT,
+            label='setup')
+
+        spec.reserve_memory_region(region=self.PARAMS_REGION,
+                                   size=self.PARAMS_SIZE,
+                                   label='params')
@@ -0,0 +1,122 @@
+from pacman.model.constraints.partitioner_constraints\
+    .partitioner_maximum_size_constraint \
+    import PartitionerMaximumSizeConstraint
+from pacman.model.constraints.placer_constraints.placer_board_constraint \
+    import PlacerBoardConstraint
+from pacman.model.decorators.overrides import overrides
+from pacman.model.resources.resource_container import ResourceContainer
+from pacman.model.resources.reverse_iptag_resource \
+    import ReverseIPtagResource
+from spinn_front_end_common.utility_models.reverse_ip_tag_multi_cast_source\
+    import ReverseIpTagMultiCastSource
+from spinn_front_end_common.utility_models\
+    .reverse_ip_tag_multicast_source_machine_vertex \
+    import ReverseIPTagMulticastSourceMachineVertex
+
+from spynnaker_external_devices_plugin.pyNN.utility_models.live_labels \
+    import PARTITIONED_SPIKE_INJECTOR_PART_LABEL
+from spynnaker_external_devices_plugin.pyNN.utility_models.spike_injector \
+    import SpikeInjector
+
+
+class PartitionedSpikeInjector(SpikeInjector):
+    """ An Injector of Spikes for PyNN populations which is split over\
+        several cores, each with its own reverse IP tag and port, so that\
+        spikes can be injected faster than one core can send them.  The\
+        neurons are split evenly over the cores in order, and the cores can\
+        be placed on different boards.
+    """
+
+    # The label of the machine vertex of each core, by which a
+    # SpynnakerLiveSpikesConnection finds the address of each core
+    PART_LABEL = PARTITIONED_SPIKE_INJECTOR_PART_LABEL
+
+    def __init__(self, n_neurons, label, n_parts, port,
+                 board_addresses=None):
+        """
+
+        :param n_neurons: the number of neurons the spike injector will\
+                    emulate
+        :type n_neurons: int
+        :param label: the label given to the population
+        :type label: str
+        :param n_parts: the number of cores to split the neurons over
+        :type n_parts: int
+        :param port: the port of the first core; each core listens on the\
+                    next port
+        :type port: int
+        :param board_addresses: the boards to place the cores on in turn,\
+                    or None to place them anywhere
+        :type board_addresses: list of str
+        :raise ValueError: if the neurons cannot be split evenly over the\
+                    cores, i.e. if some cores would have no neurons
+        """
+        self._neurons_per_part = -(-n_neurons // n_parts)
+        if -(-n_neurons // self._neurons_per_part) != n_parts:
+            raise ValueError(
+                "{} neurons cannot be split evenly over {} cores".format(
+                    n_neurons, n_parts))
+        self._ports = [port + part for part in range(n_parts)]
+        self._board_addresses = board_addresses
+        SpikeInjector.__init__(self, n_neurons, label, port)
+        self.add_constraint(
+            PartitionerMaximumSizeConstraint(self._neurons_per_part))
+
+    @property
+    def ports(self):
+        """ The port of each core, in the order of their neurons
+        """
+        return list(self._ports)
+
+    def _get_part(self, vertex_slice):
+        """ Get the index of the core of a slice.  As each slice must start\
+            at the first neuron of a core and have no more neurons than a\
+            core, each core is given to one slice, and so each port is used\
+            by one machine vertex.
+
+        :raise ValueError: if the slice is not the slice of one core
+        """
+        part, offset = divmod(vertex_slice.lo_atom, self._neurons_per_part)
+        if offset != 0 or vertex_slice.n_atoms > self._neurons_per_part:
+            raise ValueError(
+                "The atoms {} to {} of {} are not the atoms of one of its"
+                " cores".format(
+                    vertex_slice.lo_atom, vertex_slice.hi_atom, self.label))
+        return part
+
+    @overrides(ReverseIpTagMultiCastSource.get_resources_used_by_atoms)
+    def get_resources_used_by_atoms(self, vertex_slice):
+
+        # The resources of a core are those of any core of a SpikeInjector,
+        # but with the reverse IP tag on the port of the core
+        part = self._get_part(vertex_slice)
+        resources = SpikeInjector.get_resources_used_by_atoms(
+            self, vertex_slice)
+        return ResourceContainer(
+            dtcm=resources.dtcm, sdram=resources.sdram,
+            cpu_cycles=resources.cpu_cycles, iptags=resources.iptags,
+            reverse_iptags=[
+                ReverseIPtagResource(
+                    self._ports[part], reverse_iptag.sdp_port,
+                    reverse_iptag.tag)
+                for reverse_iptag in resources.reverse_iptags])
+
+    @overrides(ReverseIpTagMultiCastSource.create_machine_vertex)
+    def create_machine_vertex(
+            self, vertex_slice, resources_required, label=None,
+            constraints=None):
+
+        # The machine vertex is made as a SpikeInjector makes it, but with
+        # the port and board of the core
+        part = self._get_part(vertex_slice)
+        board_address = None
+        if self._board_addresses:
+            board_address = self._board_addresses[
+                part % len(self._board_addresses)]
+            constraints = list(constraints or []) + [
+                PlacerBoardConstraint(board_address)]
+        return ReverseIPTagMulticastSourceMachineVertex(
+            n_keys=vertex_slice.n_atoms,
+            label=self.PART_LABEL.format(self.label, part),
+            constraints=constraints, board_address=board_address,
+            receive_port=self._ports[part], reserve_reverse_ip_tag=True)
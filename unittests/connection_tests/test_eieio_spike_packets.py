@@ -0,0 +1,77 @@
+import struct
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections.eieio_spike_packets \
+    import build_spike_packets, decode_spike_packet
+
+
+class TestEIEIOSpikePackets(unittest.TestCase):
+
+    def test_full_keys_are_packed_63_per_packet(self):
+        keys = numpy.arange(130, dtype="uint32") | 0x70000
+        packets = build_spike_packets(keys, send_full_keys=True)
+        self.assertEqual(len(packets), 3)
+        self.assertEqual([len(packet) for packet in packets],
+                         [2 + 63 * 4, 2 + 63 * 4, 2 + 4 * 4])
+        count, flags = struct.unpack_from("<BB", packets[2])
+        self.assertEqual(count, 4)
+        self.assertEqual(flags, 2 << 2)
+        self.assertEqual(
+            list(numpy.frombuffer(packets[2], dtype="<u4", offset=2)),
+            list(keys[126:]))
+
+    def test_half_keys_are_packed_127_per_packet(self):
+        packets = build_spike_packets(range(127), send_full_keys=False)
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(len(packets[0]), 256)
+        count, flags = struct.unpack_from("<BB", packets[0])
+        self.assertEqual(count, 127)
+        self.assertEqual(flags, 0)
+
+    def test_neuron_id_too_big_for_half_keys_is_rejected(self):
+        with self.assertRaises(Exception):
+            build_spike_packets([5, 70000], send_full_keys=False)
+
+    def test_no_spikes_sends_no_packets(self):
+        self.assertEqual(build_spike_packets([], send_full_keys=True), [])
+
+    def test_decode_timestamped_full_keys(self):
+        keys = numpy.array([0x10003, 0x10063], dtype="<u4")
+        data = struct.pack("<BBI", 2, 0x20 | 0x10 | (2 << 2), 7) + \
+            keys.tobytes()
+        decoded_keys, times = decode_spike_packet(data)
+        self.assertEqual(list(decoded_keys), list(keys))
+        self.assertEqual(list(times), [7, 7])
+
+    def test_decode_half_keys_with_upper_prefix(self):
+        data = struct.pack("<BBHHHH", 2, 0x80 | 0x40 | 0x20 | 0x10, 0x7,
+                           12, 1, 2)
+        decoded_keys, times = decode_spike_packet(data)
+        self.assertEqual(list(decoded_keys), [0x70001, 0x70002])
+        self.assertEqual(list(times), [12, 12])
+
+    def test_decode_half_keys_with_timestamp_payloads(self):
+        data = struct.pack("<BBHHHHH", 2, 0x80 | 0x10 | (1 << 2), 0x7000,
+                           1, 12, 2, 13)
+        decoded_keys, times = decode_spike_packet(data)
+        self.assertEqual(list(decoded_keys), [0x7001, 0x7002])
+        self.assertEqual(list(times), [12, 13])
+
+    def test_decode_full_keys_with_payload_prefix_and_shifts(self):
+        data = struct.pack("<BBIIIII", 2, 0x20 | 0x10 | (3 << 2), 0x100,
+                           0x801, 2, 0x802, 3)
+        decoded_keys, times = decode_spike_packet(
+            data, right_shift=1, payload_right_shift=2)
+        self.assertEqual(list(decoded_keys), [0x1002, 0x1004])
+        self.assertEqual(list(times), [0x408, 0x40C])
+
+    def test_decode_without_timestamp_fails(self):
+        data = struct.pack("<BBI", 1, 2 << 2, 5)
+        with self.assertRaises(Exception):
+            decode_spike_packet(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import socket
+import struct
+import time
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_rate_connection import LiveRateConnection
+from spynnaker_external_devices_plugin.pyNN.connections.live_rate_receiver \
+    import decode_rate_packet
+
+
+def _free_port():
+    udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_socket.bind(("127.0.0.1", 0))
+    port = udp_socket.getsockname()[1]
+    udp_socket.close()
+    return port
+
+
+def _packet(window_start, first_block, counts, block_size=2,
+            timesteps_per_window=10):
+    return struct.pack(
+        "<IHHHH{}I".format(len(counts)), window_start, first_block,
+        len(counts), block_size, timesteps_per_window, *counts)
+
+
+class _DatabaseReader(object):
+    """ A database reader of population "pop" of 5 neurons, whose counts\
+        are sent to a port
+    """
+
+    def __init__(self, port):
+        self._port = port
+
+    def get_configuration_parameter_value(self, name):
+        return {"machine_time_step": 1000}[name]
+
+    def get_live_output_details(self, label, receiver_label):
+        assert receiver_label == "LiveRateAggregator"
+        return "127.0.0.1", self._port, True
+
+    def get_key_to_neuron_id_mapping(self, label):
+        return dict((0x10000 | neuron_id, neuron_id)
+                    for neuron_id in range(5))
+
+
+class TestDecodeRatePacket(unittest.TestCase):
+
+    def test_header_and_counts_are_decoded(self):
+        window_start, first_block, block_size, timesteps, counts = \
+            decode_rate_packet(_packet(100, 65, [1, 2, 3]))
+        self.assertEqual(
+            (window_start, first_block, block_size, timesteps),
+            (100, 65, 2, 10))
+        self.assertEqual(list(counts), [1, 2, 3])
+
+    def test_short_packet_is_refused(self):
+        with self.assertRaises(ValueError):
+            decode_rate_packet(_packet(100, 0, [1, 2, 3])[:-1])
+
+
+class TestLiveRateConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.port = _free_port()
+        self.connection = LiveRateConnection(["pop"])
+        self.addCleanup(self.connection.close)
+        self.closed = list()
+        self.connection.add_rate_callback(
+            "pop", lambda label, window_start, rates: self.closed.append(
+                (label, window_start, list(rates))))
+        self.connection._read_rate_database_callback(
+            _DatabaseReader(self.port))
+
+    def _receive(self, window_start, first_block, counts):
+        self.connection._receive_counts(
+            self.port, window_start, first_block, 2, 10,
+            numpy.array(counts, dtype="uint32"))
+
+    def test_window_is_closed_once_all_its_blocks_are_received(self):
+
+        # 3 spikes from 2 neurons, then 1 from 1 neuron, over 10ms
+        self._receive(0, 0, [3, 0])
+        self.assertEqual(self.closed, [])
+        self._receive(0, 2, [1])
+        self.assertEqual(self.closed, [("pop", 0, [150.0, 0.0, 100.0])])
+
+    def test_lost_counts_are_not_a_number(self):
+        self._receive(0, 0, [3, 0])
+        self._receive(10, 0, [1, 1, 1])
+        self.assertEqual(len(self.closed), 2)
+        self.assertEqual(self.closed[0][2][:2], [150.0, 0.0])
+        self.assertTrue(numpy.isnan(self.closed[0][2][2]))
+        self.assertEqual(self.connection.n_incomplete_windows, 1)
+
+        # Counts of a closed window are ignored
+        self._receive(0, 2, [1])
+        window_starts, rates = self.connection.rate_matrix("pop")
+        self.assertEqual(list(window_starts), [0, 10])
+        self.assertEqual(rates.shape, (2, 3))
+
+    def test_counts_are_received_from_the_port(self):
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(sender.close)
+        sender.sendto(_packet(0, 0, [2, 4, 1]), ("127.0.0.1", self.port))
+        for _ in range(100):
+            if self.closed:
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.closed, [("pop", 0, [100.0, 200.0, 100.0])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_file_sink import LiveSpikeFileSink, read_live_spike_file
+
+
+class TestLiveSpikeFileSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_spikes_are_read_back_per_label(self):
+        sink = LiveSpikeFileSink(self.directory)
+        sink("pop_1", numpy.array([1, 1]), numpy.array([5, 7]))
+        sink("pop_2", numpy.array([2]), numpy.array([3]))
+        sink("pop_1", numpy.array([4]), numpy.array([0]))
+
+        # The file is readable before the sink is closed
+        spikes = read_live_spike_file(sink.path("pop_1"))
+        self.assertEqual(list(spikes["timestep"]), [1, 1, 4])
+        self.assertEqual(list(spikes["neuron_id"]), [5, 7, 0])
+        sink.close()
+
+        spikes = read_live_spike_file(sink.path("pop_2"))
+        self.assertEqual(list(spikes["timestep"]), [2])
+        self.assertEqual(list(spikes["neuron_id"]), [3])
+        self.assertEqual(os.path.getsize(sink.path("pop_2")), 16 + 8)
+
+    def test_file_grows(self):
+        sink = LiveSpikeFileSink(self.directory)
+        n_spikes = 200000
+        for start in range(0, n_spikes, 50000):
+            sink("pop", numpy.arange(start, start + 50000),
+                 numpy.arange(50000))
+        sink.close()
+        spikes = read_live_spike_file(sink.path("pop"))
+        self.assertEqual(len(spikes), n_spikes)
+        self.assertEqual(spikes["timestep"][-1], n_spikes - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
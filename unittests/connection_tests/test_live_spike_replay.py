@@ -0,0 +1,63 @@
+import time
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_file_sink import SPIKE_RECORD_DTYPE
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_replay import LiveSpikeReplay
+
+
+class _Connection(object):
+
+    real_time_per_timestep = 0.01
+
+    def __init__(self):
+        self.start_callbacks = list()
+        self.sent = list()
+
+    def add_start_callback(self, label, start_callback):
+        self.start_callbacks.append((label, start_callback))
+
+    def send_spikes(self, label, neuron_ids, send_full_keys=False):
+        self.sent.append((time.time(), label, neuron_ids.tolist()))
+
+
+def _records(timesteps, neuron_ids):
+    records = numpy.zeros(len(timesteps), dtype=SPIKE_RECORD_DTYPE)
+    records["timestep"] = timesteps
+    records["neuron_id"] = neuron_ids
+    return records
+
+
+class TestLiveSpikeReplay(unittest.TestCase):
+
+    def _replay(self, speed):
+        connection = _Connection()
+        replay = LiveSpikeReplay(
+            _records([5, 0, 5, 10, 0], [1, 2, 3, 4, 5]), connection,
+            "injector", speed=speed)
+        label, start_callback = connection.start_callbacks[0]
+        start_time = time.time()
+        start_callback(label, connection)
+        self.assertTrue(replay.wait(1))
+        return replay, connection.sent, start_time
+
+    def test_spikes_are_batched_by_timestep(self):
+        replay, sent, _ = self._replay(None)
+        self.assertEqual(replay.n_timesteps, 3)
+        self.assertEqual(replay.n_spikes_sent, 5)
+        self.assertEqual(
+            [(label, neuron_ids) for _, label, neuron_ids in sent],
+            [("injector", [2, 5]), ("injector", [1, 3]), ("injector", [4])])
+
+    def test_replay_is_paced_by_speed(self):
+        _, sent, start_time = self._replay(1.0)
+        self.assertGreaterEqual(sent[-1][0] - start_time, 0.09)
+        _, sent, start_time = self._replay(4.0)
+        self.assertLess(sent[-1][0] - start_time, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .live_spike_statistics import LatencyHistogram, LiveSpikeStatistics
+
+
+class TestLiveSpikeStatistics(unittest.TestCase):
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for latency_us in range(1, 1001):
+            histogram.record(latency_us / 1000000.0)
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.max_us, 1000)
+        self.assertAlmostEqual(histogram.mean_us, 500.5)
+
+        # Buckets are within 1/16 of the value
+        self.assertLessEqual(abs(histogram.percentile_us(50) - 500), 500 / 16)
+        self.assertLessEqual(abs(histogram.percentile_us(99) - 990), 990 / 16)
+        self.assertEqual(histogram.percentile_us(100), 1000)
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for latency_us in (3, 3, 7, 31):
+            histogram.record(latency_us / 1000000.0)
+        self.assertEqual(histogram.percentile_us(50), 3)
+        self.assertEqual(histogram.percentile_us(75), 7)
+
+    def test_stats_counts_labels(self):
+        statistics = LiveSpikeStatistics()
+        statistics.count_received("pop", 5)
+        statistics.count_received("pop", 2)
+        statistics.count_sent("injector", 2, 100)
+        statistics.record_latency("callback", 1.0, 1.002)
+        stats = statistics.stats()
+        self.assertEqual(stats["received_batches"], {"pop": 2})
+        self.assertEqual(stats["received_spikes"], {"pop": 7})
+        self.assertEqual(stats["sent_packets"], {"injector": 2})
+        self.assertEqual(stats["sent_spikes"], {"injector": 100})
+        self.assertEqual(stats["latency"]["callback"]["count"], 1)
+        self.assertEqual(stats["latency"]["decode"]["count"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
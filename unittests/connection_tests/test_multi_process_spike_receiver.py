@@ -0,0 +1,70 @@
+import socket
+import struct
+import threading
+import time
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .multi_process_spike_receiver import MultiProcessSpikeReceiver
+
+
+def _free_port():
+    udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_socket.bind(("127.0.0.1", 0))
+    port = udp_socket.getsockname()[1]
+    udp_socket.close()
+    return port
+
+
+def _packet(time_stamp, keys):
+    """ A packet of 32-bit keys with a time stamp payload prefix
+    """
+    return struct.pack(
+        "<BBI{}I".format(len(keys)), len(keys), 0x20 | 0x10 | (2 << 2),
+        time_stamp, *keys)
+
+
+@unittest.skipUnless(
+    hasattr(socket, "SO_REUSEPORT"), "SO_REUSEPORT is not available")
+class TestMultiProcessSpikeReceiver(unittest.TestCase):
+
+    def setUp(self):
+        self.spikes = list()
+        self.lock = threading.Lock()
+
+    def _receive(self, keys, times):
+        with self.lock:
+            self.spikes.extend(zip(times.tolist(), keys.tolist()))
+
+    def _wait_for(self, n_spikes):
+        for _ in range(100):
+            with self.lock:
+                if len(self.spikes) >= n_spikes:
+                    return
+            time.sleep(0.05)
+
+    def test_packets_from_two_sources_are_merged(self):
+        receiver = MultiProcessSpikeReceiver(self._receive, 2)
+        self.addCleanup(receiver.close)
+        port = _free_port()
+        receiver.add_port(port)
+
+        # Give the processes time to bind to the port
+        time.sleep(0.5)
+        sources = [
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for _ in range(2)]
+        for source_id, source in enumerate(sources):
+            keys = [source_id << 16, source_id << 16 | 1]
+            for time_stamp in range(5):
+                source.sendto(_packet(time_stamp, keys), ("127.0.0.1", port))
+            source.close()
+        self._wait_for(20)
+        self.assertEqual(sorted(self.spikes), sorted(
+            (time_stamp, source_id << 16 | neuron_id)
+            for source_id in range(2) for time_stamp in range(5)
+            for neuron_id in range(2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
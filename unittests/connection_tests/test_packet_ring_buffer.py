@@ -0,0 +1,34 @@
+import socket
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections.packet_ring_buffer \
+    import PacketRingBuffer
+
+
+class TestPacketRingBuffer(unittest.TestCase):
+
+    def test_receive_into_reuses_released_slots(self):
+        sender, receiver = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM)
+        ring_buffer = PacketRingBuffer(2, 16)
+        try:
+            sender.send(b"abc")
+            sender.send(b"de")
+            first_slot, first = ring_buffer.receive_into(receiver)
+            second_slot, second = ring_buffer.receive_into(receiver)
+            self.assertNotEqual(first_slot, second_slot)
+            self.assertEqual(first.tobytes(), b"abc")
+            self.assertEqual(second.tobytes(), b"de")
+
+            ring_buffer.release(first_slot)
+            sender.send(b"f")
+            slot, data = ring_buffer.receive_into(receiver)
+            self.assertEqual(slot, first_slot)
+            self.assertEqual(data.tobytes(), b"f")
+        finally:
+            sender.close()
+            receiver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
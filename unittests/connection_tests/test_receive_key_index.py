@@ -0,0 +1,40 @@
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections.receive_key_index \
+    import ReceiveKeyIndex
+
+
+class TestReceiveKeyIndex(unittest.TestCase):
+
+    def test_lookup_over_split_and_scattered_populations(self):
+        # The first population is split over two cores
+        split = dict()
+        for neuron_id in range(10):
+            split[0x10000 + neuron_id] = neuron_id
+        for neuron_id in range(10, 15):
+            split[0x20000 + neuron_id - 10] = neuron_id
+        scattered = {0x5: 0, 0x9: 1, 0x7: 2}
+        index = ReceiveKeyIndex([split, scattered])
+        self.assertEqual(index.n_runs, 5)
+
+        keys = numpy.array(
+            [0x10003, 0x9, 0x20004, 0x1000A, 0x4, 0x7, 0x20000],
+            dtype="uint32")
+        found, population_ids, neuron_ids = index.lookup(keys)
+        self.assertEqual(
+            list(found), [True, True, True, False, False, True, True])
+        self.assertEqual(list(population_ids), [0, 1, 0, 1, 0])
+        self.assertEqual(list(neuron_ids), [3, 1, 14, 2, 10])
+
+    def test_empty_index_finds_nothing(self):
+        index = ReceiveKeyIndex([dict()])
+        found, _, neuron_ids = index.lookup(
+            numpy.array([1, 2], dtype="uint32"))
+        self.assertFalse(found.any())
+        self.assertEqual(len(neuron_ids), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spike_dispatch_queue import SpikeDispatchQueue
+
+
+def _spikes(*neuron_ids, **kwargs):
+    times = numpy.zeros(len(neuron_ids), dtype="uint32")
+    times += kwargs.get("time", 0)
+    return times, numpy.array(neuron_ids, dtype="uint32")
+
+
+class TestSpikeDispatchQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.delivered = list()
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def _deliver(self, label, times, neuron_ids, receive_time):
+        self.started.set()
+        self.release.wait()
+        self.delivered.append((label, neuron_ids.tolist()))
+
+    def _fill(self, policy):
+        """ Block the worker on one batch and fill a queue of two behind it
+        """
+        queue = SpikeDispatchQueue(self._deliver, 2, overflow_policy=policy)
+        queue.put("a", *_spikes(0))
+        self.started.wait()
+        queue.put("a", *_spikes(1))
+        queue.put("b", *_spikes(2))
+        return queue
+
+    def _drain(self, queue):
+        self.release.set()
+        for _ in range(100):
+            if queue.counters()["queued"] == len(self.delivered) + \
+                    queue.counters()["dropped_oldest"]:
+                break
+            time.sleep(0.01)
+        queue.close()
+
+    def test_drop_newest(self):
+        queue = self._fill(SpikeDispatchQueue.DROP_NEWEST)
+        queue.put("a", *_spikes(3))
+        self._drain(queue)
+        self.assertEqual(self.delivered, [("a", [0]), ("a", [1]), ("b", [2])])
+        self.assertEqual(queue.counters()["dropped_newest"], 1)
+
+    def test_drop_oldest(self):
+        queue = self._fill(SpikeDispatchQueue.DROP_OLDEST)
+        queue.put("a", *_spikes(3))
+        self._drain(queue)
+        self.assertEqual(self.delivered, [("a", [0]), ("b", [2]), ("a", [3])])
+        self.assertEqual(queue.counters()["dropped_oldest"], 1)
+
+    def test_coalesce(self):
+        queue = self._fill(SpikeDispatchQueue.COALESCE)
+        queue.put("a", *_spikes(3))
+        self._drain(queue)
+        self.assertEqual(
+            self.delivered, [("a", [0]), ("a", [1, 3]), ("b", [2])])
+        self.assertEqual(queue.counters()["coalesced"], 1)
+
+    def test_coalesce_other_timestep_drops_oldest(self):
+        queue = self._fill(SpikeDispatchQueue.COALESCE)
+        queue.put("a", *_spikes(3, time=1))
+        self._drain(queue)
+        self.assertEqual(self.delivered, [("a", [0]), ("b", [2]), ("a", [3])])
+        self.assertEqual(queue.counters()["coalesced"], 0)
+        self.assertEqual(queue.counters()["dropped_oldest"], 1)
+
+    def test_block(self):
+        queue = self._fill(SpikeDispatchQueue.BLOCK)
+        threading.Timer(0.05, self.release.set).start()
+        queue.put("a", *_spikes(3))
+        self._drain(queue)
+        self.assertEqual(len(self.delivered), 4)
+        self.assertEqual(queue.counters()["blocked"], 1)
+
+    def test_unbounded_keeps_order(self):
+        self.release.set()
+        queue = SpikeDispatchQueue(self._deliver, None)
+        for neuron_id in range(100):
+            queue.put("a", *_spikes(neuron_id))
+        queue.close()
+        queue._workers[0].join(1)
+        self.assertEqual(
+            [neuron_ids[0] for _, neuron_ids in self.delivered],
+            list(range(100)))
+        self.assertEqual(queue.counters()["blocked"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spike_packet_cache import SpikePacketCache
+
+
+class TestSpikePacketCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = SpikePacketCache(2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", [b"a"])
+        self.assertEqual(cache.get("a"), [b"a"])
+        self.assertEqual((cache.n_hits, cache.n_misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SpikePacketCache(2)
+        cache.put("a", [b"a"])
+        cache.put("b", [b"b"])
+        cache.get("a")
+        cache.put("c", [b"c"])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [b"a"])
+        self.assertEqual(cache.get("c"), [b"c"])
+
+    def test_clear(self):
+        cache = SpikePacketCache(2)
+        cache.put(frozenset([1, 2]), [b"a"])
+        cache.clear()
+        self.assertIsNone(cache.get(frozenset([1, 2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
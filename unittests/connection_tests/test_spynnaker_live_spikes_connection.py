@@ -0,0 +1,214 @@
+import sqlite3
+import struct
+import unittest
+
+import numpy
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .spynnaker_live_spikes_connection import SpynnakerLiveSpikesConnection, \
+    _key_mapping_signature
+
+
+class _DatabaseReader(object):
+    """ A database reader of an input population of 10 neurons on cores of\
+        4 neurons, labelled as by a PartitionedSpikeInjector, and of output\
+        populations "a" of 10 neurons and "b" of 5 neurons
+    """
+
+    def __init__(self, n_parts):
+        self._n_parts = n_parts
+        connection = sqlite3.connect(":memory:")
+        self._cursor = connection.cursor()
+        self._cursor.execute(
+            "CREATE TABLE Machine_vertices("
+            "vertex_id INTEGER PRIMARY KEY, label TEXT)")
+        self._cursor.executemany(
+            "INSERT INTO Machine_vertices(label) VALUES (?)",
+            [("input part {}".format(part),) for part in range(n_parts)] +
+            [("output",), ("input part",)])
+
+    def get_neuron_id_to_key_mapping(self, label):
+        return dict((neuron_id, 0x10000 | neuron_id)
+                    for neuron_id in range(10))
+
+    def get_key_to_neuron_id_mapping(self, label):
+        base_key = {"a": 0x10000, "b": 0x20000}[label]
+        n_neurons = {"a": 10, "b": 5}[label]
+        return dict((base_key | neuron_id, neuron_id)
+                    for neuron_id in range(n_neurons))
+
+    def get_machine_live_input_details(self, machine_label):
+        label, _, part = machine_label.rpartition(" part ")
+        if label != "input" or int(part) >= self._n_parts:
+            # The reader fails to unpack the row that is not found, so it
+            # must not be asked for a machine vertex that is not there
+            raise TypeError("'NoneType' object is not subscriptable")
+        return "192.168.{}.1".format(part), 12345 + int(part)
+
+
+class TestSpynnakerLiveSpikesConnection(unittest.TestCase):
+
+    def _connection(self, n_parts):
+        connection = SpynnakerLiveSpikesConnection(send_labels=["input"])
+        connection._send_address_details["input"] = ("192.168.0.1", 12345)
+        database_reader = _DatabaseReader(n_parts)
+        connection._read_send_keys(database_reader)
+        connection._read_send_parts(database_reader)
+        return connection
+
+    def test_split_over_cores(self):
+        connection = self._connection(3)
+        lo_atoms, addresses = connection._send_parts["input"]
+        self.assertEqual(list(lo_atoms), [0, 4, 8])
+        self.assertEqual(addresses, [
+            ("192.168.0.1", 12345), ("192.168.1.1", 12346),
+            ("192.168.2.1", 12347)])
+
+    def test_cores_are_not_found_without_a_cursor(self):
+        connection = SpynnakerLiveSpikesConnection(send_labels=["input"])
+        connection._send_address_details["input"] = ("192.168.0.1", 12345)
+        database_reader = _DatabaseReader(3)
+        connection._read_send_keys(database_reader)
+        database_reader._cursor = None
+        connection._read_send_parts(database_reader)
+        self.assertNotIn("input", connection._send_parts)
+
+    def test_one_core_is_not_split(self):
+        connection = self._connection(1)
+        self.assertNotIn("input", connection._send_parts)
+        packets = connection._build_spike_packets("input", [1, 9], True)
+        self.assertEqual([part for part, _ in packets], [None])
+        self.assertEqual(
+            connection._send_address("input", None), ("192.168.0.1", 12345))
+
+    def test_full_keys_are_sent_to_the_core_of_each_neuron(self):
+        connection = self._connection(3)
+        packets = connection._build_spike_packets(
+            "input", [9, 1, 4, 3], True)
+        self.assertEqual([part for part, _ in packets], [0, 1, 2])
+        self.assertEqual(
+            [list(numpy.frombuffer(data, dtype="<u4", offset=2))
+             for _, data in packets],
+            [[0x10001, 0x10003], [0x10004], [0x10009]])
+        self.assertEqual(
+            connection._send_address("input", 2), ("192.168.2.1", 12347))
+
+    def test_neuron_ids_are_relative_to_the_core(self):
+        connection = self._connection(3)
+        packets = connection._build_spike_packets("input", [5, 7, 8], False)
+        self.assertEqual([part for part, _ in packets], [1, 2])
+        self.assertEqual(
+            [list(struct.unpack_from(
+                "<{}H".format((len(data) - 2) // 2), data, 2))
+             for _, data in packets],
+            [[1, 3], [0]])
+
+    def _receive_connection(self, **kwargs):
+        connection = SpynnakerLiveSpikesConnection(
+            receive_labels=["a", "b"], **kwargs)
+        connection._read_receive_keys(_DatabaseReader(1))
+        self.received = list()
+        self.received_arrays = list()
+        for label in ("a", "b"):
+            connection.add_receive_callback(
+                label, lambda *args: self.received.append(args))
+            connection.add_receive_array_callback(
+                label, lambda label, times, neuron_ids:
+                self.received_arrays.append(
+                    (label, times.tolist(), neuron_ids.tolist())))
+        return connection
+
+    def _receive(self, connection, keys_and_times):
+        connection._receive_spikes(
+            numpy.array([key for key, _ in keys_and_times], dtype="uint32"),
+            numpy.array([time for _, time in keys_and_times], dtype="uint32"))
+
+    def test_received_spikes_are_grouped_by_label(self):
+        connection = self._receive_connection()
+        self._receive(connection, [
+            (0x20001, 3), (0x10002, 3), (0x20004, 4), (0x10007, 3)])
+        self.assertEqual(self.received_arrays, [
+            ("a", [3, 3], [2, 7]), ("b", [3, 4], [1, 4])])
+        self.assertEqual(connection._n_receive_neurons, {"a": 10, "b": 5})
+
+    def test_unknown_keys_are_ignored(self):
+        connection = self._receive_connection()
+        self._receive(connection, [
+            (0x30001, 3), (0x1000A, 3), (0x10002, 3), (0x20005, 3)])
+        self.assertEqual(self.received_arrays, [("a", [3], [2])])
+
+    def test_list_callbacks_are_called_per_timestep(self):
+        connection = self._receive_connection()
+        self._receive(connection, [
+            (0x10001, 5), (0x10002, 4), (0x10003, 5), (0x20000, 4)])
+        self.assertEqual(self.received, [
+            ("a", 4, [2]), ("a", 5, [1, 3]), ("b", 4, [0])])
+
+    def test_only_the_receive_neuron_ids_are_received(self):
+        connection = self._receive_connection(
+            receive_neuron_ids={"a": [7, 2], "b": []})
+        self._receive(connection, [
+            (0x10001, 3), (0x10002, 3), (0x20004, 3), (0x10007, 4)])
+        self.assertEqual(self.received_arrays, [("a", [3, 4], [2, 7])])
+
+    def test_no_spikes_are_received_before_the_keys_are_read(self):
+        connection = SpynnakerLiveSpikesConnection(receive_labels=["a"])
+        received = list()
+        connection.add_receive_array_callback(
+            "a", lambda *args: received.append(args))
+        self._receive(connection, [(0x10001, 3)])
+        self.assertEqual(received, [])
+
+
+class _KeyMappingReader(object):
+    """ A database reader of a key to neuron mapping table
+    """
+
+    def __init__(self, rows):
+        connection = sqlite3.connect(":memory:")
+        self._cursor = connection.cursor()
+        self._cursor.execute(
+            "CREATE TABLE key_to_neuron_mapping("
+            "vertex_id INTEGER, neuron_id INTEGER, key INTEGER)")
+        self._cursor.executemany(
+            "INSERT INTO key_to_neuron_mapping VALUES (?, ?, ?)", rows)
+
+
+def _key_rows(vertex_id, base_key, n_neurons):
+    return [(vertex_id, neuron_id, base_key | neuron_id)
+            for neuron_id in range(n_neurons)]
+
+
+class TestKeyMappingSignature(unittest.TestCase):
+
+    def test_same_mapping_has_the_same_signature(self):
+        rows = _key_rows(1, 0x10000, 4) + _key_rows(2, 0x20000, 4)
+        self.assertEqual(
+            _key_mapping_signature(_KeyMappingReader(rows)),
+            _key_mapping_signature(_KeyMappingReader(rows[::-1])))
+
+    def test_swapped_keys_change_the_signature(self):
+        self.assertNotEqual(
+            _key_mapping_signature(_KeyMappingReader(
+                _key_rows(1, 0x10000, 4) + _key_rows(2, 0x20000, 4))),
+            _key_mapping_signature(_KeyMappingReader(
+                _key_rows(1, 0x20000, 4) + _key_rows(2, 0x10000, 4))))
+
+    def test_one_changed_key_of_many_changes_the_signature(self):
+        rows = _key_rows(1, 0x70000000, 200000)
+        changed_rows = list(rows)
+        vertex_id, neuron_id, key = changed_rows[123456]
+        changed_rows[123456] = (vertex_id, neuron_id, key + 1)
+        self.assertNotEqual(
+            _key_mapping_signature(_KeyMappingReader(rows)),
+            _key_mapping_signature(_KeyMappingReader(changed_rows)))
+
+    def test_reader_without_a_cursor_has_no_signature(self):
+        self.assertIsNone(_key_mapping_signature(object()))
+
+    def test_reader_without_the_table_has_no_signature(self):
+        self.assertIsNone(_key_mapping_signature(_DatabaseReader(1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections\
+    .timestep_spike_buffer import TimestepSpikeBuffer
+
+
+class TestTimestepSpikeBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = list()
+
+    def _send(self, label, neuron_ids, send_full_keys, enqueue_time):
+        self.sent.append((label, list(neuron_ids), send_full_keys))
+        return 1
+
+    def test_flush_sends_each_label_once(self):
+        spike_buffer = TimestepSpikeBuffer(self._send)
+        spike_buffer.add_spikes("a", [1], False)
+        spike_buffer.add_spikes("a", [2, 3], False)
+        spike_buffer.add_spikes("b", [4], True)
+        self.assertEqual(spike_buffer.flush(), 2)
+        self.assertEqual(sorted(self.sent), [
+            ("a", [1, 2, 3], False), ("b", [4], True)])
+        self.assertEqual(spike_buffer.flush(), 0)
+        self.assertEqual(spike_buffer.n_packets_sent, 2)
+
+    def test_spikes_are_flushed_each_timestep(self):
+        spike_buffer = TimestepSpikeBuffer(self._send)
+        spike_buffer.set_timestep(1000, 10)
+        spike_buffer.start()
+        spike_buffer.add_spikes("a", [1], False)
+        time.sleep(0.1)
+        self.assertEqual(self.sent, [("a", [1], False)])
+        spike_buffer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
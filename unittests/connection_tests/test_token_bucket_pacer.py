@@ -0,0 +1,46 @@
+import struct
+import time
+import unittest
+
+from spynnaker_external_devices_plugin.pyNN.connections.token_bucket_pacer \
+    import TokenBucketPacer
+
+
+def _packet(n_spikes):
+    return struct.pack("<BB", n_spikes, 0) + b"\0\0" * n_spikes
+
+
+class TestTokenBucketPacer(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = list()
+
+    def _send(self, data, address, enqueue_time):
+        self.sent.append(len(data))
+
+    def test_burst_beyond_capacity_is_delayed_not_dropped(self):
+        pacer = TokenBucketPacer(self._send, 10)
+        pacer.set_timestep(1000, 10)
+        pacer.start()
+        for _ in range(3):
+            self.assertTrue(pacer.send(_packet(8), ("localhost", 1)))
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(pacer.n_spikes_delayed, 16)
+        time.sleep(0.1)
+        self.assertEqual(len(self.sent), 3)
+        self.assertEqual(pacer.n_spikes_queued, 0)
+        self.assertEqual(pacer.n_spikes_dropped, 0)
+        pacer.close()
+
+    def test_full_queue_drops(self):
+        pacer = TokenBucketPacer(self._send, 10, max_queued_spikes=8)
+        pacer.set_timestep(1000000, 1)
+        self.assertTrue(pacer.send(_packet(10), ("localhost", 1)))
+        self.assertTrue(pacer.send(_packet(8), ("localhost", 1)))
+        self.assertFalse(pacer.send(_packet(1), ("localhost", 1)))
+        self.assertEqual(pacer.n_spikes_queued, 8)
+        self.assertEqual(pacer.n_spikes_dropped, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+
+import numpy
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import spynnaker_external_devices_plugin.pyNN as external_devices
+from spynnaker_external_devices_plugin.pyNN import \
+    spynnaker_external_device_plugin_manager as plugin_manager_module
+from spynnaker_external_devices_plugin.pyNN.\
+    spynnaker_external_device_plugin_manager import \
+    SpynnakerExternalDevicePluginManager
+
+_PORT = 17895
+_HOST = "localhost"
+_DATABASE_PARAMETERS = dict(
+    database_notify_host="localhost", database_notify_port_num=19999,
+    database_ack_port_num=19998)
+
+
+class _Population(object):
+
+    def __init__(self, label, size):
+        self.size = size
+        self._vertex = mock.Mock(n_atoms=size, label=label, constraints=[])
+
+
+class _PopulationView(object):
+
+    def __init__(self, parent, mask):
+        self.parent = parent
+        self.mask = mask
+        self.size = len(numpy.arange(parent.size)[mask])
+
+
+class TestActivateLiveOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.spinnaker = mock.Mock(machine_time_step=1000)
+        self._patch(plugin_manager_module, "get_spynnaker",
+                    side_effect=lambda: self.spinnaker)
+        self.manager = SpynnakerExternalDevicePluginManager()
+        self._patch(external_devices, "_get_plugin_manager",
+                    return_value=self.manager)
+
+    def _patch(self, target, attribute, **kwargs):
+        patcher = mock.patch.object(target, attribute, **kwargs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _activate(self, populations, **kwargs):
+        external_devices.activate_live_output_for_populations(
+            populations, port=_PORT, host=_HOST, **dict(
+                _DATABASE_PARAMETERS, **kwargs))
+
+    def test_bulk_activation(self):
+        populations = [_Population(label, 10) for label in "abc"]
+        self._activate(populations)
+        self.assertEqual(
+            [label for label, _, _, _, _ in
+             self.manager.get_live_output_assignments()], ["a", "b", "c"])
+        self.assertEqual(self.spinnaker.add_application_edge.call_count, 3)
+        self.assertEqual(self.spinnaker._add_socket_address.call_count, 1)
+
+    def test_bulk_activation_of_an_assembly(self):
+        assembly = mock.Mock(
+            populations=[_Population(label, 10) for label in "ab"])
+        self._activate(assembly)
+        self.assertEqual(self.spinnaker.add_application_edge.call_count, 2)
+
+    def test_neuron_ids_must_be_given_for_each_population(self):
+        with self.assertRaises(Exception):
+            self._activate(
+                [_Population(label, 10) for label in "ab"],
+                neuron_ids=[[1, 2]])
+        self.assertEqual(self.spinnaker.add_application_edge.call_count, 0)
+
+    def test_socket_address_is_added_once_to_each_simulator(self):
+        self._activate([_Population("a", 10)])
+        self._activate([_Population("b", 10)])
+        self.assertEqual(self.spinnaker._add_socket_address.call_count, 1)
+
+        # After end() and setup(), the new simulator needs the address too
+        old_spinnaker = self.spinnaker
+        self.spinnaker = mock.Mock(machine_time_step=1000)
+        self._activate([_Population("c", 10)])
+        self.assertEqual(self.spinnaker._add_socket_address.call_count, 1)
+        self.assertEqual(old_spinnaker._add_socket_address.call_count, 1)
+
+    def test_add_socket_address_is_a_static_method(self):
+        socket_address = mock.Mock(
+            notify_host_name="localhost", notify_port_no=19999,
+            listen_port=None)
+        SpynnakerExternalDevicePluginManager.add_socket_address(
+            socket_address)
+        self.spinnaker._add_socket_address.assert_called_once_with(
+            socket_address)
+
+    def test_population_view_records_its_parent(self):
+        population = _Population("a", 10)
+        view = _PopulationView(population, slice(2, 8))
+        self._activate([view])
+        edge = self.spinnaker.add_application_edge.call_args[0][0]
+        self.assertIs(edge.pre_vertex, population._vertex)
+        self.assertEqual(edge.neuron_ids, [2, 3, 4, 5, 6, 7])
+
+    def test_neuron_ids_of_a_view_are_indices_into_the_view(self):
+        population = _Population("a", 10)
+        view = _PopulationView(population, numpy.array([1, 3, 5, 7, 9]))
+        vertex, neuron_ids = external_devices._recorded_vertex_and_neuron_ids(
+            view, [0, 4])
+        self.assertIs(vertex, population._vertex)
+        self.assertEqual(list(neuron_ids), [1, 9])
+
+    def test_view_of_a_view_maps_to_the_parent(self):
+        population = _Population("a", 10)
+        view = _PopulationView(
+            _PopulationView(population, slice(4, 10)), slice(1, 3))
+        vertex, neuron_ids = external_devices._recorded_vertex_and_neuron_ids(
+            view, None)
+        self.assertIs(vertex, population._vertex)
+        self.assertEqual(list(neuron_ids), [5, 6])
+
+    def test_rates_of_each_population_go_to_a_port_of_their_own(self):
+        self._activate([_Population("a", 10)])
+        self._activate(
+            [_Population(label, 10) for label in "bc"],
+            timesteps_per_rate_window=100, rate_block_size=5)
+        aggregators = [
+            call[0][0] for call in
+            self.spinnaker.add_application_vertex.call_args_list[1:]]
+        self.assertEqual(
+            [aggregator.constraints[0].port for aggregator in aggregators],
+            [_PORT + 1, _PORT + 2])
+        self.assertEqual(
+            [(aggregator.timesteps_per_window, aggregator.block_size)
+             for aggregator in aggregators], [(100, 5), (100, 5)])
+
+        # Live output does not use the ports of the rates
+        self.manager.add_edge_to_recorder_vertex(
+            _Population("d", 10)._vertex, _PORT + 1, _HOST)
+        self.assertEqual(
+            self.manager.get_live_output_assignments()[-1][2], _PORT + 3)
+
+    def test_rates_are_only_counted_once(self):
+        population = _Population("a", 10)
+        for _ in range(2):
+            self._activate([population], timesteps_per_rate_window=100)
+        self.assertEqual(self.spinnaker.add_application_vertex.call_count, 1)
+        with self.assertRaises(Exception):
+            self._activate([population], timesteps_per_rate_window=10)
+
+    def test_rates_of_a_view_are_refused(self):
+        with self.assertRaises(Exception):
+            self._activate(
+                [_Population("a", 10),
+                 _PopulationView(_Population("b", 10), slice(2, 8))],
+                timesteps_per_rate_window=100)
+        self.assertEqual(self.spinnaker.add_application_vertex.call_count, 0)
+
+    def test_population_is_recorded_whole(self):
+        population = _Population("a", 10)
+        vertex, neuron_ids = external_devices._recorded_vertex_and_neuron_ids(
+            population, None)
+        self.assertIs(vertex, population._vertex)
+        self.assertIsNone(neuron_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from pacman.model.graphs.common.slice import Slice
+
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .live_output_application_edge import LiveOutputApplicationEdge
+
+
+class TestLiveOutputMachineEdge(unittest.TestCase):
+
+    def _filtered(self, application_edge, lo_atom, hi_atom):
+        machine_vertex = mock.Mock()
+        machine_edge = application_edge.create_machine_edge(
+            machine_vertex, mock.Mock(), "recorder_edge")
+        graph_mapper = mock.Mock()
+        graph_mapper.get_slice.return_value = Slice(lo_atom, hi_atom)
+        filtered = machine_edge.filter_edge(graph_mapper)
+        graph_mapper.get_slice.assert_has_calls(
+            [] if application_edge.neuron_ids is None or
+            not application_edge.active else [mock.call(machine_vertex)])
+        return filtered
+
+    def test_all_neurons_are_kept(self):
+        edge = LiveOutputApplicationEdge(mock.Mock(), mock.Mock())
+        self.assertFalse(self._filtered(edge, 0, 99))
+        self.assertFalse(self._filtered(edge, 100, 199))
+
+    def test_only_cores_of_the_neuron_ids_are_kept(self):
+        edge = LiveOutputApplicationEdge(
+            mock.Mock(), mock.Mock(), neuron_ids=[250, 5, 99])
+        self.assertFalse(self._filtered(edge, 0, 99))
+        self.assertTrue(self._filtered(edge, 100, 199))
+        self.assertFalse(self._filtered(edge, 200, 299))
+        self.assertTrue(self._filtered(edge, 300, 399))
+
+    def test_deactivated_edge_is_filtered(self):
+        edge = LiveOutputApplicationEdge(mock.Mock(), mock.Mock())
+        edge.deactivate()
+        self.assertTrue(self._filtered(edge, 0, 99))
+        edge.activate([150])
+        self.assertTrue(self._filtered(edge, 0, 99))
+        self.assertFalse(self._filtered(edge, 100, 199))
+
+
+if __name__ == "__main__":
+    unittest.main()
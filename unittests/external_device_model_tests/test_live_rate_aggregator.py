@@ -0,0 +1,98 @@
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from spynnaker.pyNN import exceptions
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .live_rate_aggregator import LiveRateAggregator
+
+
+class _Spec(object):
+    """ A data specification which records the values written to each region
+    """
+
+    def __init__(self):
+        self.regions = dict()
+        self._region = None
+
+    def reserve_memory_region(self, region, size, label=None):
+        self.regions[region] = list()
+
+    def switch_write_focus(self, region):
+        self._region = region
+
+    def write_value(self, data):
+        self.regions[self._region].append(data)
+
+    def write_array(self, array_values):
+        self.regions[self._region].extend(array_values)
+
+    def comment(self, comment):
+        pass
+
+    def end_specification(self):
+        pass
+
+
+class TestLiveRateAggregator(unittest.TestCase):
+
+    def _generate(self, aggregator, sources):
+        """ Generate the parameters of an aggregator receiving spikes from\
+            cores with the given key, mask and first neuron
+        """
+        edges = [mock.Mock(pre_vertex=index) for index in range(len(sources))]
+        routing_info = mock.Mock()
+        routing_info.get_routing_info_for_edge.side_effect = \
+            lambda edge: mock.Mock(
+                first_key=sources[edge.pre_vertex][0],
+                first_mask=sources[edge.pre_vertex][1])
+        graph_mapper = mock.Mock()
+        graph_mapper.get_slice.side_effect = \
+            lambda vertex: mock.Mock(lo_atom=sources[vertex][2])
+        machine_graph = mock.Mock()
+        machine_graph.get_edges_ending_at_vertex.return_value = edges
+        spec = _Spec()
+        aggregator.generate_application_data_specification(
+            spec, mock.Mock(), graph_mapper, None, machine_graph,
+            routing_info, [mock.Mock(tag=3)], [], 1000, 1)
+        return spec.regions[LiveRateAggregator.PARAMS_REGION]
+
+    def test_sources_are_sorted_by_key(self):
+        aggregator = LiveRateAggregator("localhost", 17895, 600, 100, 10)
+        params = self._generate(aggregator, [
+            (0x20000, 0xFFFFFF00, 256), (0x10000, 0xFFFFFF00, 0),
+            (0x30000, 0xFFFFFF00, 512)])
+        self.assertEqual(params, [
+            3, 100, 10, 60, 3,
+            0x10000, 0xFFFFFF00, 0, 0x20000, 0xFFFFFF00, 256,
+            0x30000, 0xFFFFFF00, 512])
+
+    def test_counts_are_sent_through_an_iptag_which_strips_sdp(self):
+        aggregator = LiveRateAggregator(
+            "localhost", 17895, 10, 100, board_address="192.168.0.1", tag=2)
+        iptag, board = aggregator.constraints
+        self.assertEqual(
+            (iptag.ip_address, iptag.port, iptag.strip_sdp,
+             iptag.board_address, iptag.tag_id),
+            ("localhost", 17895, True, "192.168.0.1", 2))
+        self.assertEqual(board.board_address, "192.168.0.1")
+
+    def test_too_many_blocks_are_refused(self):
+        with self.assertRaises(exceptions.SpynnakerException):
+            LiveRateAggregator(
+                "localhost", 17895, LiveRateAggregator.MAX_BLOCKS + 1, 100)
+        LiveRateAggregator(
+            "localhost", 17895, LiveRateAggregator.MAX_BLOCKS * 2, 100, 2)
+
+    def test_window_must_fit_in_the_packet_header(self):
+        for timesteps_per_window in (0, 0x10000):
+            with self.assertRaises(exceptions.SpynnakerException):
+                LiveRateAggregator(
+                    "localhost", 17895, 10, timesteps_per_window)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from pacman.model.graphs.common.slice import Slice
+
+from spynnaker_external_devices_plugin.pyNN.utility_models\
+    .partitioned_spike_injector import PartitionedSpikeInjector
+
+
+class TestPartitionedSpikeInjector(unittest.TestCase):
+
+    def test_split_over_cores(self):
+        injector = PartitionedSpikeInjector(
+            10, "input", 3, 12345,
+            board_addresses=["192.168.0.1", "192.168.1.1"])
+        self.assertEqual(injector.ports, [12345, 12346, 12347])
+        self.assertEqual(injector.constraints[-1].size, 4)
+        machine_vertices = [
+            injector.create_machine_vertex(
+                Slice(lo_atom, min(lo_atom + 3, 9)),
+                injector.get_resources_used_by_atoms(
+                    Slice(lo_atom, min(lo_atom + 3, 9))))
+            for lo_atom in (0, 4, 8)]
+        self.assertEqual(
+            [vertex.label for vertex in machine_vertices],
+            ["input part 0", "input part 1", "input part 2"])
+        self.assertEqual(
+            [vertex.receive_port for vertex in machine_vertices],
+            [12345, 12346, 12347])
+        self.assertEqual(
+            [vertex.n_keys for vertex in machine_vertices], [4, 4, 2])
+        self.assertEqual(
+            [(vertex.board_address, vertex.constraints[-1].board_address)
+             for vertex in machine_vertices],
+            [("192.168.0.1", "192.168.0.1"), ("192.168.1.1", "192.168.1.1"),
+             ("192.168.0.1", "192.168.0.1")])
+
+    def test_the_port_of_a_core_is_only_used_for_that_core(self):
+        injector = PartitionedSpikeInjector(10, "input", 3, 12345)
+        resources = injector.get_resources_used_by_atoms(Slice(4, 7))
+        self.assertEqual(
+            [reverse_iptag.port for reverse_iptag in resources.reverse_iptags],
+            [12346])
+        self.assertEqual(
+            injector.get_resources_used_by_atoms(
+                Slice(0, 3)).reverse_iptags[0].port, 12345)
+
+    def test_part_label_is_shared_with_the_connection(self):
+        from spynnaker_external_devices_plugin.pyNN.connections\
+            .spynnaker_live_spikes_connection import \
+            PARTITIONED_SPIKE_INJECTOR_PART_LABEL
+        self.assertIs(
+            PartitionedSpikeInjector.PART_LABEL,
+            PARTITIONED_SPIKE_INJECTOR_PART_LABEL)
+
+    def test_slice_of_more_than_one_core_is_rejected(self):
+        injector = PartitionedSpikeInjector(10, "input", 3, 12345)
+        with self.assertRaises(ValueError):
+            injector.get_resources_used_by_atoms(Slice(0, 5))
+        with self.assertRaises(ValueError):
+            injector.create_machine_vertex(Slice(2, 5), None)
+
+    def test_cores_without_neurons_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PartitionedSpikeInjector(9, "input", 4, 12345)
+
+
+if __name__ == '__main__':
+    unittest.main()
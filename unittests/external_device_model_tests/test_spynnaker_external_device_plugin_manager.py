@@ -0,0 +1,138 @@
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from pacman.model.constraints.placer_constraints.placer_board_constraint \
+    import PlacerBoardConstraint
+
+from spynnaker_external_devices_plugin.pyNN import \
+    spynnaker_external_device_plugin_manager as plugin_manager_module
+from spynnaker_external_devices_plugin.pyNN.\
+    spynnaker_external_device_plugin_manager import \
+    SpynnakerExternalDevicePluginManager
+
+_PORT = 17895
+_HOST = "localhost"
+
+# 630 neurons firing every 1ms timestep fill 10 packets of 63 keys
+_N_NEURONS = 630
+_RATE = 1000.0
+_BUDGET = 15
+
+
+def _vertex(label):
+    return mock.Mock(n_atoms=_N_NEURONS, label=label, constraints=[])
+
+
+class TestSpynnakerExternalDevicePluginManager(unittest.TestCase):
+
+    def setUp(self):
+        self.spinnaker = mock.Mock(machine_time_step=1000)
+        patcher = mock.patch.object(
+            plugin_manager_module, "get_spynnaker",
+            return_value=self.spinnaker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = SpynnakerExternalDevicePluginManager()
+
+    def _record(self, vertex, **kwargs):
+        self.manager.add_edge_to_recorder_vertex(
+            vertex, _PORT, _HOST, expected_rate=_RATE,
+            number_of_packets_sent_per_time_step=_BUDGET, **kwargs)
+
+    def _ports(self):
+        return dict(
+            (label, port) for label, _, port, _, _ in
+            self.manager.get_live_output_assignments())
+
+    def _n_edges(self):
+        return self.spinnaker.add_application_edge.call_count
+
+    def test_split_over_ports_by_load(self):
+        for label in "abc":
+            self._record(_vertex(label))
+        self.assertEqual(
+            self._ports(), {"a": _PORT, "b": _PORT + 1, "c": _PORT + 2})
+        self.assertEqual(self.spinnaker.add_application_vertex.call_count, 3)
+
+    def test_load_of_some_neurons_is_that_of_the_whole_vertex(self):
+        # the cores of the neurons are not known yet, so all are counted
+        self._record(_vertex("a"), neuron_ids=[0])
+        self._record(_vertex("b"), neuron_ids=[0])
+        self.assertEqual(self._ports(), {"a": _PORT, "b": _PORT + 1})
+
+    def test_repeated_activation_is_a_no_op(self):
+        vertex = _vertex("a")
+        self._record(vertex)
+        self._record(vertex)
+        self.assertEqual(self._n_edges(), 1)
+        self.assertEqual(len(self.manager.get_live_output_assignments()), 1)
+
+    def test_deactivation(self):
+        vertex = _vertex("a")
+        self._record(vertex)
+        edge = self.spinnaker.add_application_edge.call_args[0][0]
+        edge.mark_no_changes()
+        self.assertTrue(self.manager.remove_edge_to_recorder_vertex(
+            vertex, _PORT, _HOST))
+        self.assertFalse(edge.active)
+        self.assertTrue(edge.requires_mapping)
+        self.assertEqual(self.manager.get_live_output_assignments(), [])
+        self.assertFalse(self.manager.remove_edge_to_recorder_vertex(
+            vertex, _PORT, _HOST))
+
+    def test_reactivation_reuses_the_edge(self):
+        vertex = _vertex("a")
+        self._record(vertex)
+        self.manager.remove_edge_to_recorder_vertex(vertex, _PORT, _HOST)
+        self._record(vertex)
+        edge = self.spinnaker.add_application_edge.call_args[0][0]
+        self.assertEqual(self._n_edges(), 1)
+        self.assertTrue(edge.active)
+        self.assertEqual(self._ports(), {"a": _PORT})
+
+    def test_reactivation_goes_back_to_the_same_recorder(self):
+        vertices = [_vertex(label) for label in "abcd"]
+        for vertex in vertices[:3]:
+            self._record(vertex)
+        self.manager.remove_edge_to_recorder_vertex(vertices[0], _PORT, _HOST)
+        self._record(vertices[3])
+
+        # The old edge of "a" is still in the graph, so "a" goes back to its
+        # recorder rather than to another, even though this is over budget
+        with mock.patch.object(plugin_manager_module.logger, "warning") as \
+                warning:
+            self._record(vertices[0])
+        self.assertTrue(warning.called)
+        ports = self._ports()
+        self.assertEqual(ports["d"], _PORT)
+        self.assertEqual(ports["a"], _PORT)
+        self.assertEqual(self._n_edges(), 4)
+        self.assertEqual(self.spinnaker.add_application_vertex.call_count, 3)
+
+    def test_per_board_needs_a_board(self):
+        with self.assertRaises(Exception):
+            self._record(_vertex("a"), per_board=True)
+        self.assertEqual(self._n_edges(), 0)
+
+    def test_constrain_to_board_needs_the_machine(self):
+        self.spinnaker.machine = None
+        with self.assertRaises(Exception):
+            self._record(
+                _vertex("a"), per_board=True, constrain_to_board=True)
+        self.assertEqual(self._n_edges(), 0)
+
+    def test_per_board_uses_the_board_of_the_vertex(self):
+        vertex = _vertex("a")
+        vertex.constraints.append(PlacerBoardConstraint("192.168.240.1"))
+        self._record(vertex, per_board=True)
+        self.assertEqual(
+            self.manager.get_live_output_assignments()[0][3],
+            "192.168.240.1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,31 @@ runs all spinn front end common tests scripts
 """
 import unittest
 
-testmodules = ['external_device_model_tests.munich_motor_control',
+testmodules = ['connection_tests.test_eieio_spike_packets',
+               'connection_tests.test_live_rate_connection',
+               'connection_tests.test_live_spike_file_sink',
+               'connection_tests.test_live_spike_replay',
+               'connection_tests.test_live_spike_statistics',
+               'connection_tests.test_multi_process_spike_receiver',
+               'connection_tests.test_packet_ring_buffer',
+               'connection_tests.test_receive_key_index',
+               'connection_tests.test_spike_dispatch_queue',
+               'connection_tests.test_spike_packet_cache',
+               'connection_tests.test_spynnaker_live_spikes_connection',
+               'connection_tests.test_timestep_spike_buffer',
+               'connection_tests.test_token_bucket_pacer',
+               'external_device_model_tests.munich_motor_control',
                'external_device_model_tests.munich_motor_device',
                'external_device_model_tests.munich_retina_device',
+               'external_device_model_tests.test_activate_live_output',
                'external_device_model_tests.test_external_cochlea_device',
                'external_device_model_tests.test_external_fpga_retina_device',
-               'external_device_model_tests.test_live_spike_recorder']
+               'external_device_model_tests.test_live_output_machine_edge',
+               'external_device_model_tests.test_live_rate_aggregator',
+               'external_device_model_tests.test_live_spike_recorder',
+               'external_device_model_tests.test_partitioned_spike_injector',
+               'external_device_model_tests.'
+               'test_spynnaker_external_device_plugin_manager']
 
 suite = unittest.TestSuite()
 